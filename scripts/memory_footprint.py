@@ -0,0 +1,163 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Measure the memory footprint of catalogs, containers and caches.
+
+The sizes are the memory allocated while building each object, traced with
+tracemalloc, so they include everything the object keeps alive. The
+packaged database is measured first, then synthetic catalogs of growing
+size that copy the packaged features with jittered positions.
+
+Usage::
+
+    python scripts/memory_footprint.py --max-rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+import gc
+import os
+import random
+import sqlite3
+import tempfile
+import tracemalloc
+from typing import TypeVar
+
+import pylunar
+from pylunar.catalog import default_database
+
+T = TypeVar("T")
+
+LOCATION = ((35, 58, 10), (-84, 19, 0))
+
+
+def measure(func: Callable[[], T]) -> tuple[T, int]:
+    """Measure the memory kept alive by the result of a function.
+
+    Parameters
+    ----------
+    func : callable
+        The function building the object.
+
+    Returns
+    -------
+    tuple[object, int]
+        The result and the allocated memory (bytes).
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def make_database(filename: str, num_rows: int, seed: int = 42) -> None:
+    """Write a synthetic feature database.
+
+    Parameters
+    ----------
+    filename : str
+        The path of the database to create.
+    num_rows : int
+        The number of features.
+    seed : int, optional
+        The seed for the position jitter.
+    """
+    conn = sqlite3.connect(default_database())
+    try:
+        schema = conn.execute("select sql from sqlite_master where name = 'Features'").fetchone()[0]
+        template = conn.execute("select * from Features").fetchall()
+    finally:
+        conn.close()
+    generator = random.Random(seed)
+    conn = sqlite3.connect(filename)
+    try:
+        conn.execute(schema)
+        rows = []
+        for feature_id in range(1, num_rows + 1):
+            row = list(template[feature_id % len(template)])
+            row[0] = feature_id
+            row[1] = f"{row[1]} {feature_id}"
+            row[3] = max(-90.0, min(90.0, row[3] + generator.uniform(-1.0, 1.0)))
+            row[4] = row[4] + generator.uniform(-1.0, 1.0)
+            rows.append(row)
+        conn.executemany(f"insert into Features values ({', '.join('?' * len(template[0]))})", rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def report(label: str, size: int, count: int, unit: str) -> None:
+    """Print one line of the report.
+
+    Parameters
+    ----------
+    label : str
+        The measured object.
+    size : int
+        The memory (bytes).
+    count : int
+        The number of units in the object.
+    unit : str
+        The name of the unit.
+    """
+    print(f"{label:<36}{size:>14,}{count:>10,}  {size / max(count, 1):>10,.1f} per {unit}")
+
+
+def main() -> None:
+    """Print the memory report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'object':<36}{'bytes':>14}{'count':>10}")
+    features, size = measure(lambda: pylunar.load_catalog())
+    report("packaged catalog", size, len(features), "feature")
+    for club_name in ("Lunar", "LunarII"):
+        container = pylunar.LunarFeatureContainer(club_name)
+        _, size = measure(container.load)
+        report(f"{club_name} container", size, len(container), "feature")
+
+    moon_info, size = measure(lambda: pylunar.MoonInfo(*LOCATION))
+    report("MoonInfo", size, 1, "instance")
+    moon_info.update((2024, 1, 1, 0, 0, 0))
+    altitudes = pylunar.AltitudeDict()
+    _, size = measure(lambda: altitudes.load(moon_info))
+    report("AltitudeDict", size, len(altitudes), "feature")
+    timeline, size = measure(lambda: pylunar.MoonTimeline(moon_info, (2024, 1, 1), (2024, 2, 1)))
+    report("MoonTimeline (hourly, 1 month)", size, len(timeline), "sample")
+    generator = pylunar.TerminatorGenerator(moon_info)
+    _, size = measure(lambda: generator.batch([(2024, 1, 1, hour, 0, 0) for hour in range(24)]))
+    report("TerminatorGenerator cache", size, 24, "sample")
+    index, size = measure(lambda: pylunar.PhaseIndex((2024, 1, 1), (2025, 1, 1)))
+    report("PhaseIndex (1 year)", size, len(index), "bucket")
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        num_rows = 1000
+        while num_rows <= args.max_rows:
+            filename = os.path.join(tempdir, f"lunar_{num_rows}.db")
+            make_database(filename, num_rows)
+            features, size = measure(lambda: pylunar.load_catalog(filename))  # noqa: B023
+            report(f"synthetic catalog {num_rows:,}", size, len(features), "feature")
+            container = pylunar.LunarFeatureContainer("Lunar", filename)
+            _, size = measure(container.load)
+            report(f"synthetic container {num_rows:,}", size, len(container), "feature")
+            del features, container
+            num_rows *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Load test the pylunar HTTP service.
+
+The script starts the service on a free local port and sends requests from
+many client threads for random nearby locations at the current time, the
+pattern of an app whose users all ask about the moon at once. It prints the
+throughput, the latency percentiles and the service cache statistics.
+
+Usage::
+
+    python scripts/server_load.py --clients 16 --requests 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import threading
+import time
+import urllib.request
+
+from pylunar.server import LunarService, make_server
+
+
+def client(port: int, endpoint: str, num_requests: int, seed: int, latencies: list[float]) -> None:
+    """Send requests for random locations near Oak Ridge.
+
+    Parameters
+    ----------
+    port : int
+        The port of the service.
+    endpoint : str
+        The endpoint to query.
+    num_requests : int
+        The number of requests.
+    seed : int
+        The seed for the locations.
+    latencies : list[float]
+        The list receiving the request latencies (seconds).
+    """
+    generator = random.Random(seed)
+    for _ in range(num_requests):
+        lat = 35.97 + generator.uniform(-0.05, 0.05)
+        lon = -84.32 + generator.uniform(-0.05, 0.05)
+        start = time.perf_counter()
+        with urllib.request.urlopen(
+            f"http://127.0.0.1:{port}/{endpoint}?lat={lat:.4f}&lon={lon:.4f}"
+        ) as reply:
+            reply.read()
+        latencies.append(time.perf_counter() - start)
+
+
+def main() -> None:
+    """Print the load test report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--endpoints", nargs="+", choices=LunarService.ENDPOINTS, default=["phase", "moon"])
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<10}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'hit rate':>10}{'coalesced':>11}")
+    for endpoint in args.endpoints:
+        service = LunarService()
+        server = make_server(port=0, service=service)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        latencies: list[float] = []
+        clients = [
+            threading.Thread(
+                target=client, args=(server.server_address[1], endpoint, args.requests, seed, latencies)
+            )
+            for seed in range(args.clients)
+        ]
+        start = time.perf_counter()
+        for worker in clients:
+            worker.start()
+        for worker in clients:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        server.shutdown()
+        server.server_close()
+
+        quantiles = statistics.quantiles(latencies, n=100)
+        stats = service.stats
+        hit_rate = stats["hits"] / max(1, stats["hits"] + stats["misses"] + stats["coalesced"])
+        print(
+            f"{endpoint:<10}{len(latencies) / elapsed:>10.0f}{quantiles[49] * 1000:>9.2f}"
+            f"{quantiles[98] * 1000:>9.2f}{hit_rate:>10.2%}{stats['coalesced']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
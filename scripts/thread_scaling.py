@@ -0,0 +1,130 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Measure the multi-thread scaling of the common MoonInfo workloads.
+
+Every thread gets its own MoonInfo, as the concurrency contract requires,
+and shares one loaded LunarFeatureContainer. The script prints the total
+throughput and the speedup over one thread for 1, 2, 4, ... threads. On a
+free-threaded interpreter the speedup shows how well pylunar scales; with
+the GIL it stays near one.
+
+Usage::
+
+    python scripts/thread_scaling.py --max-threads 8 --iterations 200
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+import os
+import sys
+import threading
+import time
+
+import ephem
+
+import pylunar
+
+LOCATION = ((35, 58, 10), (-84, 19, 0))
+START = float(ephem.Date((2024, 1, 1, 0, 0, 0)))
+
+
+def _update(moon_info: pylunar.MoonInfo, container: pylunar.LunarFeatureContainer, date: float) -> None:
+    moon_info.update(ephem.Date(date))
+
+
+def _phase_name(moon_info: pylunar.MoonInfo, container: pylunar.LunarFeatureContainer, date: float) -> None:
+    moon_info.update(ephem.Date(date))
+    moon_info.phase_name()
+
+
+def _is_visible(moon_info: pylunar.MoonInfo, container: pylunar.LunarFeatureContainer, date: float) -> None:
+    moon_info.update(ephem.Date(date))
+    for feature in container:
+        moon_info.is_visible(feature)
+
+
+WORKLOADS: dict[str, Callable[[pylunar.MoonInfo, pylunar.LunarFeatureContainer, float], None]] = {
+    "update": _update,
+    "phase_name": _phase_name,
+    "is_visible": _is_visible,
+}
+
+
+def run(workload: str, num_threads: int, iterations: int, container: pylunar.LunarFeatureContainer) -> float:
+    """Run a workload on a number of threads.
+
+    Parameters
+    ----------
+    workload : str
+        The name of the workload.
+    num_threads : int
+        The number of threads.
+    iterations : int
+        The number of calls per thread.
+    container : :class:`pylunar.LunarFeatureContainer`
+        The container shared by the threads.
+
+    Returns
+    -------
+    float
+        The throughput (calls per second) of all threads.
+    """
+    func = WORKLOADS[workload]
+    barrier = threading.Barrier(num_threads + 1)
+
+    def worker(offset: int) -> None:
+        moon_info = pylunar.MoonInfo(*LOCATION)
+        barrier.wait()
+        for i in range(iterations):
+            func(moon_info, container, START + offset + i * 0.01)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return num_threads * iterations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Print the scaling table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    args = parser.parse_args()
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if is_gil_enabled else 'disabled'}")
+    container = pylunar.LunarFeatureContainer("Lunar")
+    container.load()
+
+    thread_counts = []
+    num_threads = 1
+    while num_threads <= args.max_threads:
+        thread_counts.append(num_threads)
+        num_threads *= 2
+
+    print(f"{'workload':<12}{'threads':>8}{'calls/s':>12}{'speedup':>9}")
+    for workload in args.workloads:
+        base = None
+        for num_threads in thread_counts:
+            throughput = run(workload, num_threads, args.iterations, container)
+            base = base or throughput
+            print(f"{workload:<12}{num_threads:>8}{throughput:>12.0f}{throughput / base:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
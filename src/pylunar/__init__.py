@@ -9,16 +9,52 @@
 # license that can be found in the LICENSE file.
 
 __all__ = [
+    "Almanac",
     "AltitudeDict",
+    "DarkSkyCalendar",
+    "DarkWindow",
+    "DiskProjection",
+    "DiskProjector",
+    "datetime_to_mjd",
+    "EventScheduler",
     "__author__",
     "__email__",
     "__version__",
+    "FeatureBitset",
+    "FeatureQuery",
+    "LiveMoon",
+    "LunarEvent",
+    "LunarEventFinder",
     "LunarFeature",
     "LunarFeatureContainer",
+    "load_catalog",
     "mjd_to_date_tuple",
+    "mjd_to_datetime",
+    "MoonAnnotation",
+    "MoonAnnotator",
     "MoonInfo",
+    "MoonSnapshot",
+    "MoonTimeline",
+    "MoonTrack",
+    "NameIndex",
+    "ObservingPlanner",
+    "PhaseDiskRenderer",
+    "PhaseIndex",
+    "PlanEntry",
+    "ProgressTracker",
+    "ScheduledEvent",
+    "SiteCell",
+    "SiteRegistry",
+    "SolarAltitudeEvent",
+    "SpatialIndex",
+    "solar_altitude_events",
+    "Terminator",
+    "TerminatorGenerator",
+    "TrackSample",
     "tuple_to_string",
     "version_info",
+    "warmup",
+    "WarmupReport",
 ]
 
 from importlib.metadata import PackageNotFoundError, version
@@ -37,8 +73,31 @@ version_info = __version__.split(".")
 Use this for version comparison.
 """
 
+from .almanac import Almanac
 from .altitude_dict import AltitudeDict
+from .catalog import load_catalog
+from .conversions import datetime_to_mjd, mjd_to_datetime
+from .dark_calendar import DarkSkyCalendar, DarkWindow
+from .disk_projection import DiskProjection, DiskProjector
+from .event_scheduler import EventScheduler, ScheduledEvent
+from .feature_bitset import FeatureBitset
+from .feature_query import FeatureQuery
 from .helpers import mjd_to_date_tuple, tuple_to_string
+from .live_moon import LiveMoon, MoonSnapshot
+from .lunar_events import LunarEvent, LunarEventFinder
 from .lunar_feature import LunarFeature
 from .lunar_feature_container import LunarFeatureContainer
+from .moon_annotator import MoonAnnotation, MoonAnnotator
 from .moon_info import MoonInfo
+from .moon_timeline import MoonTimeline
+from .moon_track import MoonTrack, TrackSample
+from .name_index import NameIndex
+from .observing_planner import ObservingPlanner, PlanEntry
+from .phase_disk import PhaseDiskRenderer
+from .phase_index import PhaseIndex
+from .preload import WarmupReport, warmup
+from .progress_tracker import ProgressTracker
+from .site_registry import SiteCell, SiteRegistry
+from .solar_events import SolarAltitudeEvent, solar_altitude_events
+from .spatial_index import SpatialIndex
+from .terminator import Terminator, TerminatorGenerator
@@ -0,0 +1,354 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the Almanac class."""
+
+from __future__ import annotations
+
+__all__ = ["Almanac"]
+
+from array import array
+from collections.abc import Iterable
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from typing import Any
+
+import ephem
+
+from .feature_bitset import FeatureBitset
+from .lunar_feature import LunarFeature
+from .moon_info import MoonInfo, PhaseName
+from .phase_index import PhaseIndex
+from .pkg_types import TimeLike
+
+_MAGIC = b"PYLUNAR\x00"
+_HEADER_LENGTH = struct.Struct("<Q")
+_ALIGNMENT = 8
+_FORMAT_VERSION = 2
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _feature_id(feature: LunarFeature) -> int:
+    if feature.feature_id is None:
+        raise ValueError(f"Feature {feature.name} has no feature identifier.")
+    return feature.feature_id
+
+
+class Almanac:
+    """Table of lunar state sampled over a time range.
+
+    The table holds one row per sample with fixed width columns for the
+    time (ephem date), colongitude, altitude, librations and phase name as
+    well as a packed bitset of the visible features. The bitsets are keyed
+    by :attr:`pylunar.LunarFeature.feature_id`, the catalog identifier, so
+    rows from almanacs computed over different feature subsets can be
+    compared as :class:`pylunar.FeatureBitset` instances.
+
+    The binary format stores every column as a contiguous little-endian
+    block, so :meth:`load` memory maps the file and the columns are
+    zero-copy views. Those views support the buffer protocol and can be
+    wrapped by ``numpy.frombuffer`` when NumPy arrays are needed.
+
+    Parameters
+    ----------
+    feature_ids : list[int]
+        The identifiers of the features checked for visibility.
+    feature_names : list[str]
+        The names of the features, in the order of the identifiers.
+    columns : dict[str, sequence]
+        The values for each entry of :attr:`COLUMNS`.
+    visible : bytes-like
+        The packed visibility bitsets, one row after the other.
+    """
+
+    COLUMNS = (
+        ("date", "d"),
+        ("colong", "d"),
+        ("altitude", "d"),
+        ("libration_lat", "d"),
+        ("libration_lon", "d"),
+        ("phase", "B"),
+    )
+    # Name and array typecode for each fixed width column
+
+    def __init__(
+        self, feature_ids: list[int], feature_names: list[str], columns: dict[str, Any], visible: Any
+    ):
+        self.feature_ids = feature_ids
+        self.feature_names = feature_names
+        self.columns = columns
+        self.visible = visible
+        self.row_bytes = max(1, math.ceil((max(feature_ids, default=0) + 1) / 8))
+        self._mmap: mmap.mmap | None = None
+
+    def __len__(self) -> int:
+        """Length of the almanac.
+
+        Returns
+        -------
+        int
+            The number of rows.
+        """
+        return len(self.columns["date"])
+
+    @classmethod
+    def compute(
+        cls: type[Almanac],
+        moon_info: MoonInfo,
+        features: Iterable[LunarFeature],
+        start: TimeLike,
+        end: TimeLike,
+        step: float,
+    ) -> Almanac:
+        """Compute an almanac over the given time range.
+
+        The date of the Lunar information instance is restored afterwards.
+
+        Parameters
+        ----------
+        moon_info : :class:`pylunar.MoonInfo`
+            Instance of the Lunar information class.
+        features : iterable of :class:`pylunar.LunarFeature`
+            The features to check for visibility. They must have a feature
+            identifier.
+        start : tuple or float
+            The UTC start time as a tuple or an ephem date.
+        end : tuple or float
+            The UTC end time (inclusive) as a tuple or an ephem date.
+        step : float
+            The spacing (days) between rows.
+
+        Returns
+        -------
+        :class:`pylunar.Almanac`
+            The computed almanac.
+        """
+        feature_list = sorted(features, key=_feature_id)
+        feature_ids = [_feature_id(feature) for feature in feature_list]
+        start_date = float(ephem.Date(start))
+        num_rows = int(math.floor((float(ephem.Date(end)) - start_date) / step + 1e-9)) + 1
+        columns: dict[str, array[Any]] = {name: array(typecode) for name, typecode in cls.COLUMNS}
+        row_bytes = max(1, math.ceil((max(feature_ids, default=0) + 1) / 8))
+        visible = bytearray(num_rows * row_bytes)
+
+        phase_index = PhaseIndex(start_date, start_date + (num_rows - 1) * step)
+        old_date = moon_info.observer.date
+        for i in range(num_rows):
+            date = start_date + i * step
+            moon_info.update(ephem.Date(date))
+            columns["date"].append(date)
+            columns["colong"].append(moon_info.colong())
+            columns["altitude"].append(moon_info.altitude())
+            columns["libration_lat"].append(moon_info.libration_lat())
+            columns["libration_lon"].append(moon_info.libration_lon())
+            columns["phase"].append(phase_index.phase(date).value)
+            bits = 0
+            for feature_id, feature in zip(feature_ids, feature_list, strict=True):
+                if moon_info.is_visible(feature):
+                    bits |= 1 << feature_id
+            visible[i * row_bytes : (i + 1) * row_bytes] = bits.to_bytes(row_bytes, "little")
+        moon_info.update(old_date)
+
+        return cls(feature_ids, [feature.name for feature in feature_list], columns, visible)
+
+    def phase_name(self, row: int) -> str:
+        """Get the phase name for a row.
+
+        Parameters
+        ----------
+        row : int
+            The row index.
+
+        Returns
+        -------
+        str
+            The lunar phase name.
+        """
+        return PhaseName(self.columns["phase"][row]).name
+
+    def visible_bits(self, row: int) -> int:
+        """Get the packed visibility bitset for a row.
+
+        Parameters
+        ----------
+        row : int
+            The row index.
+
+        Returns
+        -------
+        int
+            The visibility bitset.
+        """
+        start = row * self.row_bytes
+        return int.from_bytes(self.visible[start : start + self.row_bytes], "little")
+
+    def visible_set(self, row: int) -> FeatureBitset:
+        """Get the identifiers of the visible features for a row.
+
+        Parameters
+        ----------
+        row : int
+            The row index.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The bitset of the visible features.
+        """
+        return FeatureBitset(self.visible_bits(row))
+
+    def feature_set(self) -> FeatureBitset:
+        """Get the identifiers of the features checked for visibility.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The bitset of the almanac features.
+        """
+        return FeatureBitset.from_ids(self.feature_ids)
+
+    def visible_features(self, row: int) -> list[str]:
+        """Get the names of the visible features for a row.
+
+        Parameters
+        ----------
+        row : int
+            The row index.
+
+        Returns
+        -------
+        list[str]
+            The visible feature names.
+        """
+        bits = self.visible_bits(row)
+        return [
+            name
+            for feature_id, name in zip(self.feature_ids, self.feature_names, strict=True)
+            if bits >> feature_id & 1
+        ]
+
+    def save(self, filename: str | os.PathLike[str]) -> None:
+        """Write the almanac in the binary format.
+
+        Parameters
+        ----------
+        filename : str or path-like
+            The file to write.
+        """
+        num_rows = len(self)
+        header: dict[str, Any] = {
+            "version": _FORMAT_VERSION,
+            "rows": num_rows,
+            "feature_ids": self.feature_ids,
+            "feature_names": self.feature_names,
+            "row_bytes": self.row_bytes,
+            "columns": [],
+        }
+        blocks = []
+        for name, typecode in self.COLUMNS:
+            values = array(typecode, self.columns[name])
+            if sys.byteorder == "big":
+                values.byteswap()
+            blocks.append((name, typecode, values.tobytes()))
+        blocks.append(("visible", "B", bytes(self.visible)))
+
+        # The header size depends on the offsets, so settle both iteratively.
+        header_size = 0
+        while True:
+            offset = _aligned(len(_MAGIC) + _HEADER_LENGTH.size + header_size)
+            header["columns"] = []
+            for name, typecode, data in blocks:
+                header["columns"].append({"name": name, "typecode": typecode, "offset": offset})
+                offset = _aligned(offset + len(data))
+            encoded = json.dumps(header).encode()
+            if len(encoded) == header_size:
+                break
+            header_size = len(encoded)
+
+        with open(filename, "wb") as ofile:
+            ofile.write(_MAGIC)
+            ofile.write(_HEADER_LENGTH.pack(header_size))
+            ofile.write(encoded)
+            for column, (_, _, data) in zip(header["columns"], blocks, strict=True):
+                ofile.write(b"\x00" * (column["offset"] - ofile.tell()))
+                ofile.write(data)
+
+    @classmethod
+    def load(cls: type[Almanac], filename: str | os.PathLike[str]) -> Almanac:
+        """Memory map an almanac written by :meth:`save`.
+
+        The columns are read-only views into the mapped file. Call
+        :meth:`close` to release the mapping.
+
+        Parameters
+        ----------
+        filename : str or path-like
+            The file to read.
+
+        Returns
+        -------
+        :class:`pylunar.Almanac`
+            The mapped almanac.
+        """
+        with open(filename, "rb") as ifile:
+            mapped = mmap.mmap(ifile.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[: len(_MAGIC)] != _MAGIC:
+            mapped.close()
+            raise ValueError(f"{filename} is not a pylunar almanac file.")
+        start = len(_MAGIC) + _HEADER_LENGTH.size
+        (header_size,) = _HEADER_LENGTH.unpack_from(mapped, len(_MAGIC))
+        header = json.loads(mapped[start : start + header_size])
+        if header["version"] != _FORMAT_VERSION:
+            mapped.close()
+            raise ValueError(f"Unsupported almanac format version {header['version']}.")
+
+        buffer = memoryview(mapped)
+        num_rows = header["rows"]
+        columns: dict[str, Any] = {}
+        visible: Any = b""
+        for column in header["columns"]:
+            size = array(column["typecode"]).itemsize
+            offset = column["offset"]
+            if column["name"] == "visible":
+                visible = buffer[offset : offset + num_rows * header["row_bytes"]]
+                continue
+            view = buffer[offset : offset + num_rows * size]
+            if sys.byteorder == "big" and size > 1:
+                values = array(column["typecode"], view.tobytes())
+                values.byteswap()
+                columns[column["name"]] = values
+            else:
+                columns[column["name"]] = view.cast(column["typecode"])
+
+        almanac = cls(header["feature_ids"], header["feature_names"], columns, visible)
+        almanac._mmap = mapped
+        return almanac
+
+    def close(self) -> None:
+        """Release the memory mapping of a loaded almanac."""
+        if self._mmap is None:
+            return
+        for name, values in self.columns.items():
+            if isinstance(values, memoryview):
+                self.columns[name] = array(values.format, values)
+                values.release()
+        if isinstance(self.visible, memoryview):
+            visible = bytes(self.visible)
+            self.visible.release()
+            self.visible = visible
+        self._mmap.close()
+        self._mmap = None
@@ -12,10 +12,7 @@
 
 from __future__ import annotations
 
-from importlib.resources import files
-import sqlite3
-
-from .lunar_feature import LunarFeature
+from .catalog import load_catalog
 from .moon_info import MoonInfo
 
 __all__ = ["AltitudeDict"]
@@ -24,6 +21,9 @@ __all__ = ["AltitudeDict"]
 class AltitudeDict(dict[str, float]):
     """Dictionary for the Lunar II features requiring solar altitude."""
 
+    FEATURES = ("Byrgius A", "Proclus", "Rupes Recta", "Tycho")
+    # The Lunar II features requiring solar altitude
+
     def load(self, moon_info: MoonInfo) -> None:
         """Provide solar altitude for the Lunar II features.
 
@@ -32,19 +32,7 @@ class AltitudeDict(dict[str, float]):
         moon_info : :class:`pylunar.MoonInfo`
             Instance of the Lunar information class.
         """
-        features = ["Byrgius A", "Proclus", "Rupes Recta", "Tycho"]
-        dbname = str(files("pylunar.data").joinpath("lunar.db"))
-        conn = sqlite3.connect(dbname)
-        cur = conn.cursor()
-
-        sql = f"select * from Features where Name in {str(tuple(features))}"
-        cur.execute(sql)
-
-        feature_list = []
-        for row in cur:
-            feature_list.append(LunarFeature.from_row(row))
+        feature_list = [feature for feature in load_catalog() if feature.name in self.FEATURES]
 
         for feature in sorted(feature_list, key=lambda x: x.name):
             self[feature.name] = moon_info.solar_altitude(feature)
-
-        cur.close()
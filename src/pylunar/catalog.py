@@ -0,0 +1,64 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for reading the whole Lunar feature catalog."""
+
+from __future__ import annotations
+
+__all__ = ["default_database", "load_catalog"]
+
+import functools
+from importlib.resources import files
+import sqlite3
+
+from .lunar_feature import LunarFeature
+
+
+def default_database() -> str:
+    """Get the path of the packaged Lunar feature database.
+
+    Returns
+    -------
+    str
+        The database path.
+    """
+    return str(files("pylunar.data").joinpath("lunar.db"))
+
+
+def load_catalog(dbname: str | None = None) -> tuple[LunarFeature, ...]:
+    """Read every Lunar feature from a database.
+
+    The result is cached per database, so all callers share the same
+    feature instances.
+
+    Parameters
+    ----------
+    dbname : str, optional
+        The path of a database with the same Features table as the packaged
+        one. Defaults to the packaged database.
+
+    Returns
+    -------
+    tuple[:class:`pylunar.LunarFeature`]
+        The features in identifier order.
+    """
+    return _read_catalog(default_database() if dbname is None else dbname)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_catalog(dbname: str) -> tuple[LunarFeature, ...]:
+    # Cached on the resolved path, so the default database is read once
+    # whether it is given by name or not.
+    conn = sqlite3.connect(dbname)
+    try:
+        rows = conn.execute("select * from Features order by Id").fetchall()
+    finally:
+        conn.close()
+    return tuple(LunarFeature.from_row(row) for row in rows)
@@ -0,0 +1,358 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the pylunar command line interface."""
+
+from __future__ import annotations
+
+__all__ = ["compute_rows", "main", "make_parser", "read_sites"]
+
+import argparse
+from collections import deque
+from collections.abc import Generator, Iterable, Sequence
+import concurrent.futures
+import csv
+from datetime import datetime, timedelta, timezone
+import functools
+import json
+import os
+import sys
+import time
+from typing import Any, TextIO
+
+import ephem
+
+from .altitude_dict import AltitudeDict
+from .conversions import datetime_to_mjd, mjd_to_datetime
+from .lunar_feature import LunarFeature
+from .lunar_feature_container import LunarFeatureContainer
+from .moon_info import MoonInfo
+from .phase_index import PhaseIndex
+
+ALMANAC_FIELDS = (
+    "site",
+    "time",
+    "phase_name",
+    "fractional_phase",
+    "colong",
+    "altitude",
+    "azimuth",
+    "rise",
+    "transit",
+    "set",
+    "solar_altitudes",
+    "visible_features",
+)
+# Output columns of the almanac command
+
+CHUNK_SIZE = 64
+# Number of rows computed by a single work unit
+
+Site = dict[str, Any]
+Row = dict[str, Any]
+
+
+def _parse_coordinate(value: str | float) -> float:
+    # Convert to signed decimal degrees. The sign of a DMS string applies to
+    # all of its parts, so -0:07:39 stays west of Greenwich.
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = value.strip()
+    if ":" in value:
+        sign = -1.0 if value.startswith("-") else 1.0
+        parts = [abs(float(x)) for x in value.lstrip("+-").split(":")]
+        return sign * sum(part / 60.0**i for i, part in enumerate(parts))
+    return float(value)
+
+
+def _parse_time(value: str) -> datetime:
+    date = datetime.fromisoformat(value)
+    if date.tzinfo is None:
+        return date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc)
+
+
+def read_sites(filename: str) -> list[Site]:
+    """Read a site list from a CSV or JSON file.
+
+    Each site needs a ``name``, ``latitude`` and ``longitude`` entry and can
+    have a ``timezone`` entry. Coordinates are decimal degrees or colon
+    delimited DMS strings.
+
+    Parameters
+    ----------
+    filename : str
+        The site list file. JSON is detected by the file extension.
+
+    Returns
+    -------
+    list[dict]
+        The sites.
+    """
+    with open(filename, newline="") as ifile:
+        entries = json.load(ifile) if filename.endswith(".json") else list(csv.DictReader(ifile))
+
+    sites = []
+    for entry in entries:
+        sites.append(
+            {
+                "name": str(entry["name"]),
+                "latitude": _parse_coordinate(entry["latitude"]),
+                "longitude": _parse_coordinate(entry["longitude"]),
+                "timezone": entry.get("timezone") or "UTC",
+            }
+        )
+    return sites
+
+
+@functools.lru_cache
+def _club_features(club_name: str) -> tuple[LunarFeature, ...]:
+    container = LunarFeatureContainer(club_name)
+    container.load()
+    return tuple(container)
+
+
+@functools.lru_cache
+def _altitude_features() -> tuple[LunarFeature, ...]:
+    features = [feature for feature in _club_features("LunarII") if feature.name in AltitudeDict.FEATURES]
+    return tuple(sorted(features, key=lambda x: x.name))
+
+
+@functools.lru_cache
+def _phase_index() -> PhaseIndex:
+    return PhaseIndex()
+
+
+def compute_rows(site: Site, dates: Sequence[float], club_name: str) -> list[Row]:
+    """Compute the almanac rows for a site.
+
+    Parameters
+    ----------
+    site : dict
+        The site information.
+    dates : list[float]
+        The ephem dates to compute.
+    club_name : str
+        The observing club for the visible features.
+
+    Returns
+    -------
+    list[dict]
+        The almanac rows.
+    """
+    moon_info = MoonInfo(site["latitude"], site["longitude"])
+    features = _club_features(club_name)
+    phase_index = _phase_index()
+    rows = []
+    for date in dates:
+        moon_info.update(ephem.Date(date))
+        rise_set = {}
+        for name, value in moon_info.rise_set_times(site["timezone"]):
+            rise_set[name] = value if isinstance(value, str) else datetime(*value).isoformat()
+        rows.append(
+            {
+                "site": site["name"],
+                "time": _format_date(date),
+                "phase_name": phase_index.phase_name(date),
+                "fractional_phase": moon_info.fractional_phase(),
+                "colong": moon_info.colong(),
+                "altitude": moon_info.altitude(),
+                "azimuth": moon_info.azimuth(),
+                "rise": rise_set["rise"],
+                "transit": rise_set["transit"],
+                "set": rise_set["set"],
+                "solar_altitudes": {
+                    feature.name: moon_info.solar_altitude(feature) for feature in _altitude_features()
+                },
+                "visible_features": [feature.name for feature in features if moon_info.is_visible(feature)],
+            }
+        )
+    return rows
+
+
+def _format_date(date: float) -> str:
+    return mjd_to_datetime(date).isoformat(timespec="seconds")
+
+
+def _write_row(ofile: TextIO, row: Row, output_format: str, writer: Any) -> None:
+    if output_format == "jsonl":
+        ofile.write(json.dumps(row) + "\n")
+    else:
+        row = dict(row)
+        row["solar_altitudes"] = ";".join(f"{k}={v}" for k, v in row["solar_altitudes"].items())
+        row["visible_features"] = ";".join(row["visible_features"])
+        writer.writerow(row)
+
+
+def _truncate_partial_line(filename: str) -> None:
+    # Remove a partially written last line left by an interrupted run.
+    with open(filename, "rb+") as ifile:
+        size = ifile.seek(0, os.SEEK_END)
+        position = size
+        while position > 0:
+            block_start = max(0, position - 4096)
+            ifile.seek(block_start)
+            block = ifile.read(position - block_start)
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                position = block_start + newline + 1
+                break
+            position = block_start
+        if position != size:
+            ifile.truncate(position)
+
+
+def _completed_rows(filename: str, output_format: str) -> dict[str, str]:
+    # Find the last time written for each site by an interrupted run. Rows
+    # are written in site and time order, so every earlier time of a site
+    # is complete as well. The file is read one line at a time.
+    if not os.path.exists(filename):
+        return {}
+    _truncate_partial_line(filename)
+    completed: dict[str, str] = {}
+    with open(filename, newline="") as ifile:
+        if output_format == "jsonl":
+            rows: Iterable[dict[str, Any]] = (json.loads(line) for line in ifile if line.strip())
+        else:
+            rows = csv.DictReader(ifile)
+        for row in rows:
+            completed[row["site"]] = row["time"]
+    return completed
+
+
+def _work_units(
+    sites: list[Site], dates: list[float], completed: dict[str, str]
+) -> Generator[tuple[Site, list[float]], None, None]:
+    for site in sites:
+        last_time = completed.get(site["name"])
+        chunk: list[float] = []
+        for date in dates:
+            # The formatted times share one offset, so they sort as times.
+            if last_time is not None and _format_date(date) <= last_time:
+                continue
+            chunk.append(date)
+            if len(chunk) == CHUNK_SIZE:
+                yield site, chunk
+                chunk = []
+        if chunk:
+            yield site, chunk
+
+
+def _run_units(
+    units: Iterable[tuple[Site, list[float]]], club_name: str, jobs: int
+) -> Generator[list[Row], None, None]:
+    # Compute the work units in order while keeping a bounded backlog.
+    if jobs <= 1:
+        for site, dates in units:
+            yield compute_rows(site, dates, club_name)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: deque[concurrent.futures.Future[list[Row]]] = deque()
+        for site, dates in units:
+            pending.append(executor.submit(compute_rows, site, dates, club_name))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _almanac(args: argparse.Namespace) -> int:
+    sites = read_sites(args.sites)
+    start = datetime_to_mjd(_parse_time(args.start))
+    end = datetime_to_mjd(_parse_time(args.end))
+    step = timedelta(hours=args.step).total_seconds() / 86400.0
+    if step <= 0:
+        raise SystemExit("Step must be positive.")
+    dates = []
+    date = start
+    while date <= end + 1e-9:
+        dates.append(date)
+        date += step
+
+    completed: dict[str, str] = {}
+    if args.resume:
+        if args.output is None:
+            raise SystemExit("Resume requires an output file.")
+        completed = _completed_rows(args.output, args.format)
+
+    ofile = sys.stdout if args.output is None else open(args.output, "a", newline="")  # noqa: SIM115
+    writer = None
+    if args.format == "csv":
+        writer = csv.DictWriter(ofile, fieldnames=ALMANAC_FIELDS)
+        if ofile is sys.stdout or ofile.tell() == 0:
+            writer.writeheader()
+
+    num_rows = 0
+    start_time = time.perf_counter()
+    try:
+        for rows in _run_units(_work_units(sites, dates, completed), args.club, args.jobs):
+            for row in rows:
+                _write_row(ofile, row, args.format, writer)
+            ofile.flush()
+            num_rows += len(rows)
+    finally:
+        if ofile is not sys.stdout:
+            ofile.close()
+
+    elapsed = time.perf_counter() - start_time
+    if not args.quiet:
+        rate = num_rows / elapsed if elapsed > 0 else 0.0
+        print(f"Wrote {num_rows} rows in {elapsed:.2f} s ({rate:.1f} rows/s)", file=sys.stderr)
+    return 0
+
+
+def make_parser() -> argparse.ArgumentParser:
+    """Create the command line parser.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        The command line parser.
+    """
+    parser = argparse.ArgumentParser(prog="pylunar", description="Lunar information for observers.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    almanac = subparsers.add_parser("almanac", help="Generate almanac rows for sites and a date range.")
+    almanac.add_argument("sites", help="CSV or JSON file with the site list.")
+    almanac.add_argument("--start", required=True, help="UTC start time in ISO format.")
+    almanac.add_argument("--end", required=True, help="UTC end time (inclusive) in ISO format.")
+    almanac.add_argument("--step", type=float, default=24.0, help="Hours between rows (default: 24).")
+    almanac.add_argument("--club", default="Lunar", help="Observing club for the visible features.")
+    almanac.add_argument("--format", choices=("csv", "jsonl"), default="csv", help="Output format.")
+    almanac.add_argument("-o", "--output", help="Output file. Defaults to standard output.")
+    almanac.add_argument("-j", "--jobs", type=int, default=1, help="Number of worker processes.")
+    almanac.add_argument("--resume", action="store_true", help="Skip rows already in the output file.")
+    almanac.add_argument("-q", "--quiet", action="store_true", help="Do not report the throughput.")
+    almanac.set_defaults(func=_almanac)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the pylunar command line interface.
+
+    Parameters
+    ----------
+    argv : list[str], optional
+        The command line arguments. Defaults to ``sys.argv``.
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    args = make_parser().parse_args(argv)
+    status: int = args.func(args)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
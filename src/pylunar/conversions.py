@@ -0,0 +1,222 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for time conversion functions.
+
+The dates used by ephem, and called Modified Julian Dates throughout this
+package, are Dublin Julian Dates: days since 1899-12-31 12:00 UTC. The
+functions here convert them directly with :mod:`datetime` arithmetic
+instead of going through :class:`ephem.Date` tuples.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "DUBLIN_EPOCH",
+    "datetime_to_mjd",
+    "datetimes_to_mjds",
+    "epoch_to_mjd",
+    "epochs_to_mjds",
+    "get_timezone",
+    "mjd_to_datetime",
+    "mjd_to_epoch",
+    "mjds_to_datetimes",
+    "mjds_to_epochs",
+]
+
+from array import array
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone, tzinfo
+import functools
+import zoneinfo
+
+DUBLIN_EPOCH = datetime(1899, 12, 31, 12, tzinfo=timezone.utc)
+"""The zero point of the ephem dates."""
+
+_UNIX_OFFSET = (datetime(1970, 1, 1, tzinfo=timezone.utc) - DUBLIN_EPOCH).total_seconds() / 86400.0
+_NAIVE_EPOCH = DUBLIN_EPOCH.replace(tzinfo=None)
+_SECONDS_PER_DAY = 86400.0
+
+
+@functools.lru_cache(maxsize=256)
+def get_timezone(timezone_name: str) -> tzinfo:
+    """Get a timezone by name, falling back to UTC for unknown names.
+
+    The lookups are cached, so repeated conversions for the same timezone
+    do not hit the timezone database.
+
+    Parameters
+    ----------
+    timezone_name : str
+        The timezone identifier.
+
+    Returns
+    -------
+    datetime.tzinfo
+        The timezone.
+    """
+    try:
+        return zoneinfo.ZoneInfo(timezone_name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+
+def mjd_to_datetime(mjd: float, tz: tzinfo | str | None = None, round_off: bool = False) -> datetime:
+    """Convert a Modified Julian Date to a timezone aware datetime.
+
+    Parameters
+    ----------
+    mjd : float
+        The Modified Julian Date to convert.
+    tz : datetime.tzinfo or str, optional
+        The timezone, or its name, for the result. Defaults to UTC.
+    round_off : bool, optional
+        Flag to drop the fractional seconds.
+
+    Returns
+    -------
+    datetime.datetime
+        The datetime for the MJD.
+    """
+    date = DUBLIN_EPOCH + timedelta(days=mjd)
+    if round_off:
+        date = date.replace(microsecond=0)
+    if tz is None:
+        return date
+    return date.astimezone(get_timezone(tz) if isinstance(tz, str) else tz)
+
+
+def datetime_to_mjd(date: datetime) -> float:
+    """Convert a datetime to a Modified Julian Date.
+
+    Parameters
+    ----------
+    date : datetime.datetime
+        The datetime to convert. Naive datetimes are taken as UTC.
+
+    Returns
+    -------
+    float
+        The MJD for the datetime.
+    """
+    if date.tzinfo is None:
+        return (date - _NAIVE_EPOCH) / timedelta(days=1)
+    return (date - DUBLIN_EPOCH) / timedelta(days=1)
+
+
+def mjd_to_epoch(mjd: float) -> float:
+    """Convert a Modified Julian Date to seconds since the Unix epoch.
+
+    Parameters
+    ----------
+    mjd : float
+        The Modified Julian Date to convert.
+
+    Returns
+    -------
+    float
+        The Unix timestamp.
+    """
+    return (mjd - _UNIX_OFFSET) * _SECONDS_PER_DAY
+
+
+def epoch_to_mjd(timestamp: float) -> float:
+    """Convert seconds since the Unix epoch to a Modified Julian Date.
+
+    Parameters
+    ----------
+    timestamp : float
+        The Unix timestamp to convert.
+
+    Returns
+    -------
+    float
+        The MJD for the timestamp.
+    """
+    return timestamp / _SECONDS_PER_DAY + _UNIX_OFFSET
+
+
+def mjds_to_epochs(mjds: Iterable[float]) -> array[float]:
+    """Convert Modified Julian Dates to Unix timestamps.
+
+    Parameters
+    ----------
+    mjds : iterable of float
+        The Modified Julian Dates to convert.
+
+    Returns
+    -------
+    array.array
+        The Unix timestamps as doubles.
+    """
+    offset = _UNIX_OFFSET
+    return array("d", [(mjd - offset) * _SECONDS_PER_DAY for mjd in mjds])
+
+
+def epochs_to_mjds(timestamps: Iterable[float]) -> array[float]:
+    """Convert Unix timestamps to Modified Julian Dates.
+
+    Parameters
+    ----------
+    timestamps : iterable of float
+        The Unix timestamps to convert.
+
+    Returns
+    -------
+    array.array
+        The Modified Julian Dates as doubles.
+    """
+    offset = _UNIX_OFFSET
+    return array("d", [timestamp / _SECONDS_PER_DAY + offset for timestamp in timestamps])
+
+
+def mjds_to_datetimes(
+    mjds: Iterable[float], tz: tzinfo | str | None = None, round_off: bool = False
+) -> list[datetime]:
+    """Convert Modified Julian Dates to timezone aware datetimes.
+
+    Parameters
+    ----------
+    mjds : iterable of float
+        The Modified Julian Dates to convert.
+    tz : datetime.tzinfo or str, optional
+        The timezone, or its name, for the results. Defaults to UTC.
+    round_off : bool, optional
+        Flag to drop the fractional seconds.
+
+    Returns
+    -------
+    list[datetime.datetime]
+        The datetimes for the MJDs.
+    """
+    epoch = DUBLIN_EPOCH
+    dates = [epoch + timedelta(days=mjd) for mjd in mjds]
+    if round_off:
+        dates = [date.replace(microsecond=0) for date in dates]
+    if tz is None:
+        return dates
+    zone = get_timezone(tz) if isinstance(tz, str) else tz
+    return [date.astimezone(zone) for date in dates]
+
+
+def datetimes_to_mjds(dates: Iterable[datetime]) -> array[float]:
+    """Convert datetimes to Modified Julian Dates.
+
+    Parameters
+    ----------
+    dates : iterable of datetime.datetime
+        The datetimes to convert. Naive datetimes are taken as UTC.
+
+    Returns
+    -------
+    array.array
+        The Modified Julian Dates as doubles.
+    """
+    return array("d", [datetime_to_mjd(date) for date in dates])
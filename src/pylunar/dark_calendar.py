@@ -0,0 +1,254 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the DarkSkyCalendar class."""
+
+from __future__ import annotations
+
+__all__ = ["DarkSkyCalendar", "DarkWindow"]
+
+from collections.abc import Iterator
+import math
+from typing import NamedTuple
+
+import ephem
+
+from .moon_info import MoonInfo
+from .pkg_types import TimeLike
+from .search import brent
+
+Interval = tuple[float, float]
+
+_MINUTE = 1.0 / 1440.0
+
+
+class DarkWindow(NamedTuple):
+    """An interval of dark sky free of moonlight."""
+
+    start: float
+    """The ephem date the window opens."""
+    end: float
+    """The ephem date the window closes."""
+    moon_up: bool
+    """True if a dim Moon is above the horizon during part of the window."""
+
+    @property
+    def hours(self) -> float:
+        """The length (hours) of the window (float)."""
+        return (self.end - self.start) * 24.0
+
+
+def _intersect(first: list[Interval], second: list[Interval]) -> list[Interval]:
+    # Both lists are sorted and their intervals do not overlap.
+    result = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            result.append((start, end))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def _union(first: list[Interval], second: list[Interval]) -> list[Interval]:
+    result: list[Interval] = []
+    for start, end in sorted(first + second):
+        if result and start <= result[-1][1]:
+            result[-1] = (result[-1][0], max(result[-1][1], end))
+        else:
+            result.append((start, end))
+    return result
+
+
+class DarkSkyCalendar:
+    """Find the dark sky windows free of moonlight at a site.
+
+    A window is a time when the Sun is below a depression angle and the Moon
+    is below the horizon or dimmer than an illumination threshold. The
+    windows are built from event searches rather than sampling: the Sun and
+    Moon rise and set times come from ephem, with the same horizon as
+    :meth:`pylunar.MoonInfo.rise_set_times` for the Moon, and the times the
+    illumination crosses the threshold are found with Brent's method between
+    the new and full moons, where the illumination is monotonic.
+
+    Parameters
+    ----------
+    moon_info : :class:`pylunar.MoonInfo`
+        Instance of the Lunar information class providing the observer
+        location. The instance is not modified.
+    sun_depression : float, optional
+        The angle (degrees) the Sun must be below the horizon. Defaults to
+        astronomical darkness.
+    max_illumination : float, optional
+        The illuminated fraction below which the Moon does not spoil the
+        sky even above the horizon. Zero requires the Moon to be down.
+    """
+
+    TOLERANCE = 1.0 / 86400.0
+    # The tolerance (days) of the illumination crossing times
+
+    def __init__(self, moon_info: MoonInfo, sun_depression: float = 18.0, max_illumination: float = 0.0):
+        self.sun_depression = sun_depression
+        self.max_illumination = max_illumination
+        self._observer = moon_info.observer.copy()
+        self._observer.pressure = 0
+
+    def _below(self, body: ephem.Body, horizon: str | float, start: float, end: float) -> list[Interval]:
+        # The intervals within start and end when the body is below the
+        # horizon, from its rising and setting times.
+        observer = self._observer.copy()
+        observer.horizon = horizon
+        use_center = isinstance(body, ephem.Sun)
+        crossings = []
+        for rising, method in ((True, observer.next_rising), (False, observer.next_setting)):
+            date = start
+            while date < end:
+                try:
+                    date = float(method(body, start=date, use_center=use_center))
+                except ephem.CircumpolarError:
+                    date += 1.0
+                    continue
+                if date < end:
+                    crossings.append((date, rising))
+                date += _MINUTE
+        crossings.sort()
+
+        if crossings:
+            is_below = crossings[0][1]
+        else:
+            observer.date = start
+            body.compute(observer)
+            limb = 0.0 if use_center else body.radius
+            is_below = body.alt + limb < observer.horizon
+        intervals = []
+        opened = start if is_below else None
+        for date, rising in crossings:
+            if rising and opened is not None:
+                intervals.append((opened, date))
+                opened = None
+            elif not rising and opened is None:
+                opened = date
+        if opened is not None:
+            intervals.append((opened, end))
+        return intervals
+
+    def _illumination(self, date: float) -> float:
+        return float(ephem.Moon(ephem.Date(date)).moon_phase) - self.max_illumination
+
+    def _dim(self, start: float, end: float) -> list[Interval]:
+        # The intervals when the illumination is below the threshold.
+        if self.max_illumination <= 0.0:
+            return []
+        if self.max_illumination >= 1.0:
+            return [(start, end)]
+        boundaries = [start]
+        date = start
+        while date < end:
+            date = float(min(ephem.next_new_moon(date + _MINUTE), ephem.next_full_moon(date + _MINUTE)))
+            boundaries.append(min(date, end))
+        intervals = []
+        opened = start if self._illumination(start) < 0.0 else None
+        values = [self._illumination(date) for date in boundaries]
+        for index in range(len(boundaries) - 1):
+            before, after = values[index], values[index + 1]
+            if (before < 0.0) == (after < 0.0):
+                continue
+            crossing = brent(self._illumination, boundaries[index], boundaries[index + 1], self.TOLERANCE)
+            if after < 0.0:
+                opened = crossing
+            elif opened is not None:
+                intervals.append((opened, crossing))
+                opened = None
+        if opened is not None:
+            intervals.append((opened, end))
+        return intervals
+
+    def _chunk(self, start: float, end: float) -> list[DarkWindow]:
+        dark = self._below(ephem.Sun(), str(-self.sun_depression), start, end)
+        moon_down = self._below(ephem.Moon(), "-0:34", start, end)
+        windows = []
+        for window_start, window_end in _intersect(dark, _union(moon_down, self._dim(start, end))):
+            moon_up = not any(a <= window_start and window_end <= b for a, b in moon_down)
+            windows.append(DarkWindow(window_start, window_end, moon_up))
+        return windows
+
+    def windows(self, start: TimeLike, end: TimeLike) -> Iterator[DarkWindow]:
+        """Find the windows over a time range.
+
+        The range is searched one calendar month at a time, so the windows
+        of a long range are produced as they are found.
+
+        Parameters
+        ----------
+        start : tuple or float
+            The UTC start time as a tuple or an ephem date.
+        end : tuple or float
+            The UTC end time as a tuple or an ephem date.
+
+        Yields
+        ------
+        :class:`pylunar.DarkWindow`
+            The windows in time order, clipped to the range.
+        """
+        start_date = float(ephem.Date(start))
+        end_date = float(ephem.Date(end))
+        pending: DarkWindow | None = None
+        chunk_start = start_date
+        while chunk_start < end_date:
+            year, month = ephem.Date(chunk_start).tuple()[:2]
+            next_month = float(ephem.Date((year + month // 12, month % 12 + 1, 1)))
+            chunk_end = min(next_month, end_date)
+            for window in self._chunk(chunk_start, chunk_end):
+                # Windows running over a month boundary are joined.
+                if pending is not None:
+                    if math.isclose(pending.end, window.start, abs_tol=self.TOLERANCE):
+                        window = DarkWindow(pending.start, window.end, pending.moon_up or window.moon_up)
+                    else:
+                        yield pending
+                pending = window
+            if pending is not None and pending.end < chunk_end:
+                yield pending
+                pending = None
+            chunk_start = chunk_end
+        if pending is not None:
+            yield pending
+
+    def months(self, start: TimeLike, end: TimeLike) -> Iterator[tuple[int, int, list[DarkWindow]]]:
+        """Find the windows over a time range grouped by month.
+
+        Parameters
+        ----------
+        start : tuple or float
+            The UTC start time as a tuple or an ephem date.
+        end : tuple or float
+            The UTC end time as a tuple or an ephem date.
+
+        Yields
+        ------
+        tuple[int, int, list[:class:`pylunar.DarkWindow`]]
+            The year, the month and the windows opening in that UTC month.
+            Months without windows are left out.
+        """
+        current: tuple[int, int] | None = None
+        windows: list[DarkWindow] = []
+        for window in self.windows(start, end):
+            month = ephem.Date(window.start).tuple()[:2]
+            if month != current:
+                if current is not None:
+                    yield current[0], current[1], windows
+                current = month
+                windows = []
+            windows.append(window)
+        if current is not None:
+            yield current[0], current[1], windows
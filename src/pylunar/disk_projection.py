@@ -0,0 +1,245 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the DiskProjector class."""
+
+from __future__ import annotations
+
+__all__ = ["DiskProjection", "DiskProjector"]
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+import functools
+import math
+from typing import NamedTuple
+
+import ephem
+
+from .lunar_feature import LunarFeature
+from .moon_info import MoonInfo
+from .pkg_types import TimeLike
+from .spatial_index import SpatialIndex
+
+Vector = tuple[float, float, float]
+
+
+class DiskProjection(NamedTuple):
+    """Feature positions on the apparent lunar disk at one instant.
+
+    The coordinates are in units of the disk radius from the disk center,
+    with x towards celestial west and y towards celestial north, as the
+    Moon appears in the sky with north up.
+    """
+
+    date: float
+    """The ephem date of the projection."""
+    x: array[float]
+    """The coordinates towards celestial west, one per feature."""
+    y: array[float]
+    """The coordinates towards celestial north, one per feature."""
+    near_side: array[int]
+    """One for the features on the side facing the Earth, else zero."""
+    radius: float
+    """The apparent radius (arcseconds) of the disk."""
+    position_angle: float
+    """The position angle (degrees) of the lunar rotation axis."""
+
+    def to_pixels(
+        self, arcsec_per_pixel: float, center: tuple[float, float] = (0.0, 0.0)
+    ) -> tuple[array[float], array[float]]:
+        """Convert the coordinates to image pixels.
+
+        Parameters
+        ----------
+        arcsec_per_pixel : float
+            The image scale (arcseconds per pixel).
+        center : tuple[float, float], optional
+            The column and row of the disk center in the image.
+
+        Returns
+        -------
+        tuple[array, array]
+            The columns and the rows, which increase downwards, of the
+            features.
+        """
+        scale = self.radius / arcsec_per_pixel
+        column, row = center
+        return (
+            array("d", [column + x * scale for x in self.x]),
+            array("d", [row - y * scale for y in self.y]),
+        )
+
+
+class DiskProjector:
+    """Project Lunar features onto the apparent lunar disk.
+
+    The feature centers are kept as unit vectors in the selenographic frame,
+    with x towards the mean Earth direction, y east and z north. A
+    projection turns the frame by the librations, which move the point
+    facing the Earth, and by the position angle of the lunar axis, so each
+    feature only costs three dot products.
+
+    Parameters
+    ----------
+    features : iterable of :class:`pylunar.LunarFeature`
+        The features to project.
+    vectors : sequence of tuple[float, float, float], optional
+        The unit vectors of the features, in the same order. Computed from
+        the feature coordinates if not given.
+    """
+
+    def __init__(self, features: Iterable[LunarFeature], vectors: Sequence[Vector] | None = None):
+        self.features = tuple(features)
+        if vectors is None:
+            vectors = []
+            for feature in self.features:
+                lat = math.radians(feature.latitude)
+                lon = math.radians(feature.longitude)
+                vectors.append((math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)))
+        elif len(vectors) != len(self.features):
+            raise ValueError("There must be one vector per feature.")
+        self._x = array("d", [vector[0] for vector in vectors])
+        self._y = array("d", [vector[1] for vector in vectors])
+        self._z = array("d", [vector[2] for vector in vectors])
+
+    @classmethod
+    def from_catalog(cls: type[DiskProjector], dbname: str | None = None) -> DiskProjector:
+        """Get the shared projector for a whole feature catalog.
+
+        The projector reuses the unit vectors of
+        :meth:`pylunar.SpatialIndex.from_catalog` and is shared by all
+        callers.
+
+        Parameters
+        ----------
+        dbname : str, optional
+            The path of the feature database. Defaults to the packaged
+            database.
+
+        Returns
+        -------
+        :class:`pylunar.DiskProjector`
+            The projector for the catalog features in identifier order.
+        """
+        return _catalog_projector(dbname)
+
+    def __len__(self) -> int:
+        """Length of the projector.
+
+        Returns
+        -------
+        int
+            The number of features.
+        """
+        return len(self.features)
+
+    def project_state(
+        self,
+        date: float,
+        libration_lon: float,
+        libration_lat: float,
+        position_angle: float,
+        radius: float,
+    ) -> DiskProjection:
+        """Project the features for a given lunar orientation.
+
+        Parameters
+        ----------
+        date : float
+            The ephem date of the orientation.
+        libration_lon : float
+            The longitudinal libration (degrees).
+        libration_lat : float
+            The latitudinal libration (degrees).
+        position_angle : float
+            The position angle (degrees) of the lunar axis from celestial
+            north towards east.
+        radius : float
+            The apparent radius (arcseconds) of the disk.
+
+        Returns
+        -------
+        :class:`pylunar.DiskProjection`
+            The projected features.
+        """
+        lon = math.radians(libration_lon)
+        lat = math.radians(libration_lat)
+        angle = math.radians(position_angle)
+        # The selenographic directions of the point facing the Earth and of
+        # east and north on the disk at that point.
+        facing = (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+        east = (-math.sin(lon), math.cos(lon), 0.0)
+        north = (-math.sin(lat) * math.cos(lon), -math.sin(lat) * math.sin(lon), math.cos(lat))
+        # Lunar east appears towards celestial west, and the axis is turned
+        # by the position angle towards celestial east.
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+        west_axis = tuple(e * cos_a - n * sin_a for e, n in zip(east, north, strict=True))
+        north_axis = tuple(e * sin_a + n * cos_a for e, n in zip(east, north, strict=True))
+
+        columns = (self._x, self._y, self._z)
+        wx, wy, wz = west_axis
+        nx, ny, nz = north_axis
+        fx, fy, fz = facing
+        x = array("d", [wx * a + wy * b + wz * c for a, b, c in zip(*columns, strict=True)])
+        y = array("d", [nx * a + ny * b + nz * c for a, b, c in zip(*columns, strict=True)])
+        near_side = array("B", [fx * a + fy * b + fz * c > 0.0 for a, b, c in zip(*columns, strict=True)])
+        return DiskProjection(date, x, y, near_side, radius, position_angle)
+
+    def _project_moon(self, moon_info: MoonInfo) -> DiskProjection:
+        return self.project_state(
+            float(moon_info.observer.date),
+            moon_info.libration_lon(),
+            moon_info.libration_lat(),
+            moon_info.axis_position_angle(),
+            moon_info.angular_size() * 1800.0,
+        )
+
+    def project(self, moon_info: MoonInfo) -> DiskProjection:
+        """Project the features for the current lunar state.
+
+        Parameters
+        ----------
+        moon_info : :class:`pylunar.MoonInfo`
+            Instance of the Lunar information class.
+
+        Returns
+        -------
+        :class:`pylunar.DiskProjection`
+            The projected features.
+        """
+        return self._project_moon(moon_info)
+
+    def project_many(self, moon_info: MoonInfo, dates: Iterable[TimeLike]) -> Iterator[DiskProjection]:
+        """Project the features for many instants.
+
+        Parameters
+        ----------
+        moon_info : :class:`pylunar.MoonInfo`
+            Instance of the Lunar information class providing the observer
+            location. The instance is not modified.
+        dates : iterable of tuple or float
+            The UTC times as tuples or ephem dates.
+
+        Yields
+        ------
+        :class:`pylunar.DiskProjection`
+            The projected features for each time.
+        """
+        state = moon_info.copy()
+        for date in dates:
+            state.update(ephem.Date(date))
+            yield self._project_moon(state)
+
+
+@functools.lru_cache(maxsize=8)
+def _catalog_projector(dbname: str | None) -> DiskProjector:
+    index = SpatialIndex.from_catalog(dbname)
+    return DiskProjector(index.features, index.vectors)
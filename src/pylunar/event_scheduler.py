@@ -0,0 +1,296 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the EventScheduler class."""
+
+from __future__ import annotations
+
+__all__ = ["EventScheduler", "ScheduledEvent"]
+
+from collections.abc import Iterable, Iterator
+import heapq
+import itertools
+import math
+from operator import attrgetter
+from typing import NamedTuple
+
+import ephem
+
+from .lunar_events import LunarEventFinder
+from .lunar_feature import LunarFeature
+from .moon_info import MoonInfo
+from .moon_timeline import MoonTimeline
+from .pkg_types import TimeLike
+
+_PHASES = (
+    ("new_moon", ephem.next_new_moon),
+    ("first_quarter", ephem.next_first_quarter_moon),
+    ("full_moon", ephem.next_full_moon),
+    ("last_quarter", ephem.next_last_quarter_moon),
+)
+
+_EPSILON = 1.0e-6
+# Small step (days) past a found event before searching for the next one
+
+
+class ScheduledEvent(NamedTuple):
+    """An upcoming event for a site."""
+
+    date: float
+    """The ephem date of the event."""
+    site: str
+    """The name of the site."""
+    kind: str
+    """The event kind, one of :attr:`EventScheduler.EVENT_KINDS`."""
+    feature: LunarFeature | None
+    """The lunar feature for visibility events, otherwise None."""
+
+
+def _intersect(
+    first: list[tuple[float, float]], second: list[tuple[float, float]]
+) -> list[tuple[float, float]]:
+    # Intersection of two sorted lists of disjoint intervals.
+    result = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            result.append((start, end))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+class EventScheduler:
+    """Priority queue of upcoming visibility, rise/set and phase events.
+
+    Every site has three event streams: the visibility transitions of its
+    features, the Moon rising and setting and the main lunar phases. Each
+    stream computes its events lazily and only the next event of every
+    stream is kept in a heap, so dispatching events only advances the
+    streams that were consumed. The visibility stream computes all features
+    of a site together, one :class:`pylunar.MoonTimeline` chunk at a time,
+    using the colongitude windows of
+    :meth:`pylunar.MoonInfo.visibility_windows` and the libration windows of
+    :class:`pylunar.LunarEventFinder`.
+
+    Features already visible at the start time get a visible event at the
+    start time. A stream ends when it finds no event within the look-ahead.
+
+    Parameters
+    ----------
+    start : tuple or float
+        The UTC start time as a tuple or an ephem date.
+    chunk : float, optional
+        The length (days) of the visibility computations.
+    step : float, optional
+        The spacing (days) of the lunar state samples.
+    lookahead : float, optional
+        The time (days) a stream searches without finding an event before
+        it ends.
+    """
+
+    EVENT_KINDS = (
+        "visible",
+        "hidden",
+        "moonrise",
+        "moonset",
+        "new_moon",
+        "first_quarter",
+        "full_moon",
+        "last_quarter",
+    )
+    # The kinds of scheduled events
+
+    def __init__(
+        self, start: TimeLike, chunk: float = 7.0, step: float = 1.0 / 24.0, lookahead: float = 60.0
+    ):
+        self.now = float(ephem.Date(start))
+        self.chunk = chunk
+        self.step = step
+        self.lookahead = lookahead
+        self._lunar_events = LunarEventFinder()
+        self._heap: list[tuple[float, int, int, ScheduledEvent, Iterator[ScheduledEvent]]] = []
+        self._counter = itertools.count()
+        self._sites: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Length of the scheduler.
+
+        Returns
+        -------
+        int
+            The number of subscribed sites.
+        """
+        return len(self._sites)
+
+    def _push(self, generation: int, stream: Iterator[ScheduledEvent]) -> None:
+        event = next(stream, None)
+        if event is not None:
+            heapq.heappush(self._heap, (event.date, next(self._counter), generation, event, stream))
+
+    def _is_current(self, generation: int, event: ScheduledEvent) -> bool:
+        # Entries of removed sites stay in the heap until they reach the top.
+        return self._sites.get(event.site) == generation
+
+    def add_site(self, name: str, moon_info: MoonInfo, features: Iterable[LunarFeature]) -> None:
+        """Subscribe a site to the events of its features.
+
+        Parameters
+        ----------
+        name : str
+            The unique name of the site.
+        moon_info : :class:`pylunar.MoonInfo`
+            Instance of the Lunar information class providing the site
+            location. The instance is not modified.
+        features : iterable of :class:`pylunar.LunarFeature`
+            The features to schedule visibility events for.
+        """
+        if name in self._sites:
+            raise ValueError(f"Site {name} is already scheduled.")
+        generation = next(self._counter)
+        self._sites[name] = generation
+        feature_list = list(features)
+        if feature_list:
+            self._push(generation, self._visibility_stream(name, moon_info, feature_list))
+        self._push(generation, self._rise_set_stream(name, moon_info))
+        self._push(generation, self._phase_stream(name))
+
+    def remove_site(self, name: str) -> None:
+        """Unsubscribe a site.
+
+        Parameters
+        ----------
+        name : str
+            The name of the site.
+        """
+        del self._sites[name]
+
+    def peek(self) -> ScheduledEvent | None:
+        """Get the next event without consuming it.
+
+        Returns
+        -------
+        :class:`pylunar.ScheduledEvent` or None
+            The next event, or None if nothing is scheduled.
+        """
+        while self._heap:
+            _, _, generation, event, _ = self._heap[0]
+            if self._is_current(generation, event):
+                return event
+            heapq.heappop(self._heap)
+        return None
+
+    def next_events(self, until: TimeLike) -> list[ScheduledEvent]:
+        """Consume all events up to a given time.
+
+        Parameters
+        ----------
+        until : tuple or float
+            The UTC time, as a tuple or an ephem date, up to which events
+            are dispatched.
+
+        Returns
+        -------
+        list[:class:`pylunar.ScheduledEvent`]
+            The events sorted by time.
+        """
+        until_date = float(ephem.Date(until))
+        events = []
+        while self._heap and self._heap[0][0] <= until_date:
+            _, _, generation, event, stream = heapq.heappop(self._heap)
+            if self._is_current(generation, event):
+                events.append(event)
+                self._push(generation, stream)
+        self.now = max(self.now, until_date)
+        return events
+
+    def _visibility_stream(
+        self, name: str, moon_info: MoonInfo, features: list[LunarFeature]
+    ) -> Iterator[ScheduledEvent]:
+        windows = [(feature, MoonInfo.visibility_windows(feature)) for feature in features]
+        visible = [False] * len(features)
+        start = self.now
+        last_event = start
+        while start - last_event < self.lookahead:
+            end = start + self.chunk
+            timeline = MoonTimeline(moon_info, start, end, self.step)
+            first_colong = timeline.colongs[0]
+            last_colong = timeline.colongs[-1]
+            events = []
+            for index, (feature, feature_windows) in enumerate(windows):
+                intervals = []
+                for window_start, window_end, _ in feature_windows:
+                    base = math.floor((first_colong - window_end) / 360.0) * 360.0
+                    while window_start + base <= last_colong:
+                        low = max(window_start + base, first_colong)
+                        high = min(window_end + base, last_colong)
+                        if low < high:
+                            visible_start = timeline.date_at_colong(low)
+                            visible_end = timeline.date_at_colong(high)
+                            if visible_start is not None and visible_end is not None:
+                                intervals.append((visible_start, visible_end))
+                        base += 360.0
+                intervals.sort()
+                if max(math.fabs(feature.latitude), math.fabs(feature.longitude)) > MoonInfo.LIBRATION_ZONE:
+                    libration = self._lunar_events.libration_windows(feature, start, end)
+                    intervals = _intersect(intervals, libration)
+
+                was_visible = visible[index]
+                for interval_start, interval_end in intervals:
+                    if not (was_visible and interval_start - start < _EPSILON):
+                        if was_visible:
+                            events.append(ScheduledEvent(start, name, "hidden", feature))
+                        events.append(ScheduledEvent(interval_start, name, "visible", feature))
+                    was_visible = end - interval_end < _EPSILON
+                    if not was_visible:
+                        events.append(ScheduledEvent(interval_end, name, "hidden", feature))
+                if not intervals and was_visible:
+                    events.append(ScheduledEvent(start, name, "hidden", feature))
+                    was_visible = False
+                visible[index] = was_visible
+
+            events.sort(key=attrgetter("date"))
+            yield from events
+            if events:
+                last_event = events[-1].date
+            start = end
+
+    def _rise_set_stream(self, name: str, moon_info: MoonInfo) -> Iterator[ScheduledEvent]:
+        observer = moon_info.observer.copy()
+        observer.pressure = 0
+        observer.horizon = "-0:34"
+        moon = ephem.Moon()
+        date = self.now
+        last_event = date
+        while date - last_event < self.lookahead:
+            try:
+                rising = float(observer.next_rising(moon, start=date))
+                setting = float(observer.next_setting(moon, start=date))
+            except (ephem.AlwaysUpError, ephem.NeverUpError):
+                date += 1.0
+                continue
+            last_event = min(rising, setting)
+            if rising < setting:
+                yield ScheduledEvent(rising, name, "moonrise", None)
+                date = rising + _EPSILON
+            else:
+                yield ScheduledEvent(setting, name, "moonset", None)
+                date = setting + _EPSILON
+
+    def _phase_stream(self, name: str) -> Iterator[ScheduledEvent]:
+        date = self.now
+        while True:
+            kind, phase_date = min(((kind, float(func(date))) for kind, func in _PHASES), key=lambda x: x[1])
+            yield ScheduledEvent(phase_date, name, kind, None)
+            date = phase_date + _EPSILON
@@ -0,0 +1,262 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the FeatureBitset class."""
+
+from __future__ import annotations
+
+__all__ = ["FeatureBitset"]
+
+from collections.abc import Generator, Iterable
+
+from .lunar_feature import LunarFeature
+
+
+class FeatureBitset:
+    """Immutable set of Lunar feature identifiers stored as a bitset.
+
+    Bit ``n`` is set when the feature with the identifier ``n`` is part of
+    the set. The set algebra operators (``|``, ``&``, ``-``, ``^``) work on
+    whole integers, so comparing visibility between times or sites does not
+    need to touch the feature instances.
+
+    Parameters
+    ----------
+    bits : int, optional
+        The bitset value.
+    """
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0):
+        if bits < 0:
+            raise ValueError("Bitset value must not be negative.")
+        self.bits = bits
+
+    @classmethod
+    def from_ids(cls: type[FeatureBitset], feature_ids: Iterable[int]) -> FeatureBitset:
+        """Create a bitset from feature identifiers.
+
+        Parameters
+        ----------
+        feature_ids : iterable of int
+            The feature identifiers to set.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The new bitset.
+        """
+        bits = 0
+        for feature_id in feature_ids:
+            bits |= 1 << feature_id
+        return cls(bits)
+
+    @classmethod
+    def from_features(cls: type[FeatureBitset], features: Iterable[LunarFeature]) -> FeatureBitset:
+        """Create a bitset from Lunar features.
+
+        Parameters
+        ----------
+        features : iterable of :class:`pylunar.LunarFeature`
+            The features to set. They must have a feature identifier.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The new bitset.
+        """
+        feature_ids = []
+        for feature in features:
+            if feature.feature_id is None:
+                raise ValueError(f"Feature {feature.name} has no feature identifier.")
+            feature_ids.append(feature.feature_id)
+        return cls.from_ids(feature_ids)
+
+    @classmethod
+    def from_bytes(cls: type[FeatureBitset], data: bytes) -> FeatureBitset:
+        """Create a bitset from its packed little-endian representation.
+
+        Parameters
+        ----------
+        data : bytes
+            The packed bitset.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The new bitset.
+        """
+        return cls(int.from_bytes(data, "little"))
+
+    def to_bytes(self, length: int | None = None) -> bytes:
+        """Pack the bitset into little-endian bytes.
+
+        Parameters
+        ----------
+        length : int, optional
+            The number of bytes to use. Defaults to the minimum required.
+
+        Returns
+        -------
+        bytes
+            The packed bitset.
+        """
+        if length is None:
+            length = (self.bits.bit_length() + 7) // 8
+        return self.bits.to_bytes(length, "little")
+
+    def __and__(self, other: FeatureBitset) -> FeatureBitset:
+        """Intersection of two bitsets.
+
+        Parameters
+        ----------
+        other : :class:`pylunar.FeatureBitset`
+            The other bitset.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The identifiers in both bitsets.
+        """
+        return FeatureBitset(self.bits & other.bits)
+
+    def __or__(self, other: FeatureBitset) -> FeatureBitset:
+        """Union of two bitsets.
+
+        Parameters
+        ----------
+        other : :class:`pylunar.FeatureBitset`
+            The other bitset.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The identifiers in either bitset.
+        """
+        return FeatureBitset(self.bits | other.bits)
+
+    def __sub__(self, other: FeatureBitset) -> FeatureBitset:
+        """Difference of two bitsets.
+
+        Parameters
+        ----------
+        other : :class:`pylunar.FeatureBitset`
+            The other bitset.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The identifiers only in this bitset.
+        """
+        return FeatureBitset(self.bits & ~other.bits)
+
+    def __xor__(self, other: FeatureBitset) -> FeatureBitset:
+        """Symmetric difference of two bitsets.
+
+        Parameters
+        ----------
+        other : :class:`pylunar.FeatureBitset`
+            The other bitset.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The identifiers in exactly one of the bitsets.
+        """
+        return FeatureBitset(self.bits ^ other.bits)
+
+    def __bool__(self) -> bool:
+        """Check for a non-empty bitset.
+
+        Returns
+        -------
+        bool
+            True if any identifier is set.
+        """
+        return self.bits != 0
+
+    def __contains__(self, feature_id: object) -> bool:
+        """Check for an identifier in the bitset.
+
+        Parameters
+        ----------
+        feature_id : int
+            The feature identifier to check.
+
+        Returns
+        -------
+        bool
+            True if the identifier is set.
+        """
+        if not isinstance(feature_id, int) or feature_id < 0:
+            return False
+        return bool(self.bits >> feature_id & 1)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare two bitsets.
+
+        Parameters
+        ----------
+        other : object
+            The object to compare.
+
+        Returns
+        -------
+        bool
+            True if both bitsets contain the same identifiers.
+        """
+        if not isinstance(other, FeatureBitset):
+            return NotImplemented
+        return self.bits == other.bits
+
+    def __hash__(self) -> int:
+        """Hash of the bitset.
+
+        Returns
+        -------
+        int
+            The hash value.
+        """
+        return hash(self.bits)
+
+    def __iter__(self) -> Generator[int, None, None]:
+        """Create iterator over the identifiers in ascending order.
+
+        Yields
+        ------
+        int
+            The current feature identifier.
+        """
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length() - 1
+            bits ^= lowest
+
+    def __len__(self) -> int:
+        """Length of the bitset.
+
+        Returns
+        -------
+        int
+            The number of identifiers set (popcount).
+        """
+        return self.bits.bit_count()
+
+    def __repr__(self) -> str:
+        """Class representation.
+
+        Returns
+        -------
+        str
+            The representation.
+        """
+        return f"FeatureBitset({list(self)})"
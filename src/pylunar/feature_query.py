@@ -0,0 +1,254 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the FeatureQuery class."""
+
+from __future__ import annotations
+
+__all__ = ["FeatureQuery"]
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Generator, Iterable
+from typing import TYPE_CHECKING
+
+from .feature_bitset import FeatureBitset
+from .lunar_feature import LunarFeature
+from .moon_info import MoonInfo
+
+if TYPE_CHECKING:
+    from .lunar_feature_container import LunarFeatureContainer
+
+FieldValues = str | Iterable[str | None] | None
+
+
+class FeatureQuery:
+    """Lightweight view of a subset of the features in a container.
+
+    A query only holds the container and a :class:`pylunar.FeatureBitset`
+    of the selected feature identifiers. Filtering intersects the bitset
+    with the secondary indexes the container builds at load, so no feature
+    is copied or scanned. Every filter returns a new query, so queries can
+    be shared and combined with ``&``, ``|`` and ``-``.
+
+    Parameters
+    ----------
+    container : :class:`pylunar.LunarFeatureContainer`
+        The container holding the features and indexes.
+    feature_set : :class:`pylunar.FeatureBitset`
+        The identifiers of the selected features.
+    """
+
+    FIELDS = ("feature_type", "lunar_club_type", "quad_code")
+    # The categorical feature attributes with a hash index
+
+    __slots__ = ("container", "feature_set")
+
+    def __init__(self, container: LunarFeatureContainer, feature_set: FeatureBitset):
+        self.container = container
+        self.feature_set = feature_set
+
+    def _new(self, feature_set: FeatureBitset) -> FeatureQuery:
+        return FeatureQuery(self.container, feature_set)
+
+    def _check(self, other: FeatureQuery) -> None:
+        if other.container is not self.container:
+            raise ValueError("Queries must come from the same container.")
+
+    def __and__(self, other: FeatureQuery) -> FeatureQuery:
+        """Intersection of two queries.
+
+        Parameters
+        ----------
+        other : :class:`pylunar.FeatureQuery`
+            The other query on the same container.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureQuery`
+            The features selected by both queries.
+        """
+        self._check(other)
+        return self._new(self.feature_set & other.feature_set)
+
+    def __or__(self, other: FeatureQuery) -> FeatureQuery:
+        """Union of two queries.
+
+        Parameters
+        ----------
+        other : :class:`pylunar.FeatureQuery`
+            The other query on the same container.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureQuery`
+            The features selected by either query.
+        """
+        self._check(other)
+        return self._new(self.feature_set | other.feature_set)
+
+    def __sub__(self, other: FeatureQuery) -> FeatureQuery:
+        """Difference of two queries.
+
+        Parameters
+        ----------
+        other : :class:`pylunar.FeatureQuery`
+            The other query on the same container.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureQuery`
+            The features selected by this query but not the other.
+        """
+        self._check(other)
+        return self._new(self.feature_set - other.feature_set)
+
+    def __iter__(self) -> Generator[LunarFeature, None, None]:
+        """Create iterator for the selected features.
+
+        Yields
+        ------
+        :class:`pylunar.LunarFeature`
+            The current lunar feature in identifier order.
+        """
+        features = self.container.features
+        for feature_id in self.feature_set:
+            yield features[feature_id]
+
+    def __len__(self) -> int:
+        """Length of the query.
+
+        Returns
+        -------
+        int
+            The number of selected features.
+        """
+        return len(self.feature_set)
+
+    def where(
+        self,
+        feature_type: FieldValues = None,
+        lunar_club_type: FieldValues = None,
+        quad_code: FieldValues = None,
+    ) -> FeatureQuery:
+        """Filter the features on categorical attributes.
+
+        Each argument is a single value or an iterable of values that are
+        combined with OR. The given arguments are combined with AND.
+
+        Parameters
+        ----------
+        feature_type : str or iterable of str, optional
+            The feature types to keep: i.e. Crater, Mons.
+        lunar_club_type : str or iterable of str, optional
+            The Lunar Club classifications to keep: Naked Eye, Binocular,
+            Telescope.
+        quad_code : str or iterable of str, optional
+            The lunar quadrant codes to keep.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureQuery`
+            The filtered query.
+        """
+        bits = self.feature_set.bits
+        filters = zip(self.FIELDS, (feature_type, lunar_club_type, quad_code), strict=True)
+        for field, values in filters:
+            if values is None:
+                continue
+            index = self.container.indexes[field]
+            value_list = [values] if isinstance(values, str) else values
+            field_bits = 0
+            for value in value_list:
+                if value in index:
+                    field_bits |= index[value].bits
+            bits &= field_bits
+        return self._new(FeatureBitset(bits))
+
+    def diameter(self, minimum: float | None = None, maximum: float | None = None) -> FeatureQuery:
+        """Filter the features on their diameter.
+
+        Parameters
+        ----------
+        minimum : float, optional
+            The smallest diameter (km) to keep.
+        maximum : float, optional
+            The largest diameter (km) to keep.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureQuery`
+            The filtered query.
+        """
+        diameters, feature_ids = self.container.diameter_index
+        low = 0 if minimum is None else bisect_left(diameters, minimum)
+        high = len(diameters) if maximum is None else bisect_right(diameters, maximum)
+        return self._new(self.feature_set & FeatureBitset.from_ids(feature_ids[low:high]))
+
+    def visible(self, moon_info: MoonInfo) -> FeatureQuery:
+        """Filter the features on their visibility.
+
+        Parameters
+        ----------
+        moon_info : :class:`pylunar.MoonInfo`
+            Instance of the Lunar information class.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureQuery`
+            The features that are visible.
+        """
+        features = self.container.features
+        bits = 0
+        for feature_id in self.feature_set:
+            if moon_info.is_visible(features[feature_id]):
+                bits |= 1 << feature_id
+        return self._new(FeatureBitset(bits))
+
+    def facets(self, field: str) -> dict[str | None, int]:
+        """Count the selected features for each value of an attribute.
+
+        Parameters
+        ----------
+        field : str
+            The attribute to count on. One of :attr:`FIELDS`.
+
+        Returns
+        -------
+        dict[str, int]
+            The number of selected features for every indexed value,
+            including zero counts.
+        """
+        if field not in self.FIELDS:
+            raise ValueError(f"Field {field} is not indexed.")
+        bits = self.feature_set.bits
+        return {
+            value: (bits & feature_set.bits).bit_count()
+            for value, feature_set in self.container.indexes[field].items()
+        }
+
+    def by_diameter(self, reverse: bool = False) -> Generator[LunarFeature, None, None]:
+        """Create iterator for the selected features sorted by diameter.
+
+        Parameters
+        ----------
+        reverse : bool, optional
+            Flag to start with the largest features.
+
+        Yields
+        ------
+        :class:`pylunar.LunarFeature`
+            The current lunar feature.
+        """
+        features = self.container.features
+        feature_ids = self.container.diameter_index[1]
+        bits = self.feature_set.bits
+        for feature_id in reversed(feature_ids) if reverse else feature_ids:
+            if bits >> feature_id & 1:
+                yield features[feature_id]
@@ -16,6 +16,7 @@ __all__ = ["mjd_to_date_tuple", "tuple_to_string"]
 
 import ephem
 
+from .conversions import mjd_to_datetime
 from .pkg_types import DateTimeTuple, DmsCoordinate
 
 
@@ -35,7 +36,10 @@ def mjd_to_date_tuple(mjd: float, round_off: bool = False) -> DateTimeTuple:
         The UTC time for the MJD.
     """
     date_tuple: DateTimeTuple
-    date_tuple = tuple(int(x) for x in ephem.Date(mjd).tuple()) if round_off else ephem.Date(mjd).tuple()
+    if round_off:
+        date_tuple = mjd_to_datetime(mjd, round_off=True).timetuple()[:6]
+    else:
+        date_tuple = ephem.Date(mjd).tuple()
     return date_tuple
 
 
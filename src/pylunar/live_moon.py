@@ -0,0 +1,245 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the LiveMoon class."""
+
+from __future__ import annotations
+
+__all__ = ["LiveMoon", "MoonSnapshot"]
+
+from collections.abc import Callable, Iterable
+import threading
+import time
+from types import TracebackType
+from typing import NamedTuple
+
+import ephem
+
+from .feature_bitset import FeatureBitset
+from .lunar_feature import LunarFeature
+from .moon_info import MoonInfo
+
+
+class MoonSnapshot(NamedTuple):
+    """The lunar state at one instant."""
+
+    date: float
+    """The ephem date of the state."""
+    created: float
+    """The :func:`time.monotonic` time the state was computed at."""
+    phase_name: str
+    """The lunar phase name."""
+    fractional_phase: float
+    """The illuminated fraction of the lunar disk."""
+    colong: float
+    """The selenographic colongitude (degrees)."""
+    altitude: float
+    """The lunar altitude (degrees)."""
+    azimuth: float
+    """The lunar azimuth (degrees)."""
+    age: float
+    """The lunar age (days)."""
+    visible: FeatureBitset
+    """The identifiers of the visible features."""
+
+
+class LiveMoon:
+    """Lunar state for the current time refreshed on a background thread.
+
+    A worker thread computes a :class:`pylunar.MoonSnapshot` every interval
+    and publishes it by replacing a single attribute. Snapshots are never
+    modified, so readers only load that reference and never wait on a lock.
+    The computation uses a private copy of the observer, so the given
+    :class:`pylunar.MoonInfo` is not modified.
+
+    When a staleness bound is set, a reader that finds a snapshot older than
+    the bound computes a fresh one itself and publishes it. This covers a
+    worker that is stopped or late.
+
+    A refresh that fails on the worker thread does not stop it. The
+    exception is kept in :attr:`last_error` until a later refresh succeeds,
+    and the previous snapshot stays published meanwhile.
+
+    Parameters
+    ----------
+    moon_info : :class:`pylunar.MoonInfo`
+        Instance of the Lunar information class providing the site location.
+    features : iterable of :class:`pylunar.LunarFeature`, optional
+        The features to check for visibility. They must have a feature
+        identifier.
+    interval : float, optional
+        The time (seconds) between refreshes.
+    max_age : float, optional
+        The largest age (seconds) of a snapshot returned to readers. No
+        bound is applied by default.
+    clock : callable, optional
+        Function returning the current time as an ephem date. Defaults to
+        :func:`ephem.now`.
+    """
+
+    def __init__(
+        self,
+        moon_info: MoonInfo,
+        features: Iterable[LunarFeature] = (),
+        interval: float = 60.0,
+        max_age: float | None = None,
+        clock: Callable[[], float] | None = None,
+    ):
+        if interval <= 0.0:
+            raise ValueError("Refresh interval must be positive.")
+        self.moon_info = moon_info.copy()
+        self.features = tuple(features)
+        self._masks = []
+        for feature in self.features:
+            if feature.feature_id is None:
+                raise ValueError(f"Feature {feature.name} has no feature identifier.")
+            self._masks.append((1 << feature.feature_id, feature))
+        self.interval = interval
+        self.max_age = max_age
+        self.clock = ephem.now if clock is None else clock
+        # Readers may compute a snapshot on the calling thread, so the
+        # computation is serialized. Publishing needs no lock.
+        self._compute_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.last_error: Exception | None = None
+        self._snapshot = self.refresh()
+
+    def __enter__(self) -> LiveMoon:
+        """Start the refresh thread.
+
+        Returns
+        -------
+        :class:`pylunar.LiveMoon`
+            This instance.
+        """
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the refresh thread.
+
+        Parameters
+        ----------
+        exc_type : type, optional
+            The type of a raised exception.
+        exc_value : BaseException, optional
+            The raised exception.
+        traceback : traceback, optional
+            The traceback of a raised exception.
+        """
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        """Whether the refresh thread is running.
+
+        Returns
+        -------
+        bool
+            The thread state.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start refreshing the snapshot on a daemon thread."""
+        if self.running:
+            raise RuntimeError("Refresh thread is already running.")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pylunar-live-moon", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the refresh thread.
+
+        The last snapshot stays available.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The time (seconds) to wait for the thread to finish.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def refresh(self) -> MoonSnapshot:
+        """Compute and publish the snapshot for the current time.
+
+        Returns
+        -------
+        :class:`pylunar.MoonSnapshot`
+            The new snapshot.
+        """
+        with self._compute_lock:
+            return self._compute()
+
+    def snapshot(self) -> MoonSnapshot:
+        """Get the latest lunar state.
+
+        Returns
+        -------
+        :class:`pylunar.MoonSnapshot`
+            The latest snapshot, which is refreshed first when it is older
+            than the staleness bound.
+        """
+        snapshot = self._snapshot
+        if self.max_age is not None and self._is_stale(snapshot):
+            with self._compute_lock:
+                # Another reader may have refreshed while this one waited.
+                snapshot = self._snapshot
+                if self._is_stale(snapshot):
+                    snapshot = self._compute()
+        return snapshot
+
+    def _is_stale(self, snapshot: MoonSnapshot) -> bool:
+        return self.max_age is not None and time.monotonic() - snapshot.created > self.max_age
+
+    def _compute(self) -> MoonSnapshot:
+        # Called with the computation lock held.
+        moon_info = self.moon_info
+        date = float(self.clock())
+        moon_info.update(ephem.Date(date))
+        bits = 0
+        for mask, feature in self._masks:
+            if moon_info.is_visible(feature):
+                bits |= mask
+        snapshot = MoonSnapshot(
+            date,
+            time.monotonic(),
+            moon_info.phase_name(),
+            moon_info.fractional_phase(),
+            moon_info.colong(),
+            moon_info.altitude(),
+            moon_info.azimuth(),
+            moon_info.age(),
+            FeatureBitset(bits),
+        )
+        # A single attribute store, so readers see the old or new snapshot.
+        self._snapshot = snapshot
+        return snapshot
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as error:
+                # Keep refreshing, a failure such as a clock error may be
+                # transient. Readers can check the error and the age of the
+                # snapshot.
+                self.last_error = error
+            else:
+                self.last_error = None
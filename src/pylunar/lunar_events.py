@@ -0,0 +1,302 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the LunarEventFinder class."""
+
+from __future__ import annotations
+
+__all__ = ["LunarEvent", "LunarEventFinder"]
+
+from collections.abc import Callable, Iterable
+import functools
+import math
+from operator import attrgetter
+from typing import NamedTuple
+
+import ephem
+
+from .lunar_feature import LunarFeature
+from .moon_info import MoonInfo
+from .pkg_types import TimeLike
+from .search import brent, sign_changes
+
+
+class LunarEvent(NamedTuple):
+    """An extremum of the lunar distance or libration."""
+
+    date: float
+    """The ephem date of the event."""
+    kind: str
+    """The event kind, one of :attr:`LunarEventFinder.EVENT_KINDS`."""
+    value: float
+    """The distance (km) or libration (degrees) at the event."""
+
+
+class _Lunation(NamedTuple):
+    start: float
+    end: float
+    dates: list[float]
+    libration_lats: list[float]
+    libration_lons: list[float]
+    events: list[LunarEvent]
+
+
+class LunarEventFinder:
+    """Find lunar distance and libration extrema with a per-lunation cache.
+
+    Each lunation, from one new moon to the next, is sampled once. Extrema
+    are bracketed by a sign change of the sampled derivative and refined
+    with Brent's method on a central difference derivative of the exact
+    lunar state. The results are kept by lunation, so repeated searches over
+    the same months do not compute the Moon again. The events are geocentric
+    and do not depend on an observer location.
+
+    Parameters
+    ----------
+    step : float, optional
+        The spacing (days) of the samples.
+    """
+
+    EVENT_KINDS = (
+        "perigee",
+        "apogee",
+        "libration_lat_max",
+        "libration_lat_min",
+        "libration_lon_max",
+        "libration_lon_min",
+    )
+    # The kinds of events found for each lunation
+    DERIVATIVE_STEP = 1.0e-3
+    # The step (days) for the central difference derivative
+    TOLERANCE = 1.0 / 86400.0
+    # The tolerance (days) of the event times
+
+    def __init__(self, step: float = 0.25):
+        self.step = step
+        self._lunations: dict[float, _Lunation] = {}
+
+    def __len__(self) -> int:
+        """Length of the lunation cache.
+
+        Returns
+        -------
+        int
+            The number of cached lunations.
+        """
+        return len(self._lunations)
+
+    def _compute(self, date: float) -> ephem.Moon:
+        # A new body per computation, so one finder can serve many threads.
+        return ephem.Moon(ephem.Date(date))
+
+    def _distance(self, date: float) -> float:
+        return float(self._compute(date).earth_distance * ephem.meters_per_au / 1000.0)
+
+    def _libration_lat(self, date: float) -> float:
+        return math.degrees(self._compute(date).libration_lat)
+
+    def _libration_lon(self, date: float) -> float:
+        return math.degrees(self._compute(date).libration_long)
+
+    def _derivative(self, func: Callable[[float], float], date: float) -> float:
+        step = self.DERIVATIVE_STEP
+        return (func(date + step) - func(date - step)) / (2.0 * step)
+
+    def _extrema(
+        self, func: Callable[[float], float], dates: list[float], values: list[float], names: tuple[str, str]
+    ) -> list[LunarEvent]:
+        differences = [b - a for a, b in zip(values[:-1], values[1:], strict=True)]
+        derivative = functools.partial(self._derivative, func)
+        events = []
+        for index in sign_changes(differences):
+            # The extremum lies within the two sample intervals around the
+            # sample where the difference changes sign.
+            date = brent(derivative, dates[index], dates[index + 2], self.TOLERANCE)
+            name = names[0] if differences[index] > 0.0 else names[1]
+            events.append(LunarEvent(date, name, func(date)))
+        return events
+
+    def _lunation(self, date: float) -> _Lunation:
+        start = float(ephem.previous_new_moon(date))
+        lunation = self._lunations.get(start)
+        if lunation is not None:
+            return lunation
+
+        end = float(ephem.next_new_moon(start + 1.0))
+        num_steps = math.ceil((end - start) / self.step) + 2
+        dates = [start - self.step + i * self.step for i in range(num_steps + 1)]
+        distances = []
+        libration_lats = []
+        libration_lons = []
+        for sample_date in dates:
+            moon = self._compute(sample_date)
+            distances.append(float(moon.earth_distance * ephem.meters_per_au / 1000.0))
+            libration_lats.append(math.degrees(moon.libration_lat))
+            libration_lons.append(math.degrees(moon.libration_long))
+
+        # Maxima of the distance are apogees and minima are perigees.
+        events = self._extrema(self._distance, dates, distances, ("apogee", "perigee"))
+        events += self._extrema(
+            self._libration_lat, dates, libration_lats, ("libration_lat_max", "libration_lat_min")
+        )
+        events += self._extrema(
+            self._libration_lon, dates, libration_lons, ("libration_lon_max", "libration_lon_min")
+        )
+        events = [event for event in events if start <= event.date < end]
+        events.sort(key=attrgetter("date"))
+
+        lunation = _Lunation(start, end, dates, libration_lats, libration_lons, events)
+        self._lunations[start] = lunation
+        return lunation
+
+    def _lunations_between(self, start: float, end: float) -> Iterable[_Lunation]:
+        date = start
+        while date < end:
+            lunation = self._lunation(date)
+            yield lunation
+            date = lunation.end + self.TOLERANCE
+
+    def events(self, start: TimeLike, end: TimeLike, kinds: Iterable[str] | None = None) -> list[LunarEvent]:
+        """Find the distance and libration extrema within a time range.
+
+        Parameters
+        ----------
+        start : tuple or float
+            The UTC start time as a tuple or an ephem date.
+        end : tuple or float
+            The UTC end time as a tuple or an ephem date.
+        kinds : iterable of str, optional
+            Restrict the events to these kinds.
+
+        Returns
+        -------
+        list[:class:`pylunar.LunarEvent`]
+            The events sorted by time.
+        """
+        start_date = float(ephem.Date(start))
+        end_date = float(ephem.Date(end))
+        wanted = set(self.EVENT_KINDS if kinds is None else kinds)
+        return [
+            event
+            for lunation in self._lunations_between(start_date, end_date)
+            for event in lunation.events
+            if start_date <= event.date < end_date and event.kind in wanted
+        ]
+
+    def _next_event(self, date: TimeLike, kind: str) -> LunarEvent:
+        start = float(ephem.Date(date))
+        while True:
+            lunation = self._lunation(start)
+            for event in lunation.events:
+                if event.kind == kind and event.date >= float(ephem.Date(date)):
+                    return event
+            start = lunation.end + self.TOLERANCE
+
+    def next_apogee(self, date: TimeLike) -> LunarEvent:
+        """Find the next apogee.
+
+        Parameters
+        ----------
+        date : tuple or float
+            The UTC time to start from as a tuple or an ephem date.
+
+        Returns
+        -------
+        :class:`pylunar.LunarEvent`
+            The apogee event.
+        """
+        return self._next_event(date, "apogee")
+
+    def next_perigee(self, date: TimeLike) -> LunarEvent:
+        """Find the next perigee.
+
+        Parameters
+        ----------
+        date : tuple or float
+            The UTC time to start from as a tuple or an ephem date.
+
+        Returns
+        -------
+        :class:`pylunar.LunarEvent`
+            The perigee event.
+        """
+        return self._next_event(date, "perigee")
+
+    def libration_windows(
+        self, feature: LunarFeature, start: TimeLike, end: TimeLike, minimum_libration: float = 0.0
+    ) -> list[tuple[float, float]]:
+        """Find the intervals of favorable libration for a feature.
+
+        The libration is favorable when the libration phase angle matches the
+        feature angle as checked by :meth:`pylunar.MoonInfo.is_libration_ok`
+        and the total libration is at least the given value. Features
+        outside of the libration zone only need the total libration check.
+
+        Parameters
+        ----------
+        feature : :class:`pylunar.LunarFeature`
+            The lunar feature to check.
+        start : tuple or float
+            The UTC start time as a tuple or an ephem date.
+        end : tuple or float
+            The UTC end time as a tuple or an ephem date.
+        minimum_libration : float, optional
+            The minimum total libration (degrees).
+
+        Returns
+        -------
+        list[(float, float)]
+            The ephem date pairs of each interval.
+        """
+        start_date = float(ephem.Date(start))
+        end_date = float(ephem.Date(end))
+        feature_angle = feature.feature_angle()
+        in_zone = max(math.fabs(feature.latitude), math.fabs(feature.longitude)) > MoonInfo.LIBRATION_ZONE
+
+        def margin(libration_lat: float, libration_lon: float) -> float:
+            # Positive when the libration is favorable.
+            value = math.hypot(libration_lat, libration_lon) - minimum_libration
+            if in_zone:
+                # Same angle difference as MoonInfo.is_libration_angle_ok
+                phase_angle = math.degrees(math.atan2(libration_lon, libration_lat)) % 360.0
+                delta = phase_angle - feature_angle
+                delta -= 360.0 if delta > 180.0 else 0.0
+                value = min(value, MoonInfo.MAXIMUM_LIBRATION_PHASE_ANGLE_CUTOFF - math.fabs(delta))
+            return value
+
+        windows: list[tuple[float, float]] = []
+        for lunation in self._lunations_between(start_date, end_date):
+            dates = lunation.dates
+
+            def interpolated(date: float, lunation: _Lunation = lunation) -> float:
+                index = min(max(int((date - lunation.dates[0]) / self.step), 0), len(lunation.dates) - 2)
+                fraction = (date - lunation.dates[index]) / self.step
+                lat = lunation.libration_lats[index] * (1.0 - fraction)
+                lat += lunation.libration_lats[index + 1] * fraction
+                lon = lunation.libration_lons[index] * (1.0 - fraction)
+                lon += lunation.libration_lons[index + 1] * fraction
+                return margin(lat, lon)
+
+            low = max(start_date, lunation.start)
+            high = min(end_date, lunation.end)
+            samples = [interpolated(date) for date in dates]
+            boundaries = [low]
+            for index in sign_changes(samples):
+                crossing = brent(interpolated, dates[index], dates[index + 1], self.TOLERANCE)
+                if low < crossing < high:
+                    boundaries.append(crossing)
+            boundaries.append(high)
+            for window_start, window_end in zip(boundaries[:-1], boundaries[1:], strict=True):
+                if window_start < window_end and interpolated((window_start + window_end) / 2.0) >= 0.0:
+                    if windows and math.isclose(windows[-1][1], window_start, abs_tol=self.TOLERANCE):
+                        windows[-1] = (windows[-1][0], window_end)
+                    else:
+                        windows.append((window_start, window_end))
+        return windows
@@ -16,6 +16,7 @@ __all__ = ["LunarFeature"]
 
 import math
 import os
+import sys
 
 from .pkg_types import FeatureRow, Range
 
@@ -54,8 +55,27 @@ class LunarFeature:
     lunar_club_type : str or None
         The Lunar Club classification of the feature: Naked Eye, Binocular,
         Telescope. For a LunarII only feature this is None.
+    feature_id : int or None, optional
+        The stable identifier of the feature. This is the database primary
+        key for features read from the database.
     """
 
+    __slots__ = (
+        "name",
+        "diameter",
+        "latitude",
+        "longitude",
+        "delta_latitude",
+        "delta_longitude",
+        "feature_type",
+        "quad_name",
+        "quad_code",
+        "code_name",
+        "lunar_club_type",
+        "feature_id",
+    )
+    # Catalogs hold many features, so instances have no attribute dictionary
+
     def __init__(
         self,
         name: str,
@@ -69,6 +89,7 @@ class LunarFeature:
         quad_code: str,
         code_name: str,
         lunar_club_type: str | None,
+        feature_id: int | None = None,
     ):
         self.name = name
         self.diameter = diameter
@@ -76,11 +97,14 @@ class LunarFeature:
         self.longitude = longitude
         self.delta_latitude = delta_latitude
         self.delta_longitude = delta_longitude
-        self.feature_type = feature_type
-        self.quad_name = quad_name
-        self.quad_code = quad_code
-        self.code_name = code_name
-        self.lunar_club_type = str(lunar_club_type)
+        # The categorical values repeat across features, so every feature
+        # shares one copy of each.
+        self.feature_type = sys.intern(feature_type)
+        self.quad_name = sys.intern(quad_name)
+        self.quad_code = sys.intern(quad_code)
+        self.code_name = sys.intern(code_name)
+        self.lunar_club_type = sys.intern(str(lunar_club_type))
+        self.feature_id = feature_id
 
     def __str__(self) -> str:
         """Class string representation.
@@ -111,7 +135,7 @@ class LunarFeature:
         :class:`pylunar.LunarFeature`
             Class initialized from database row.
         """
-        return cls(*row[1:])
+        return cls(*row[1:], feature_id=row[0])
 
     def feature_angle(self) -> float:
         """Get the angle of the feature on the lunar face relative to North.
@@ -177,3 +201,25 @@ class LunarFeature:
         min_lon = self.longitude - (self.delta_longitude / 2.0)
         max_lon = self.longitude + (self.delta_longitude / 2.0)
         return (min_lon, max_lon)
+
+    def solar_altitude(self, colong: float, subsolar_lat: float) -> float:
+        """Find the altitude of the sun over the feature for a lunar state.
+
+        Parameters
+        ----------
+        colong : float
+            The selenographic colongitude in degrees.
+        subsolar_lat : float
+            The subsolar latitude in degrees.
+
+        Returns
+        -------
+        float
+            Solar altitude over feature in degrees.
+        """
+        rad_ss_lat = math.radians(subsolar_lat)
+        rad_feature_lat = math.radians(self.latitude)
+        term1 = math.sin(rad_ss_lat) * math.sin(rad_feature_lat)
+        term2a = math.cos(rad_ss_lat) * math.cos(rad_feature_lat)
+        term2b = math.sin(math.radians(colong + self.longitude))
+        return math.degrees(math.asin(term1 + term2a * term2b))
@@ -16,9 +16,11 @@ __all__ = ["LunarFeatureContainer"]
 
 import collections
 from collections.abc import Generator
-from importlib.resources import files
 import sqlite3
 
+from .catalog import default_database, load_catalog
+from .feature_bitset import FeatureBitset
+from .feature_query import FeatureQuery
 from .lunar_feature import LunarFeature
 from .moon_info import MoonInfo
 
@@ -31,15 +33,46 @@ class LunarFeatureContainer:
     club_name : str
         The name of the observing club to sort on. Values are Lunar and
         LunarII.
+    dbname : str, optional
+        The path of a database with the same Features table as the packaged
+        one. Defaults to the packaged database.
+
+    Notes
+    -----
+    Loading also builds secondary indexes that :meth:`query` uses: a bitset
+    of feature identifiers for every value of the attributes in
+    :attr:`pylunar.FeatureQuery.FIELDS` and the feature identifiers sorted
+    by diameter.
+
+    A loaded container can be read from many threads. Loading opens its own
+    database connection and replaces the features and indexes with new
+    objects instead of changing them, so readers keep the state they
+    started with.
     """
 
-    def __init__(self, club_name: str):
-        dbname = str(files("pylunar.data").joinpath("lunar.db"))
-        self.conn = sqlite3.connect(dbname)
+    def __init__(self, club_name: str, dbname: str | None = None):
+        self.dbname = default_database() if dbname is None else dbname
         self.club_name = club_name
         self.features: dict[int, LunarFeature] = collections.OrderedDict()
         self.club_type: set[str] = set()
         self.feature_type: set[str] = set()
+        self.indexes: dict[str, dict[str | None, FeatureBitset]] = {}
+        self.diameter_index: tuple[list[float], list[int]] = ([], [])
+
+    def __getitem__(self, feature_id: int) -> LunarFeature:
+        """Get a feature by its identifier.
+
+        Parameters
+        ----------
+        feature_id : int
+            The feature identifier.
+
+        Returns
+        -------
+        :class:`pylunar.LunarFeature`
+            The lunar feature.
+        """
+        return self.features[feature_id]
 
     def __iter__(self) -> Generator[LunarFeature, None, None]:
         """Create iterator for container.
@@ -71,21 +104,105 @@ class LunarFeatureContainer:
         limit : int, optional
             Restrict the number of features read to the given value.
         """
-        if len(self.features) != 0:
-            self.features = collections.OrderedDict()
-
-        cur = self.conn.cursor()
-        sql = f'select * from Features where Lunar_Code = "{self.club_name}" or Lunar_Code = "Both"'
+        features: dict[int, LunarFeature] = collections.OrderedDict()
+        club_type = set(self.club_type)
+        feature_type = set(self.feature_type)
+
+        # The features are shared with the catalog, so containers in forked
+        # workers reuse the ones read before the fork.
+        catalog = {feature.feature_id: feature for feature in load_catalog(self.dbname)}
+        sql = 'select Id, Type, Lunar_Club_Type from Features where Lunar_Code = ? or Lunar_Code = "Both"'
         if limit is not None:
-            sql += f" limit {limit}"
-        cur.execute(sql)
-
-        for row in cur:
-            feature = LunarFeature.from_row(row)
+            sql += f" limit {int(limit)}"
+        conn = sqlite3.connect(self.dbname)
+        try:
+            rows = conn.execute(sql, (self.club_name,)).fetchall()
+        finally:
+            conn.close()
+
+        for row in rows:
+            feature = catalog[row[0]]
             is_visible = True if moon_info is None else moon_info.is_visible(feature)
             if is_visible:
-                self.features[id(feature)] = feature
-                self.club_type.add(row[11])
-                self.feature_type.add(row[7])
+                features[row[0]] = feature
+                club_type.add(row[2])
+                feature_type.add(row[1])
+
+        indexes, diameter_index = self._build_indexes(features)
+        self.features = features
+        self.club_type = club_type
+        self.feature_type = feature_type
+        self.indexes = indexes
+        self.diameter_index = diameter_index
+
+    @staticmethod
+    def _build_indexes(
+        features: dict[int, LunarFeature],
+    ) -> tuple[dict[str, dict[str | None, FeatureBitset]], tuple[list[float], list[int]]]:
+        indexes: dict[str, dict[str | None, int]] = {field: {} for field in FeatureQuery.FIELDS}
+        for feature_id, feature in features.items():
+            for field, index in indexes.items():
+                value = getattr(feature, field)
+                index[value] = index.get(value, 0) | 1 << feature_id
+        bitsets = {
+            field: {value: FeatureBitset(bits) for value, bits in index.items()}
+            for field, index in indexes.items()
+        }
+        by_diameter = sorted((feature.diameter, feature_id) for feature_id, feature in features.items())
+        return bitsets, ([x[0] for x in by_diameter], [x[1] for x in by_diameter])
+
+    def query(self) -> FeatureQuery:
+        """Start a query over the loaded features.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureQuery`
+            The view selecting all loaded features.
+        """
+        return FeatureQuery(self, self.feature_set())
+
+    def feature_set(self) -> FeatureBitset:
+        """Get the identifiers of the loaded features.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The bitset of the loaded features.
+        """
+        return FeatureBitset.from_ids(self.features)
+
+    def select(self, feature_set: FeatureBitset) -> Generator[LunarFeature, None, None]:
+        """Get the loaded features that are part of a bitset.
+
+        Parameters
+        ----------
+        feature_set : :class:`pylunar.FeatureBitset`
+            The bitset of feature identifiers.
 
-        cur.close()
+        Yields
+        ------
+        :class:`pylunar.LunarFeature`
+            The current lunar feature.
+        """
+        for feature_id in feature_set:
+            if feature_id in self.features:
+                yield self.features[feature_id]
+
+    def visible_set(self, moon_info: MoonInfo) -> FeatureBitset:
+        """Get the identifiers of the loaded features that are visible.
+
+        Parameters
+        ----------
+        moon_info : :class:`pylunar.MoonInfo`
+            Instance of the Lunar information class.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The bitset of the visible features.
+        """
+        bits = 0
+        for feature_id, feature in self.features.items():
+            if moon_info.is_visible(feature):
+                bits |= 1 << feature_id
+        return FeatureBitset(bits)
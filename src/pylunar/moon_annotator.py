@@ -0,0 +1,158 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the MoonAnnotator class."""
+
+from __future__ import annotations
+
+__all__ = ["MoonAnnotation", "MoonAnnotator"]
+
+from array import array
+from collections.abc import Generator, Iterable
+import math
+from typing import Any, NamedTuple
+
+import ephem
+
+from .moon_info import MoonInfo
+from .phase_index import PhaseIndex
+from .pkg_types import TimeLike
+
+
+class MoonAnnotation(NamedTuple):
+    """The lunar state for one timestamp."""
+
+    date: float
+    """The ephem date of the timestamp."""
+    altitude: float
+    """The lunar altitude (degrees)."""
+    azimuth: float
+    """The lunar azimuth (degrees)."""
+    fractional_phase: float
+    """The illuminated fraction of the lunar disk."""
+    phase_name: str
+    """The lunar phase name."""
+    colong: float
+    """The selenographic colongitude (degrees)."""
+    age: float
+    """The lunar age (days)."""
+
+
+class MoonAnnotator:
+    """Bulk annotation of timestamps with the lunar state.
+
+    The timestamps can come in any order and repeat. They are deduplicated
+    and computed in time order, so the phase names come from the process
+    wide :meth:`pylunar.PhaseIndex.shared` index and the previous and next
+    new moons are only searched when a timestamp leaves the current
+    lunation. Each distinct timestamp and site needs a single lunar position
+    computation. The results are returned in the original order.
+
+    Parameters
+    ----------
+    moon_info : :class:`pylunar.MoonInfo`
+        Instance of the Lunar information class providing the default site
+        location. The instance is not modified.
+    """
+
+    NUMERIC_FIELDS = ("date", "altitude", "azimuth", "fractional_phase", "colong", "age")
+    # The annotation fields returned as arrays by columns
+
+    def __init__(self, moon_info: MoonInfo):
+        self.moon_info = moon_info
+        self.phase_index = PhaseIndex.shared()
+        self._lunation = (0.0, 0.0)
+
+    def _age(self, date: float) -> float:
+        previous_new_moon, next_new_moon = self._lunation
+        if not previous_new_moon <= date < next_new_moon:
+            previous_new_moon = float(ephem.previous_new_moon(date))
+            next_new_moon = float(ephem.next_new_moon(date))
+            self._lunation = (previous_new_moon, next_new_moon)
+        return date - previous_new_moon
+
+    def annotate(
+        self, dates: Iterable[TimeLike], sites: Iterable[MoonInfo] | None = None
+    ) -> Generator[MoonAnnotation, None, None]:
+        """Compute the lunar state for a sequence of timestamps.
+
+        Parameters
+        ----------
+        dates : iterable of tuple or float
+            The UTC timestamps as tuples or ephem dates.
+        sites : iterable of :class:`pylunar.MoonInfo`, optional
+            The site of every timestamp. Defaults to the annotator site.
+
+        Yields
+        ------
+        :class:`pylunar.MoonAnnotation`
+            The lunar state for the current timestamp.
+        """
+        date_list = [float(ephem.Date(date)) for date in dates]
+        if sites is None:
+            site_list = [self.moon_info]
+            keys = [(date, 0) for date in date_list]
+        else:
+            positions: dict[int, int] = {}
+            site_list = []
+            keys = []
+            for date, site in zip(date_list, sites, strict=True):
+                position = positions.setdefault(id(site), len(site_list))
+                if position == len(site_list):
+                    site_list.append(site)
+                keys.append((date, position))
+        if not keys:
+            return
+
+        observers = [site.observer.copy() for site in site_list]
+        unique_keys = sorted(set(keys))
+        self.phase_index.extend(unique_keys[0][0], unique_keys[-1][0])
+        moon = ephem.Moon()
+        results: dict[tuple[float, int], MoonAnnotation] = {}
+        for key in unique_keys:
+            date, position = key
+            observer = observers[position]
+            observer.date = date
+            moon.compute(observer)
+            results[key] = MoonAnnotation(
+                date,
+                math.degrees(moon.alt),
+                math.degrees(moon.az),
+                float(moon.moon_phase),
+                self.phase_index.phase_name(date),
+                math.degrees(moon.colong),
+                self._age(date),
+            )
+        for key in keys:
+            yield results[key]
+
+    def columns(self, dates: Iterable[TimeLike], sites: Iterable[MoonInfo] | None = None) -> dict[str, Any]:
+        """Compute the lunar state for a sequence of timestamps as columns.
+
+        Parameters
+        ----------
+        dates : iterable of tuple or float
+            The UTC timestamps as tuples or ephem dates.
+        sites : iterable of :class:`pylunar.MoonInfo`, optional
+            The site of every timestamp. Defaults to the annotator site.
+
+        Returns
+        -------
+        dict[str, array or list]
+            A double array for every field in :attr:`NUMERIC_FIELDS` and a
+            list of the phase names, in the original timestamp order.
+        """
+        columns: dict[str, Any] = {field: array("d") for field in self.NUMERIC_FIELDS}
+        columns["phase_name"] = []
+        for annotation in self.annotate(dates, sites):
+            for field in self.NUMERIC_FIELDS:
+                columns[field].append(getattr(annotation, field))
+            columns["phase_name"].append(annotation.phase_name)
+        return columns
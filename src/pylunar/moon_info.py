@@ -12,19 +12,19 @@
 
 from __future__ import annotations
 
-__all__ = ["MoonInfo"]
+__all__ = ["MoonInfo", "PHASE_EMOJI", "PhaseName", "TimeOfDay"]
 
-from datetime import datetime, timezone
+import copy
 from enum import Enum
 import math
 from operator import itemgetter
-import zoneinfo
 
 import ephem
 
+from .conversions import get_timezone, mjd_to_datetime
 from .helpers import mjd_to_date_tuple, tuple_to_string
 from .lunar_feature import LunarFeature
-from .pkg_types import DateTimeTuple, DmsCoordinate, MoonPhases
+from .pkg_types import ColongitudeWindow, DateTimeTuple, DmsCoordinate, MoonPhases
 
 
 class PhaseName(Enum):
@@ -40,6 +40,19 @@ class PhaseName(Enum):
     WANING_CRESCENT = 7
 
 
+PHASE_EMOJI = {
+    "NEW_MOON": "🌑",
+    "WAXING_CRESCENT": "🌒",
+    "FIRST_QUARTER": "🌓",
+    "WAXING_GIBBOUS": "🌔",
+    "FULL_MOON": "🌕",
+    "WANING_GIBBOUS": "🌖",
+    "LAST_QUARTER": "🌗",
+    "WANING_CRESCENT": "🌘",
+}
+"""Standard emoji for each lunar phase name."""
+
+
 class TimeOfDay(Enum):
     """Time of day from the lunar terminator."""
 
@@ -59,14 +72,20 @@ class MoonInfo:
 
     Parameters
     ----------
-    latitude : tuple of 3 ints
+    latitude : tuple of 3 ints or float
         The latitude of the observer in GPS DMS(Degrees, Minutes and
-        Seconds) format.
-    longitude : tuple of 3 ints
+        Seconds) format or in decimal degrees.
+    longitude : tuple of 3 ints or float
         The longitude of the observer in GPS DMS(Degrees, Minutes and
-        Seconds) format.
+        Seconds) format or in decimal degrees.
     name : str, optional
         A name for the observer's location.
+
+    Notes
+    -----
+    An instance is not safe to update from several threads, since
+    :meth:`update` changes the shared observer and Moon state. Use one
+    instance per thread.
     """
 
     DAYS_TO_HOURS = 24.0
@@ -88,10 +107,12 @@ class MoonInfo:
         "last_quarter": (ephem.previous_full_moon, "full_moon"),
     }
 
-    def __init__(self, latitude: DmsCoordinate, longitude: DmsCoordinate, name: str | None = None):
+    def __init__(
+        self, latitude: DmsCoordinate | float, longitude: DmsCoordinate | float, name: str | None = None
+    ):
         self.observer = ephem.Observer()
-        self.observer.lat = tuple_to_string(latitude)
-        self.observer.long = tuple_to_string(longitude)
+        self.observer.lat = tuple_to_string(latitude) if isinstance(latitude, tuple) else str(latitude)
+        self.observer.long = tuple_to_string(longitude) if isinstance(longitude, tuple) else str(longitude)
         self.moon = ephem.Moon()
 
     def age(self) -> float:
@@ -138,6 +159,30 @@ class MoonInfo:
         moon_size: float = self.moon.size
         return moon_size / 3600.0
 
+    def axis_position_angle(self) -> float:
+        """Position angle of the lunar rotation axis in degrees.
+
+        The angle of the northern end of the axis is measured from celestial
+        north towards east, following Meeus, Astronomical Algorithms, chapter
+        53, without the small physical libration and nutation terms.
+
+        Returns
+        -------
+        float
+            The axis position angle between -180 and 180 degrees.
+        """
+        centuries = (float(self.observer.date) - 36525.0) / 36525.0
+        node = math.radians(125.0445479 - 1934.1362891 * centuries)
+        obliquity = math.radians(23.4392911 - 0.0130042 * centuries)
+        # The inclination of the lunar equator to the ecliptic is 1.54242°.
+        sin_i = math.sin(math.radians(1.54242))
+        cos_i = math.cos(math.radians(1.54242))
+        x = sin_i * math.sin(node)
+        y = sin_i * math.cos(node) * math.cos(obliquity) - cos_i * math.sin(obliquity)
+        omega = math.atan2(x, y)
+        sin_p = math.hypot(x, y) * math.cos(self.moon.g_ra - omega) / math.cos(self.moon.libration_lat)
+        return math.degrees(math.asin(max(-1.0, min(1.0, sin_p))))
+
     def azimuth(self) -> float:
         """Lunar azimuth in degrees.
 
@@ -148,6 +193,26 @@ class MoonInfo:
         """
         return math.degrees(self.moon.az)
 
+    def bright_limb_angle(self) -> float:
+        """Position angle of the lunar bright limb in degrees.
+
+        The angle of the midpoint of the illuminated limb is measured from
+        celestial north towards east, so a waxing moon is near 270 degrees.
+
+        Returns
+        -------
+        float
+            The bright limb position angle.
+        """
+        sun = ephem.Sun(self.observer)
+        delta_ra = sun.ra - self.moon.ra
+        angle = math.atan2(
+            math.cos(sun.dec) * math.sin(delta_ra),
+            math.sin(sun.dec) * math.cos(self.moon.dec)
+            - math.cos(sun.dec) * math.sin(self.moon.dec) * math.cos(delta_ra),
+        )
+        return math.degrees(angle) % 360.0
+
     def colong(self) -> float:
         """Lunar selenographic colongitude in degrees.
 
@@ -158,6 +223,22 @@ class MoonInfo:
         """
         return math.degrees(self.moon.colong)
 
+    def copy(self) -> MoonInfo:
+        """Copy the Lunar information for the same site.
+
+        The copy has its own observer and moon, so updating it does not
+        change this instance.
+
+        Returns
+        -------
+        :class:`pylunar.MoonInfo`
+            The copy with the same observer settings and time.
+        """
+        clone = copy.copy(self)
+        clone.observer = self.observer.copy()
+        clone.moon = self.moon.copy()
+        return clone
+
     def dec(self) -> float:
         """Lunar current declination in degrees.
 
@@ -274,15 +355,36 @@ class MoonInfo:
         bool
             True if visible, False if not.
         """
-        is_lon_in_zone = math.fabs(feature.longitude) > self.LIBRATION_ZONE
-        is_lat_in_zone = math.fabs(feature.latitude) > self.LIBRATION_ZONE
+        return self.is_libration_angle_ok(feature, self.libration_phase_angle())
+
+    @classmethod
+    def is_libration_angle_ok(cls, feature: LunarFeature, libration_phase_angle: float) -> bool:
+        """Determine if lunar feature is visible for a given libration.
+
+        This performs the same check as :meth:`is_libration_ok`, but takes
+        the libration phase angle explicitly so that it can be used with
+        interpolated or cached lunar states.
+
+        Parameters
+        ----------
+        feature : :class:`pylunar.LunarFeature`
+            The lunar feature instance to check.
+        libration_phase_angle : float
+            The libration phase angle in degrees.
+
+        Returns
+        -------
+        bool
+            True if visible, False if not.
+        """
+        is_lon_in_zone = math.fabs(feature.longitude) > cls.LIBRATION_ZONE
+        is_lat_in_zone = math.fabs(feature.latitude) > cls.LIBRATION_ZONE
         if is_lat_in_zone or is_lon_in_zone:
             feature_angle = feature.feature_angle()
-            libration_phase_angle = self.libration_phase_angle()
             delta_phase_angle = libration_phase_angle - feature_angle
             delta_phase_angle -= 360.0 if delta_phase_angle > 180.0 else 0.0
 
-            return math.fabs(delta_phase_angle) <= self.MAXIMUM_LIBRATION_PHASE_ANGLE_CUTOFF
+            return math.fabs(delta_phase_angle) <= cls.MAXIMUM_LIBRATION_PHASE_ANGLE_CUTOFF
 
         return True
 
@@ -332,6 +434,49 @@ class MoonInfo:
 
         return is_visible and self.is_libration_ok(feature)
 
+    @classmethod
+    def visibility_windows(cls, feature: LunarFeature) -> list[ColongitudeWindow]:
+        """Colongitude ranges where the terminator makes the feature visible.
+
+        This inverts the terminator part of :meth:`is_visible`. Each window
+        is given as a (start, end, time of day) triplet in degrees of
+        colongitude. Morning windows are expressed on the continuous range
+        [270, 450) so that they do not split at colongitude zero. The
+        libration check is not included.
+
+        Parameters
+        ----------
+        feature : :class:`pylunar.LunarFeature`
+            The lunar feature instance to check.
+
+        Returns
+        -------
+        list[(float, float, str)]
+            The visibility windows, morning first.
+        """
+        min_lon, max_lon = feature.longitude_range()
+        if min_lon > max_lon:
+            min_lon, max_lon = max_lon, min_lon
+
+        no_cutoff = feature.feature_type in cls.NO_CUTOFF_TYPE
+        if no_cutoff:
+            cutoff = cls.FEATURE_CUTOFF
+        else:
+            cutoff = cls.FEATURE_CUTOFF / math.cos(math.radians(feature.latitude))
+
+        windows: list[ColongitudeWindow] = []
+        # Morning terminator longitude is 360 - colongitude on [270, 450)
+        start = max(360.0 - min_lon, 270.0)
+        end = 450.0 if no_cutoff else min(360.0 - min_lon + cutoff, 450.0)
+        if start < end:
+            windows.append((start, end, TimeOfDay.MORNING.name))
+        # Evening terminator longitude is 180 - colongitude on [90, 270)
+        start = 90.0 if no_cutoff else max(180.0 - max_lon - cutoff, 90.0)
+        end = min(180.0 - max_lon, 270.0)
+        if start < end:
+            windows.append((start, end, TimeOfDay.EVENING.name))
+        return windows
+
     def next_four_phases(self) -> MoonPhases:
         """Next four phases in date sorted order (closest phase first).
 
@@ -453,7 +598,7 @@ class MoonInfo:
 :    ::::::
 `.   :::::'
   `-.::''        """
-        elif phase == PhaseName.WAXING_CRESCENT.name:
+        elif phase == PhaseName.WANING_CRESCENT.name:
             return """   _..._
  .' .::::.
 :  ::::::::
@@ -474,16 +619,7 @@ class MoonInfo:
         str
             The lunar phase emoji.
         """
-        return {
-            "NEW_MOON": "🌑",
-            "WAXING_CRESCENT": "🌒",
-            "FIRST_QUARTER": "🌓",
-            "WAXING_GIBBOUS": "🌔",
-            "FULL_MOON": "🌕",
-            "WANING_GIBBOUS": "🌖",
-            "LAST_QUARTER": "🌗",
-            "WANING_CRESCENT": "🌘",
-        }[self.phase_name()]
+        return PHASE_EMOJI[self.phase_name()]
 
     def ra(self) -> float:
         """Lunar current right ascension in degrees.
@@ -509,48 +645,35 @@ class MoonInfo:
             Set of rise, set, and transit times in the local time system. If
             event does not happen, 'Does not xxx' is tuple value.
         """
-        tz: zoneinfo.ZoneInfo | timezone
-        try:
-            tz = zoneinfo.ZoneInfo(timezone_name)
-        except zoneinfo.ZoneInfoNotFoundError:
-            tz = timezone.utc
+        tz = get_timezone(timezone_name)
 
         func_map = {"rise": "rising", "transit": "transit", "set": "setting"}
 
-        # Need to set observer's horizon and pressure to get times
-        old_pressure = self.observer.pressure
-        old_horizon = self.observer.horizon
+        # The searches need their own horizon and pressure, so they use a
+        # copy of the observer and a separate body and leave this instance
+        # unchanged.
+        observer = self.observer.copy()
+        observer.pressure = 0
+        observer.horizon = "-0:34"
+        moon = ephem.Moon()
 
-        self.observer.pressure = 0
-        self.observer.horizon = "-0:34"
-
-        current_date_utc = datetime(
-            *mjd_to_date_tuple(self.observer.date, round_off=True), tzinfo=timezone.utc
-        )  # type: ignore
-        current_date = current_date_utc.astimezone(tz)
+        current_date = mjd_to_datetime(self.observer.date, tz, round_off=True)
         current_day = current_date.day
         times = {}
         does_not = None
         for time_type in ("rise", "transit", "set"):
-            mjd_time = getattr(self.observer, "{}_{}".format("next", func_map[time_type]))(self.moon)
-            utc_time = datetime(*mjd_to_date_tuple(mjd_time, round_off=True), tzinfo=timezone.utc)  # type: ignore
-            local_date = utc_time.astimezone(tz)
+            mjd_time = getattr(observer, "{}_{}".format("next", func_map[time_type]))(moon)
+            local_date = mjd_to_datetime(mjd_time, tz, round_off=True)
             if local_date.day == current_day:
                 times[time_type] = local_date
             else:
-                mjd_time = getattr(self.observer, "{}_{}".format("previous", func_map[time_type]))(self.moon)
-                utc_time = datetime(*mjd_to_date_tuple(mjd_time, round_off=True), tzinfo=timezone.utc)  # type: ignore
-                local_date = utc_time.astimezone(tz)
+                mjd_time = getattr(observer, "{}_{}".format("previous", func_map[time_type]))(moon)
+                local_date = mjd_to_datetime(mjd_time, tz, round_off=True)
                 if local_date.day == current_day:
                     times[time_type] = local_date
                 else:
                     does_not = (time_type, f"Does not {time_type}")
 
-        # Return observer and moon to previous state
-        self.observer.pressure = old_pressure
-        self.observer.horizon = old_horizon
-        self.moon.compute(self.observer)
-
         original_sorted_times = sorted(times.items(), key=itemgetter(1))
         sorted_times: MoonPhases = [(xtime[0], xtime[1].timetuple()[:6]) for xtime in original_sorted_times]
         if does_not is not None:
@@ -574,12 +697,7 @@ class MoonInfo:
         float
             Solar altitude over feature in degrees.
         """
-        rad_ss_lat = math.radians(self.subsolar_lat())
-        rad_feature_lat = math.radians(feature.latitude)
-        term1 = math.sin(rad_ss_lat) * math.sin(rad_feature_lat)
-        term2a = math.cos(rad_ss_lat) * math.cos(rad_feature_lat)
-        term2b = math.sin(math.radians(self.colong() + feature.longitude))
-        return math.degrees(math.asin(term1 + term2a * term2b))
+        return feature.solar_altitude(self.colong(), self.subsolar_lat())
 
     def subsolar_lat(self) -> float:
         """Latitude in degress on the moon where the sun is overhead.
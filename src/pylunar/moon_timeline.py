@@ -0,0 +1,175 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the MoonTimeline class."""
+
+from __future__ import annotations
+
+__all__ = ["MoonTimeline"]
+
+from bisect import bisect_right
+import math
+
+import ephem
+
+from .moon_info import MoonInfo
+from .pkg_types import TimeLike
+
+
+class MoonTimeline:
+    """Lunar state sampled at regular steps over a time range.
+
+    The selenographic colongitude, subsolar latitude and librations are
+    smooth over hours, so they are computed at the sample nodes only and
+    linearly interpolated in between. The colongitude is unwrapped so it
+    increases monotonically over the range which allows the inverse lookup
+    of the time for a given colongitude.
+
+    Parameters
+    ----------
+    moon_info : :class:`pylunar.MoonInfo`
+        Instance of the Lunar information class. Only the observer location
+        is used, the instance is not modified.
+    start : tuple or float
+        The UTC start time as a tuple or an ephem date.
+    end : tuple or float
+        The UTC end time as a tuple or an ephem date.
+    step : float, optional
+        The spacing (days) of the sample nodes.
+    """
+
+    def __init__(self, moon_info: MoonInfo, start: TimeLike, end: TimeLike, step: float = 1.0 / 24.0):
+        self.start = float(ephem.Date(start))
+        self.end = float(ephem.Date(end))
+        if self.end <= self.start:
+            raise ValueError("End time must be after start time.")
+
+        observer = moon_info.observer.copy()
+        moon = ephem.Moon()
+        num_steps = max(1, math.ceil((self.end - self.start) / step))
+        self.dates = [self.start + i * (self.end - self.start) / num_steps for i in range(num_steps + 1)]
+        self.colongs: list[float] = []
+        self.subsolar_lats: list[float] = []
+        self.libration_lats: list[float] = []
+        self.libration_lons: list[float] = []
+
+        offset = 0.0
+        for date in self.dates:
+            observer.date = date
+            moon.compute(observer)
+            colong = math.degrees(moon.colong) + offset
+            if self.colongs and colong < self.colongs[-1]:
+                offset += 360.0
+                colong += 360.0
+            self.colongs.append(colong)
+            self.subsolar_lats.append(math.degrees(moon.subsolar_lat))
+            self.libration_lats.append(math.degrees(moon.libration_lat))
+            self.libration_lons.append(math.degrees(moon.libration_long))
+
+    def __len__(self) -> int:
+        """Length of the timeline.
+
+        Returns
+        -------
+        int
+            The number of sample nodes.
+        """
+        return len(self.dates)
+
+    def _interpolate(self, values: list[float], date: float) -> float:
+        index = min(max(bisect_right(self.dates, date) - 1, 0), len(self.dates) - 2)
+        t0 = self.dates[index]
+        fraction = (date - t0) / (self.dates[index + 1] - t0)
+        return values[index] + fraction * (values[index + 1] - values[index])
+
+    def align(self, colong: float) -> float:
+        """Shift a colongitude onto the unwrapped range of the timeline.
+
+        Parameters
+        ----------
+        colong : float
+            The colongitude in degrees.
+
+        Returns
+        -------
+        float
+            The equivalent colongitude that is closest to, but not below,
+            the colongitude at the start of the timeline.
+        """
+        return self.colongs[0] + (colong - self.colongs[0]) % 360.0
+
+    def colong_at(self, date: float) -> float:
+        """Get the unwrapped colongitude at a given time.
+
+        Parameters
+        ----------
+        date : float
+            The ephem date to interpolate at.
+
+        Returns
+        -------
+        float
+            The unwrapped colongitude in degrees.
+        """
+        return self._interpolate(self.colongs, date)
+
+    def date_at_colong(self, colong: float) -> float | None:
+        """Get the time the terminator reaches a given colongitude.
+
+        Parameters
+        ----------
+        colong : float
+            The unwrapped colongitude in degrees.
+
+        Returns
+        -------
+        float or None
+            The ephem date for the colongitude or None if it falls outside
+            of the timeline.
+        """
+        if not self.colongs[0] <= colong <= self.colongs[-1]:
+            return None
+        index = min(max(bisect_right(self.colongs, colong) - 1, 0), len(self.colongs) - 2)
+        c0 = self.colongs[index]
+        fraction = (colong - c0) / (self.colongs[index + 1] - c0)
+        return self.dates[index] + fraction * (self.dates[index + 1] - self.dates[index])
+
+    def libration_phase_angle_at(self, date: float) -> float:
+        """Get the libration phase angle at a given time.
+
+        Parameters
+        ----------
+        date : float
+            The ephem date to interpolate at.
+
+        Returns
+        -------
+        float
+            The libration phase angle in degrees.
+        """
+        libration_lat = self._interpolate(self.libration_lats, date)
+        libration_lon = self._interpolate(self.libration_lons, date)
+        phase_angle = math.degrees(math.atan2(libration_lon, libration_lat))
+        return phase_angle + 360.0 if phase_angle < 0 else phase_angle
+
+    def subsolar_lat_at(self, date: float) -> float:
+        """Get the subsolar latitude at a given time.
+
+        Parameters
+        ----------
+        date : float
+            The ephem date to interpolate at.
+
+        Returns
+        -------
+        float
+            The subsolar latitude in degrees.
+        """
+        return self._interpolate(self.subsolar_lats, date)
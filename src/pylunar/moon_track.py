@@ -0,0 +1,245 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the MoonTrack class."""
+
+from __future__ import annotations
+
+__all__ = ["MoonTrack", "TrackSample"]
+
+from bisect import bisect_right
+import math
+from typing import NamedTuple
+
+import ephem
+
+from .moon_info import MoonInfo
+from .pkg_types import TimeLike
+
+Vector = tuple[float, float, float]
+
+
+class TrackSample(NamedTuple):
+    """A computed point of the lunar track."""
+
+    date: float
+    """The ephem date of the sample."""
+    altitude: float
+    """The lunar altitude (degrees)."""
+    azimuth: float
+    """The lunar azimuth (degrees)."""
+    event: str | None
+    """The event at the sample, one of rise, transit or set, or None."""
+
+
+def _vector(altitude: float, azimuth: float) -> Vector:
+    # Unit vector towards a horizontal position, east, north and up.
+    cos_alt = math.cos(altitude)
+    return (cos_alt * math.sin(azimuth), cos_alt * math.cos(azimuth), math.sin(altitude))
+
+
+def _horizontal(vector: Vector) -> tuple[float, float]:
+    x, y, z = vector
+    norm = math.sqrt(x * x + y * y + z * z)
+    azimuth = math.degrees(math.atan2(x, y)) % 360.0
+    return math.degrees(math.asin(max(-1.0, min(1.0, z / norm)))), azimuth
+
+
+def _separation(a: Vector, b: Vector) -> float:
+    # Angle (degrees) between two unit vectors from their chord.
+    chord = math.sqrt(sum((p - q) ** 2 for p, q in zip(a, b, strict=True)))
+    return math.degrees(2.0 * math.asin(min(1.0, chord / 2.0)))
+
+
+class MoonTrack:
+    """Lunar altitude and azimuth over a time range with adaptive sampling.
+
+    The track starts from samples at the range ends, at every rise, transit
+    and set, found the same way as by :meth:`pylunar.MoonInfo.rise_set_times`,
+    and at a coarse regular step. Intervals are split at their midpoint until
+    the interpolated position there is close enough to the computed one that
+    both halves are within the tolerance. The position between samples is
+    interpolated along the chord of the unit vectors, so the track needs few
+    samples where the motion is smooth. Near the horizon a tighter tolerance
+    applies, so the crossings are drawn precisely.
+
+    Like the rise and set searches, the positions are computed without
+    atmospheric refraction, so the Moon rises and sets where the altitude of
+    its upper limb crosses -0°34'.
+
+    Parameters
+    ----------
+    moon_info : :class:`pylunar.MoonInfo`
+        Instance of the Lunar information class providing the observer
+        location. The instance is not modified.
+    start : tuple or float
+        The UTC start time as a tuple or an ephem date.
+    end : tuple or float
+        The UTC end time as a tuple or an ephem date.
+    tolerance : float, optional
+        The largest angular error (degrees) of the interpolated positions.
+    horizon_tolerance : float, optional
+        The largest angular error (degrees) within the horizon band.
+        Defaults to a tenth of the tolerance.
+    max_step : float, optional
+        The spacing (days) of the initial samples.
+    min_step : float, optional
+        The shortest interval (days) between samples.
+    """
+
+    HORIZON_BAND = 2.0
+    # The distance (degrees) from the horizon where the horizon tolerance
+    # applies
+
+    def __init__(
+        self,
+        moon_info: MoonInfo,
+        start: TimeLike,
+        end: TimeLike,
+        tolerance: float = 0.1,
+        horizon_tolerance: float | None = None,
+        max_step: float = 0.125,
+        min_step: float = 1.0 / 1440.0,
+    ):
+        self.start = float(ephem.Date(start))
+        self.end = float(ephem.Date(end))
+        if self.end <= self.start:
+            raise ValueError("End time must be after start time.")
+        self.tolerance = tolerance
+        self.horizon_tolerance = tolerance / 10.0 if horizon_tolerance is None else horizon_tolerance
+        self.computes = 0
+
+        # The same horizon and refraction settings as rise_set_times.
+        self._observer = moon_info.observer.copy()
+        self._observer.pressure = 0
+        self._observer.horizon = "-0:34"
+        self._moon = ephem.Moon()
+        events = self._events()
+        num_steps = max(1, math.ceil((self.end - self.start) / max_step))
+        dates = {self.start + i * (self.end - self.start) / num_steps for i in range(num_steps + 1)}
+        dates.update(events)
+
+        samples = [self._sample(date, events.get(date)) for date in sorted(dates)]
+        vectors = [_vector(math.radians(s.altitude), math.radians(s.azimuth)) for s in samples]
+        self.samples: list[TrackSample] = []
+        self._vectors: list[Vector] = []
+        for index in range(len(samples) - 1):
+            self._refine(samples[index], vectors[index], samples[index + 1], vectors[index + 1], min_step)
+        self.samples.append(samples[-1])
+        self._vectors.append(vectors[-1])
+        self._dates = [sample.date for sample in self.samples]
+
+    def __len__(self) -> int:
+        """Length of the track.
+
+        Returns
+        -------
+        int
+            The number of computed samples.
+        """
+        return len(self.samples)
+
+    def _events(self) -> dict[float, str]:
+        observer = self._observer.copy()
+        moon = ephem.Moon()
+        events = {}
+        for kind, method in (
+            ("rise", observer.next_rising),
+            ("transit", observer.next_transit),
+            ("set", observer.next_setting),
+        ):
+            date = self.start
+            while True:
+                try:
+                    date = float(method(moon, start=date))
+                except ephem.CircumpolarError:
+                    break
+                if date > self.end:
+                    break
+                events[date] = kind
+                date += 1.0 / 1440.0
+        return events
+
+    def _sample(self, date: float, event: str | None = None) -> TrackSample:
+        self.computes += 1
+        self._observer.date = date
+        self._moon.compute(self._observer)
+        return TrackSample(date, math.degrees(self._moon.alt), math.degrees(self._moon.az), event)
+
+    def _refine(
+        self,
+        left: TrackSample,
+        left_vector: Vector,
+        right: TrackSample,
+        right_vector: Vector,
+        min_step: float,
+    ) -> None:
+        # Depth first, so the samples are appended in time order.
+        stack = [(right, right_vector), (left, left_vector)]
+        while len(stack) > 1:
+            left, left_vector = stack.pop()
+            right, right_vector = stack[-1]
+            if right.date - left.date > min_step:
+                middle = self._sample(0.5 * (left.date + right.date))
+                middle_vector = _vector(math.radians(middle.altitude), math.radians(middle.azimuth))
+                interpolated = tuple(0.5 * (p + q) for p, q in zip(left_vector, right_vector, strict=True))
+                norm = math.sqrt(sum(value * value for value in interpolated))
+                error = _separation(
+                    middle_vector, (interpolated[0] / norm, interpolated[1] / norm, interpolated[2] / norm)
+                )
+                altitudes = (left.altitude, middle.altitude, right.altitude)
+                near_horizon = min(altitudes) < self.HORIZON_BAND and max(altitudes) > -self.HORIZON_BAND
+                tolerance = self.horizon_tolerance if near_horizon else self.tolerance
+                # The chord error shrinks with the square of the interval, so
+                # with the middle sample kept each half is within a quarter
+                # of the error measured here.
+                if error > 4.0 * tolerance:
+                    stack.append((middle, middle_vector))
+                    stack.append((left, left_vector))
+                    continue
+                self.samples.append(left)
+                self._vectors.append(left_vector)
+                left, left_vector = middle, middle_vector
+            self.samples.append(left)
+            self._vectors.append(left_vector)
+
+    @property
+    def events(self) -> list[TrackSample]:
+        """The samples at rise, transit and set (list)."""
+        return [sample for sample in self.samples if sample.event is not None]
+
+    def at(self, date: TimeLike) -> tuple[float, float]:
+        """Interpolate the lunar position at a given time.
+
+        Parameters
+        ----------
+        date : tuple or float
+            The UTC time as a tuple or an ephem date within the track range.
+
+        Returns
+        -------
+        tuple[float, float]
+            The lunar altitude and azimuth (degrees).
+
+        Raises
+        ------
+        ValueError
+            If the time is outside of the track range.
+        """
+        mjd = float(ephem.Date(date))
+        if not self.start <= mjd <= self.end:
+            raise ValueError("Time is outside of the track range.")
+        index = min(bisect_right(self._dates, mjd) - 1, len(self._dates) - 2)
+        t0 = self._dates[index]
+        fraction = (mjd - t0) / (self._dates[index + 1] - t0)
+        left = self._vectors[index]
+        right = self._vectors[index + 1]
+        x, y, z = (p + fraction * (q - p) for p, q in zip(left, right, strict=True))
+        return _horizontal((x, y, z))
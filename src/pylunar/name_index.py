@@ -0,0 +1,235 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the NameIndex class."""
+
+from __future__ import annotations
+
+__all__ = ["NameIndex", "normalize_name"]
+
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+import functools
+import unicodedata
+
+from .catalog import load_catalog
+from .lunar_feature import LunarFeature
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a feature name for lookups.
+
+    Diacritics are removed, the case is folded and every run of
+    non-alphanumeric characters becomes a single space.
+
+    Parameters
+    ----------
+    name : str
+        The name to normalize.
+
+    Returns
+    -------
+    str
+        The normalized name.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+    return " ".join("".join(c if c.isalnum() else " " for c in stripped).split())
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(first: str, second: str, max_distance: int) -> int:
+    # Levenshtein distance that gives up once every entry of a row is above
+    # the maximum distance.
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        for j, second_char in enumerate(second, 1):
+            cost = 0 if first_char == second_char else 1
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class NameIndex:
+    """In-memory index of Lunar feature names.
+
+    Every name is normalized with :func:`normalize_name` and stored once per
+    word, as the name from that word on, in a sorted list. Prefix lookups are
+    a bisection into that list, so "imbr" finds Mare Imbrium. Fuzzy lookups
+    use a trigram index to find candidate keys and only compute the edit
+    distance for those.
+
+    Parameters
+    ----------
+    features : iterable of :class:`pylunar.LunarFeature`
+        The features to index.
+    """
+
+    LONG_NAME = 8
+    # The normalized length from which fuzzy lookups allow two edits
+
+    def __init__(self, features: Iterable[LunarFeature]):
+        self.features = tuple(features)
+        entries: dict[str, list[int]] = {}
+        self._names: dict[str, int] = {}
+        for position, feature in enumerate(self.features):
+            words = normalize_name(feature.name).split()
+            self._names.setdefault(" ".join(words), position)
+            for i in range(len(words)):
+                entries.setdefault(" ".join(words[i:]), []).append(position)
+        self._keys = sorted(entries)
+        self._positions = [entries[key] for key in self._keys]
+        # Posting lists are split by key length, since a fuzzy match can only
+        # differ in length by the maximum edit distance.
+        self._trigrams: dict[tuple[int, str], list[int]] = {}
+        for key_index, key in enumerate(self._keys):
+            for trigram in _trigrams(key):
+                self._trigrams.setdefault((len(key), trigram), []).append(key_index)
+
+    @classmethod
+    def from_catalog(cls: type[NameIndex], dbname: str | None = None) -> NameIndex:
+        """Get the shared index over a whole feature catalog.
+
+        The index is built once per database and shared by all callers.
+
+        Parameters
+        ----------
+        dbname : str, optional
+            The path of the feature database. Defaults to the packaged
+            database.
+
+        Returns
+        -------
+        :class:`pylunar.NameIndex`
+            The name index.
+        """
+        return _catalog_index(dbname)
+
+    def __len__(self) -> int:
+        """Length of the index.
+
+        Returns
+        -------
+        int
+            The number of indexed features.
+        """
+        return len(self.features)
+
+    @property
+    def key_count(self) -> int:
+        """The number of distinct name keys (int)."""
+        return len(self._keys)
+
+    def get(self, name: str) -> LunarFeature | None:
+        """Look up a feature by its normalized name.
+
+        Parameters
+        ----------
+        name : str
+            The feature name.
+
+        Returns
+        -------
+        :class:`pylunar.LunarFeature` or None
+            The feature, or None if the name is not known.
+        """
+        position = self._names.get(normalize_name(name))
+        return None if position is None else self.features[position]
+
+    def prefix(self, text: str, limit: int = 10) -> list[LunarFeature]:
+        """Find the features with a name or a name word starting with text.
+
+        Parameters
+        ----------
+        text : str
+            The start of the name.
+        limit : int, optional
+            The maximum number of features to return.
+
+        Returns
+        -------
+        list[:class:`pylunar.LunarFeature`]
+            The matching features in order of the matched key.
+        """
+        key = normalize_name(text)
+        if not key:
+            return []
+        seen: set[int] = set()
+        matches = []
+        keys = self._keys
+        for key_index in range(bisect_left(keys, key), len(keys)):
+            if not keys[key_index].startswith(key):
+                break
+            for position in self._positions[key_index]:
+                if position not in seen:
+                    seen.add(position)
+                    matches.append(self.features[position])
+                    if len(matches) == limit:
+                        return matches
+        return matches
+
+    def fuzzy(self, text: str, limit: int = 5, max_distance: int | None = None) -> list[LunarFeature]:
+        """Find the features with a name close to text.
+
+        Parameters
+        ----------
+        text : str
+            The misspelled name.
+        limit : int, optional
+            The maximum number of features to return.
+        max_distance : int, optional
+            The largest edit distance to a name, or to a name from one of
+            its words on, to accept. Defaults to 1 for texts shorter than
+            :attr:`LONG_NAME` characters and 2 otherwise.
+
+        Returns
+        -------
+        list[:class:`pylunar.LunarFeature`]
+            The matching features ordered by edit distance.
+        """
+        key = normalize_name(text)
+        if not key:
+            return []
+        if max_distance is None:
+            max_distance = 1 if len(key) < self.LONG_NAME else 2
+        trigrams = _trigrams(key)
+        # Every edit changes at most three trigrams, so a close key shares
+        # all but 3 * max_distance of them.
+        threshold = max(1, len(trigrams) - 3 * max_distance)
+        shared: Counter[int] = Counter()
+        for length in range(max(1, len(key) - max_distance), len(key) + max_distance + 1):
+            for trigram in trigrams:
+                shared.update(self._trigrams.get((length, trigram), ()))
+        candidates = [key_index for key_index, count in shared.items() if count >= threshold]
+
+        best: dict[int, int] = {}
+        for key_index in candidates:
+            distance = _edit_distance(key, self._keys[key_index], max_distance)
+            if distance > max_distance:
+                continue
+            for position in self._positions[key_index]:
+                if distance < best.get(position, max_distance + 1):
+                    best[position] = distance
+
+        ranked = sorted(best, key=lambda position: (best[position], self.features[position].name))
+        return [self.features[position] for position in ranked[:limit]]
+
+
+@functools.lru_cache(maxsize=8)
+def _catalog_index(dbname: str | None) -> NameIndex:
+    return NameIndex(load_catalog(dbname))
@@ -0,0 +1,220 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the ObservingPlanner class."""
+
+from __future__ import annotations
+
+__all__ = ["ObservingPlanner", "PlanEntry"]
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+import math
+from operator import itemgetter
+from typing import NamedTuple
+
+import ephem
+
+from .helpers import mjd_to_date_tuple
+from .lunar_feature import LunarFeature
+from .moon_info import MoonInfo
+from .moon_timeline import MoonTimeline
+from .pkg_types import DateTimeTuple, TimeLike
+
+
+class PlanEntry(NamedTuple):
+    """A single feature in an observing plan."""
+
+    start: DateTimeTuple
+    """The UTC time the feature becomes observable."""
+    end: DateTimeTuple
+    """The UTC time the feature stops being observable."""
+    time_of_day: str
+    """The terminator time of day for the feature."""
+    feature: LunarFeature
+    """The lunar feature."""
+
+
+class ObservingPlanner:
+    """Create time ordered observing plans for a set of Lunar features.
+
+    The visibility windows of the features are converted to colongitude
+    ranges once and kept sorted, so a plan only needs a handful of lunar
+    computations to sample the colongitude over the night followed by a
+    sweep over the features near the terminator.
+
+    Parameters
+    ----------
+    moon_info : :class:`pylunar.MoonInfo`
+        Instance of the Lunar information class providing the observer
+        location. The instance is not modified.
+    features : iterable of :class:`pylunar.LunarFeature`
+        The features to plan for, i.e. a loaded
+        :class:`pylunar.LunarFeatureContainer`.
+    """
+
+    def __init__(self, moon_info: MoonInfo, features: Iterable[LunarFeature]):
+        self.moon_info = moon_info
+        windows = []
+        for feature in features:
+            for start, end, time_of_day in MoonInfo.visibility_windows(feature):
+                windows.append((start % 360.0, end - start, time_of_day, feature))
+        windows.sort(key=itemgetter(0))
+        self._windows = windows
+        self._window_starts = [window[0] for window in windows]
+        self._max_span = max((window[1] for window in windows), default=0.0)
+
+    def __len__(self) -> int:
+        """Length of the planner.
+
+        Returns
+        -------
+        int
+            The number of visibility windows.
+        """
+        return len(self._windows)
+
+    def moon_up_intervals(self, start: TimeLike, end: TimeLike) -> list[tuple[float, float]]:
+        """Find the intervals when the Moon is above the horizon.
+
+        The same horizon and pressure settings as
+        :meth:`pylunar.MoonInfo.rise_set_times` are used.
+
+        Parameters
+        ----------
+        start : tuple or float
+            The UTC start time as a tuple or an ephem date.
+        end : tuple or float
+            The UTC end time as a tuple or an ephem date.
+
+        Returns
+        -------
+        list[(float, float)]
+            The ephem date pairs for each interval.
+        """
+        start_date = float(ephem.Date(start))
+        end_date = float(ephem.Date(end))
+        observer = self.moon_info.observer.copy()
+        observer.pressure = 0
+        observer.horizon = "-0:34"
+        moon = ephem.Moon()
+
+        try:
+            rising = float(observer.next_rising(moon, start=start_date))
+            setting = float(observer.next_setting(moon, start=start_date))
+            up_start = start_date if setting < rising else rising
+            intervals = []
+            while up_start < end_date:
+                up_end = float(observer.next_setting(moon, start=up_start))
+                intervals.append((up_start, min(up_end, end_date)))
+                if up_end >= end_date:
+                    break
+                up_start = float(observer.next_rising(moon, start=up_end))
+        except ephem.AlwaysUpError:
+            return [(start_date, end_date)]
+        except ephem.NeverUpError:
+            return []
+
+        return intervals
+
+    def plan(self, start: TimeLike, end: TimeLike, step: float = 1.0 / 24.0) -> list[PlanEntry]:
+        """Create an observing plan for the given time range.
+
+        A feature is part of the plan when its visibility window overlaps an
+        interval where the Moon is above the horizon. The entries are
+        ordered by the time the features become observable and then by the
+        order in which the terminator reached them.
+
+        Parameters
+        ----------
+        start : tuple or float
+            The UTC start time as a tuple or an ephem date.
+        end : tuple or float
+            The UTC end time as a tuple or an ephem date.
+        step : float, optional
+            The spacing (days) of the colongitude samples.
+
+        Returns
+        -------
+        list[:class:`pylunar.PlanEntry`]
+            The time ordered observing plan.
+        """
+        intervals = self.moon_up_intervals(start, end)
+        if not intervals or not self._windows:
+            return []
+
+        timeline = MoonTimeline(self.moon_info, start, end, step)
+        first_colong = timeline.colongs[0]
+        last_colong = timeline.colongs[-1]
+        lowest_start = first_colong - self._max_span
+
+        entries = []
+        base = math.floor(lowest_start / 360.0) * 360.0
+        while base <= last_colong:
+            lower = bisect_left(self._window_starts, lowest_start - base)
+            upper = bisect_right(self._window_starts, last_colong - base)
+            for window_start, span, time_of_day, feature in self._windows[lower:upper]:
+                window_start += base
+                if window_start + span < first_colong:
+                    continue
+                visible_start = timeline.date_at_colong(max(window_start, first_colong))
+                visible_end = timeline.date_at_colong(min(window_start + span, last_colong))
+                if visible_start is None or visible_end is None:
+                    continue
+                for up_start, up_end in intervals:
+                    overlap_start = max(visible_start, up_start)
+                    overlap_end = min(visible_end, up_end)
+                    if overlap_start >= overlap_end:
+                        continue
+                    libration_phase_angle = timeline.libration_phase_angle_at(overlap_start)
+                    if not MoonInfo.is_libration_angle_ok(feature, libration_phase_angle):
+                        continue
+                    entries.append((overlap_start, window_start, overlap_end, time_of_day, feature))
+            base += 360.0
+
+        entries.sort(key=itemgetter(0, 1))
+        return [
+            PlanEntry(
+                mjd_to_date_tuple(entry[0], round_off=True),
+                mjd_to_date_tuple(entry[2], round_off=True),
+                entry[3],
+                entry[4],
+            )
+            for entry in entries
+        ]
+
+    def plan_night(self, date: TimeLike, twilight: float = -12.0) -> list[PlanEntry]:
+        """Create an observing plan from the next dusk to the following dawn.
+
+        Parameters
+        ----------
+        date : tuple or float
+            The UTC time to start looking for dusk as a tuple or an ephem
+            date.
+        twilight : float, optional
+            The altitude (degrees) of the Sun's center defining dusk and
+            dawn.
+
+        Returns
+        -------
+        list[:class:`pylunar.PlanEntry`]
+            The time ordered observing plan. Empty if the Sun does not cross
+            the twilight altitude.
+        """
+        observer = self.moon_info.observer.copy()
+        observer.pressure = 0
+        observer.horizon = math.radians(twilight)
+        sun = ephem.Sun()
+        try:
+            dusk = observer.next_setting(sun, start=ephem.Date(date), use_center=True)
+            dawn = observer.next_rising(sun, start=dusk, use_center=True)
+        except (ephem.AlwaysUpError, ephem.NeverUpError):
+            return []
+        return self.plan(float(dusk), float(dawn))
@@ -0,0 +1,310 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for rendering the illuminated lunar disk."""
+
+from __future__ import annotations
+
+__all__ = ["PhaseDiskRenderer", "encode_png", "phase_disk_raster", "phase_disk_svg"]
+
+from collections import OrderedDict
+from collections.abc import Callable
+import math
+import struct
+import threading
+from typing import TypeVar, cast
+import zlib
+
+from .moon_info import MoonInfo
+
+T = TypeVar("T")
+
+LIT_LEVEL = 255
+"""The gray level of the illuminated part of the disk."""
+DARK_LEVEL = 56
+"""The gray level of the dark part of the disk."""
+
+_SUBSAMPLES = 3
+# The number of samples per pixel along each axis
+
+
+def _rotation(bright_limb_angle: float) -> float:
+    # Screen angle (degrees, clockwise from +x with y down) of the bright
+    # limb for an image with north up and east to the left.
+    return (270.0 - bright_limb_angle) % 360.0
+
+
+def phase_disk_svg(fractional_phase: float, bright_limb_angle: float, size: int = 64) -> str:
+    """Draw the lunar disk as an SVG image.
+
+    The image has north up and east to the left, as the moon appears in the
+    sky. The illuminated part is bounded by the bright limb and by the
+    terminator, a half ellipse whose width follows the illumination.
+
+    Parameters
+    ----------
+    fractional_phase : float
+        The illuminated fraction (0 to 1) of the disk.
+    bright_limb_angle : float
+        The position angle (degrees) of the bright limb from north towards
+        east.
+    size : int, optional
+        The width and height (pixels) of the image.
+
+    Returns
+    -------
+    str
+        The SVG document.
+    """
+    terminator = 1.0 - 2.0 * min(max(fractional_phase, 0.0), 1.0)
+    sweep = 0 if terminator > 0.0 else 1
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="-1 -1 2 2" width="{size}" height="{size}">'
+        f'<circle r="1" fill="#{DARK_LEVEL:02x}{DARK_LEVEL:02x}{DARK_LEVEL:02x}"/>'
+        f'<path d="M0,-1A1,1 0 0,1 0,1A{abs(terminator):.4f},1 0 0,{sweep} 0,-1Z" fill="#fff"'
+        f' transform="rotate({_rotation(bright_limb_angle):.1f})"/></svg>'
+    )
+
+
+def phase_disk_raster(fractional_phase: float, bright_limb_angle: float, size: int = 64) -> bytes:
+    """Draw the lunar disk as a gray and alpha raster.
+
+    The geometry is the same as for :func:`phase_disk_svg`. Every pixel is
+    supersampled, so the limb and the terminator are anti-aliased.
+
+    Parameters
+    ----------
+    fractional_phase : float
+        The illuminated fraction (0 to 1) of the disk.
+    bright_limb_angle : float
+        The position angle (degrees) of the bright limb from north towards
+        east.
+    size : int, optional
+        The width and height (pixels) of the image.
+
+    Returns
+    -------
+    bytes
+        The rows of gray and alpha byte pairs, top row first.
+    """
+    terminator = 1.0 - 2.0 * min(max(fractional_phase, 0.0), 1.0)
+    rotation = math.radians(_rotation(bright_limb_angle))
+    cos_r = math.cos(rotation)
+    sin_r = math.sin(rotation)
+    step = 2.0 / (size * _SUBSAMPLES)
+    # The sample offsets from the pixel corner, shared by every pixel.
+    offsets = [(i + 0.5) * step for i in range(_SUBSAMPLES)]
+    num_samples = _SUBSAMPLES * _SUBSAMPLES
+    pixels = bytearray(2 * size * size)
+    for row in range(size):
+        y_values = [-1.0 + row * 2.0 / size + offset for offset in offsets]
+        for column in range(size):
+            x0 = -1.0 + column * 2.0 / size
+            disk = lit = 0
+            for y in y_values:
+                for offset in offsets:
+                    x = x0 + offset
+                    if x * x + y * y > 1.0:
+                        continue
+                    disk += 1
+                    # Coordinates with the bright limb along +u.
+                    u = x * cos_r + y * sin_r
+                    v = y * cos_r - x * sin_r
+                    if u >= terminator * math.sqrt(max(0.0, 1.0 - v * v)):
+                        lit += 1
+            if disk:
+                index = 2 * (row * size + column)
+                pixels[index] = (lit * LIT_LEVEL + (disk - lit) * DARK_LEVEL) // disk
+                pixels[index + 1] = disk * 255 // num_samples
+    return bytes(pixels)
+
+
+def encode_png(raster: bytes, size: int) -> bytes:
+    """Encode a gray and alpha raster as a PNG image.
+
+    Parameters
+    ----------
+    raster : bytes
+        The rows of gray and alpha byte pairs, top row first.
+    size : int
+        The width and height (pixels) of the image.
+
+    Returns
+    -------
+    bytes
+        The PNG file content.
+    """
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    stride = 2 * size
+    scanlines = b"".join(b"\x00" + raster[row * stride : (row + 1) * stride] for row in range(size))
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 4, 0, 0, 0)),
+            chunk(b"IDAT", zlib.compress(scanlines, 9)),
+            chunk(b"IEND", b""),
+        ]
+    )
+
+
+class PhaseDiskRenderer:
+    """Render images of the illuminated lunar disk with caching.
+
+    The illuminated fraction and the bright limb angle are quantized and the
+    images for each quantized pair are kept in a bounded least recently used
+    cache, so repeated requests return the same bytes without drawing.
+
+    Parameters
+    ----------
+    size : int, optional
+        The width and height (pixels) of the images.
+    phase_step : float, optional
+        The quantization of the illuminated fraction.
+    angle_step : float, optional
+        The quantization (degrees) of the bright limb angle.
+    cache_size : int, optional
+        The maximum number of cached images.
+    """
+
+    def __init__(
+        self, size: int = 64, phase_step: float = 0.005, angle_step: float = 2.0, cache_size: int = 512
+    ):
+        self.size = size
+        self.phase_step = phase_step
+        self.angle_step = angle_step
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[tuple[str, int, int], object] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Length of the renderer.
+
+        Returns
+        -------
+        int
+            The number of cached images.
+        """
+        return len(self._cache)
+
+    def key(self, fractional_phase: float, bright_limb_angle: float) -> tuple[int, int]:
+        """Quantize the disk state.
+
+        Parameters
+        ----------
+        fractional_phase : float
+            The illuminated fraction (0 to 1) of the disk.
+        bright_limb_angle : float
+            The position angle (degrees) of the bright limb.
+
+        Returns
+        -------
+        tuple[int, int]
+            The indexes of the illuminated fraction and of the angle.
+        """
+        num_angles = round(360.0 / self.angle_step)
+        return (
+            round(fractional_phase / self.phase_step),
+            round(bright_limb_angle / self.angle_step) % num_angles,
+        )
+
+    def _cached(self, kind: str, moon_info: MoonInfo, draw: Callable[[float, float], T]) -> T:
+        phase_index, angle_index = self.key(moon_info.fractional_phase(), moon_info.bright_limb_angle())
+        key = (kind, phase_index, angle_index)
+        with self._lock:
+            try:
+                image = self._cache[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return cast(T, image)
+
+        # Drawn outside of the lock from the quantized state, so every
+        # request with the same key gets the same bytes.
+        image = draw(phase_index * self.phase_step, angle_index * self.angle_step)
+        with self._lock:
+            self._cache[key] = image
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return image
+
+    def svg(self, moon_info: MoonInfo) -> str:
+        """Get the SVG image of the current lunar disk.
+
+        Parameters
+        ----------
+        moon_info : :class:`pylunar.MoonInfo`
+            Instance of the Lunar information class.
+
+        Returns
+        -------
+        str
+            The SVG document.
+        """
+        return self._cached("svg", moon_info, lambda phase, angle: phase_disk_svg(phase, angle, self.size))
+
+    def raster(self, moon_info: MoonInfo) -> bytes:
+        """Get the gray and alpha raster of the current lunar disk.
+
+        Parameters
+        ----------
+        moon_info : :class:`pylunar.MoonInfo`
+            Instance of the Lunar information class.
+
+        Returns
+        -------
+        bytes
+            The rows of gray and alpha byte pairs, top row first.
+        """
+        return self._cached(
+            "raster", moon_info, lambda phase, angle: phase_disk_raster(phase, angle, self.size)
+        )
+
+    def png(self, moon_info: MoonInfo) -> bytes:
+        """Get the PNG image of the current lunar disk.
+
+        Parameters
+        ----------
+        moon_info : :class:`pylunar.MoonInfo`
+            Instance of the Lunar information class.
+
+        Returns
+        -------
+        bytes
+            The PNG file content.
+        """
+        return self._cached(
+            "png",
+            moon_info,
+            lambda phase, angle: encode_png(phase_disk_raster(phase, angle, self.size), self.size),
+        )
+
+    def stats(self) -> dict[str, float]:
+        """Summarize the cache use.
+
+        Returns
+        -------
+        dict[str, float]
+            The number of cached images, cache hits, cache misses and the
+            cache hit rate.
+        """
+        total = self.hits + self.misses
+        return {
+            "images": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
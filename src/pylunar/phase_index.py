@@ -0,0 +1,279 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the PhaseIndex class."""
+
+from __future__ import annotations
+
+__all__ = ["PhaseIndex"]
+
+from bisect import bisect_right
+from collections.abc import Iterable
+import functools
+import threading
+
+import ephem
+
+from .moon_info import PHASE_EMOJI, MoonInfo, PhaseName
+from .pkg_types import TimeLike
+
+_MAIN_PHASES = (
+    (ephem.next_new_moon, PhaseName.NEW_MOON),
+    (ephem.next_first_quarter_moon, PhaseName.FIRST_QUARTER),
+    (ephem.next_full_moon, PhaseName.FULL_MOON),
+    (ephem.next_last_quarter_moon, PhaseName.LAST_QUARTER),
+)
+
+_INTERMEDIATE_PHASES = {
+    PhaseName.NEW_MOON: PhaseName.WAXING_CRESCENT,
+    PhaseName.FIRST_QUARTER: PhaseName.WAXING_GIBBOUS,
+    PhaseName.FULL_MOON: PhaseName.WANING_GIBBOUS,
+    PhaseName.LAST_QUARTER: PhaseName.WANING_CRESCENT,
+}
+
+_CUTOFF = MoonInfo.MAIN_PHASE_CUTOFF / MoonInfo.DAYS_TO_HOURS
+_LUNATION = 29.530589
+# Mean synodic month (days)
+
+_Phase = tuple[float, int]
+_Table = tuple[tuple[float, ...], tuple[PhaseName, ...], _Phase, _Phase]
+
+
+def _phase_run(date: float, index: int, end_date: float) -> list[_Phase]:
+    # Main phases from the given one through the first one whose bucket
+    # starts after the end date.
+    phases = [(date, index)]
+    while date - _CUTOFF <= end_date:
+        index = (index + 1) % len(_MAIN_PHASES)
+        date = float(_MAIN_PHASES[index][0](date))
+        phases.append((date, index))
+    return phases
+
+
+def _buckets(phases: list[_Phase]) -> tuple[tuple[float, ...], tuple[PhaseName, ...]]:
+    boundaries: list[float] = []
+    names: list[PhaseName] = []
+    for date, index in phases:
+        name = _MAIN_PHASES[index][1]
+        boundaries.extend((date - _CUTOFF, date + _CUTOFF))
+        names.extend((name, _INTERMEDIATE_PHASES[name]))
+    return tuple(boundaries), tuple(names)
+
+
+class PhaseIndex:
+    """Lookup table from time to lunar phase name.
+
+    The main phases (new moon, first quarter, full moon and last quarter)
+    are searched once for the covered range. The instants
+    :attr:`pylunar.MoonInfo.MAIN_PHASE_CUTOFF` hours on either side of each
+    main phase split time into buckets that all share the same phase name,
+    so a lookup is a bisection over the bucket boundaries and gives the
+    same answer as :meth:`pylunar.MoonInfo.phase_name`. When a lookup falls
+    outside of the covered range, only the missing main phases are searched
+    and added to the matching end of the table, padded by a margin so that
+    sequential lookups do not extend it every time.
+
+    Parameters
+    ----------
+    start : tuple or float, optional
+        The UTC start of the initially covered range as a tuple or an ephem
+        date.
+    end : tuple or float, optional
+        The UTC end of the initially covered range as a tuple or an ephem
+        date.
+    margin : float, optional
+        The time (days) added beyond the requested range when the index is
+        extended. Defaults to one lunation.
+    """
+
+    def __init__(self, start: TimeLike | None = None, end: TimeLike | None = None, margin: float = _LUNATION):
+        self.margin = margin
+        # Boundaries, names and the first and last main phases are replaced
+        # together as one tuple so readers always see a consistent table.
+        self._table: _Table = ((), (), (0.0, 0), (0.0, 0))
+        # Extensions are serialized so that each one builds on the latest
+        # table and the covered range only grows. Lookups take no lock.
+        self._lock = threading.Lock()
+        if start is not None:
+            self.extend(start, start if end is None else end)
+
+    @classmethod
+    def shared(cls: type[PhaseIndex]) -> PhaseIndex:
+        """Get the index shared by the whole process.
+
+        The shared index is extended on demand like any other index.
+        :func:`pylunar.warmup` extends it ahead of time.
+
+        Returns
+        -------
+        :class:`pylunar.PhaseIndex`
+            The shared phase index.
+        """
+        return _shared_index()
+
+    def __len__(self) -> int:
+        """Length of the index.
+
+        Returns
+        -------
+        int
+            The number of time buckets.
+        """
+        return len(self._table[0])
+
+    @property
+    def covered_range(self) -> tuple[float, float] | None:
+        """The ephem dates covered by the index (tuple or None)."""
+        boundaries = self._table[0]
+        if not boundaries:
+            return None
+        return (boundaries[0], boundaries[-1])
+
+    def extend(self, start: TimeLike, end: TimeLike) -> None:
+        """Make sure the index covers the given time range.
+
+        Parameters
+        ----------
+        start : tuple or float
+            The UTC start time as a tuple or an ephem date.
+        end : tuple or float
+            The UTC end time as a tuple or an ephem date.
+        """
+        start_date = float(ephem.Date(start))
+        end_date = float(ephem.Date(end))
+        with self._lock:
+            self._extend(start_date, end_date)
+
+    def _extend(self, start_date: float, end_date: float) -> None:
+        boundaries, names, first, last = self._table
+        if not boundaries:
+            # Start at the last new moon well before the range, so the first
+            # bucket is complete.
+            date = float(ephem.previous_new_moon(start_date - self.margin - 2.0 * _CUTOFF))
+            phases = _phase_run(date, 0, end_date + self.margin)
+            self._table = (*_buckets(phases), phases[0], phases[-1])
+            return
+
+        if start_date < boundaries[0]:
+            date = float(ephem.previous_new_moon(start_date - self.margin - 2.0 * _CUTOFF))
+            # The run ends with the first known main phase, found again.
+            phases = _phase_run(date, 0, first[0] - _CUTOFF - 0.5)[:-1]
+            if phases:
+                new_boundaries, new_names = _buckets(phases)
+                boundaries = new_boundaries + boundaries
+                names = new_names + names
+                first = phases[0]
+
+        if end_date >= boundaries[-1]:
+            index = (last[1] + 1) % len(_MAIN_PHASES)
+            date = float(_MAIN_PHASES[index][0](last[0]))
+            phases = _phase_run(date, index, end_date + self.margin)
+            new_boundaries, new_names = _buckets(phases)
+            boundaries = boundaries + new_boundaries
+            names = names + new_names
+            last = phases[-1]
+
+        self._table = (boundaries, names, first, last)
+
+    def _lookup(self, date: float) -> PhaseName:
+        boundaries, names, _, _ = self._table
+        if not boundaries or not boundaries[0] <= date < boundaries[-1]:
+            self.extend(date, date)
+            boundaries, names, _, _ = self._table
+        return names[bisect_right(boundaries, date) - 1]
+
+    def next_change(self, date: TimeLike) -> float:
+        """Get the time the phase name changes after a given time.
+
+        Parameters
+        ----------
+        date : tuple or float
+            The UTC time as a tuple or an ephem date.
+
+        Returns
+        -------
+        float
+            The ephem date of the next bucket boundary.
+        """
+        date = float(ephem.Date(date))
+        boundaries = self._table[0]
+        if not boundaries or not boundaries[0] <= date < boundaries[-1]:
+            self.extend(date, date)
+            boundaries = self._table[0]
+        return boundaries[bisect_right(boundaries, date)]
+
+    def phase(self, date: TimeLike) -> PhaseName:
+        """Get the phase for a given time.
+
+        Parameters
+        ----------
+        date : tuple or float
+            The UTC time as a tuple or an ephem date.
+
+        Returns
+        -------
+        :class:`pylunar.moon_info.PhaseName`
+            The lunar phase.
+        """
+        return self._lookup(float(ephem.Date(date)))
+
+    def phase_name(self, date: TimeLike) -> str:
+        """Get the standard name of the lunar phase for a given time.
+
+        Parameters
+        ----------
+        date : tuple or float
+            The UTC time as a tuple or an ephem date.
+
+        Returns
+        -------
+        str
+            The lunar phase name.
+        """
+        return self._lookup(float(ephem.Date(date))).name
+
+    def phase_emoji(self, date: TimeLike) -> str:
+        """Get the standard emoji of the lunar phase for a given time.
+
+        Parameters
+        ----------
+        date : tuple or float
+            The UTC time as a tuple or an ephem date.
+
+        Returns
+        -------
+        str
+            The lunar phase emoji.
+        """
+        return PHASE_EMOJI[self._lookup(float(ephem.Date(date))).name]
+
+    def phase_names(self, dates: Iterable[TimeLike]) -> list[str]:
+        """Get the standard names of the lunar phase for many times.
+
+        Parameters
+        ----------
+        dates : iterable of tuple or float
+            The UTC times as tuples or ephem dates.
+
+        Returns
+        -------
+        list[str]
+            The lunar phase names in the order of the times.
+        """
+        date_list = [float(ephem.Date(date)) for date in dates]
+        if not date_list:
+            return []
+        self.extend(min(date_list), max(date_list))
+        return [self._lookup(date).name for date in date_list]
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_index() -> PhaseIndex:
+    return PhaseIndex()
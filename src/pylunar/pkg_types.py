@@ -20,3 +20,5 @@ DmsCoordinate: TypeAlias = tuple[int, int, int]
 Range: TypeAlias = tuple[float, float]
 LunarFeatureList: TypeAlias = tuple[str, float, float, float, float, float, str, str, str, str, str | None]
 FeatureRow: TypeAlias = tuple[int, str, float, float, float, float, float, str, str, str, str, str]
+ColongitudeWindow: TypeAlias = tuple[float, float, str]
+TimeLike: TypeAlias = DateTimeTuple | float
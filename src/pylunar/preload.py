@@ -0,0 +1,123 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for warming up the shared caches before forking workers."""
+
+from __future__ import annotations
+
+__all__ = ["WarmupReport", "warmup"]
+
+import gc
+import tracemalloc
+from typing import NamedTuple
+
+import ephem
+
+from .catalog import load_catalog
+from .name_index import NameIndex
+from .phase_index import PhaseIndex
+from .pkg_types import TimeLike
+from .spatial_index import SpatialIndex
+
+
+class WarmupReport(NamedTuple):
+    """What :func:`pylunar.warmup` preloaded."""
+
+    features: int
+    """The number of catalog features."""
+    name_keys: int
+    """The number of keys in the name index."""
+    spatial_cells: int
+    """The number of occupied spatial index cells."""
+    phase_buckets: int
+    """The number of buckets in the shared phase index."""
+    covered_range: tuple[float, float] | None
+    """The ephem dates covered by the shared phase index."""
+    allocated_bytes: int
+    """The memory (bytes) allocated while warming up."""
+    frozen_objects: int
+    """The number of objects moved to the permanent GC generation."""
+
+
+def warmup(
+    dbname: str | None = None,
+    start: TimeLike | None = None,
+    end: TimeLike | None = None,
+    freeze: bool = True,
+) -> WarmupReport:
+    """Build the shared caches in the current process.
+
+    Call this in a server's master process before forking workers. It reads
+    the feature catalog, builds the catalog name and spatial indexes and
+    extends the shared phase index, which are the objects that
+    :func:`pylunar.load_catalog`, :meth:`pylunar.NameIndex.from_catalog`,
+    :meth:`pylunar.SpatialIndex.from_catalog` and
+    :meth:`pylunar.PhaseIndex.shared` return afterwards. Feature containers
+    also take their features from the catalog. One lunar position is
+    computed to pay the first call costs of ephem.
+
+    Freezing moves every tracked object to the permanent generation of the
+    garbage collector, so collections in the workers do not write to the
+    memory pages they share with the master process.
+
+    Parameters
+    ----------
+    dbname : str, optional
+        The path of the feature database. Defaults to the packaged database.
+    start : tuple or float, optional
+        The UTC start of the phase index range as a tuple or an ephem date.
+        Defaults to now.
+    end : tuple or float, optional
+        The UTC end of the phase index range as a tuple or an ephem date.
+        Defaults to one year after the start.
+    freeze : bool, optional
+        Flag to freeze the garbage collector after warming up.
+
+    Returns
+    -------
+    :class:`pylunar.WarmupReport`
+        The sizes of the preloaded caches and their memory footprint.
+    """
+    start_date = float(ephem.now() if start is None else ephem.Date(start))
+    end_date = start_date + 365.25 if end is None else float(ephem.Date(end))
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    features = load_catalog(dbname)
+    name_index = NameIndex.from_catalog(dbname)
+    spatial_index = SpatialIndex.from_catalog(dbname)
+    phase_index = PhaseIndex.shared()
+    phase_index.extend(start_date, end_date)
+    observer = ephem.Observer()
+    observer.date = start_date
+    ephem.Moon(observer)
+
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    if not was_tracing:
+        tracemalloc.stop()
+
+    frozen = 0
+    if freeze:
+        gc.collect()
+        gc.freeze()
+        frozen = gc.get_freeze_count()
+
+    return WarmupReport(
+        len(features),
+        name_index.key_count,
+        spatial_index.cell_count,
+        len(phase_index),
+        phase_index.covered_range,
+        allocated,
+        frozen,
+    )
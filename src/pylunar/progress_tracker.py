@@ -0,0 +1,383 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the ProgressTracker class."""
+
+from __future__ import annotations
+
+__all__ = ["ProgressTracker"]
+
+from collections import OrderedDict
+from collections.abc import Iterable
+import math
+import os
+import sqlite3
+import threading
+from types import TracebackType
+
+import ephem
+
+from .feature_bitset import FeatureBitset
+from .lunar_feature import LunarFeature
+from .lunar_feature_container import LunarFeatureContainer
+from .moon_info import MoonInfo
+from .pkg_types import TimeLike
+
+_SCHEMA = (
+    "create table if not exists Progress ("
+    "Observer text not null, Club_Name text not null, Logged blob not null, "
+    "primary key (Observer, Club_Name))"
+)
+
+
+def _feature_id(feature: LunarFeature | int) -> int:
+    if isinstance(feature, int):
+        return feature
+    if feature.feature_id is None:
+        raise ValueError(f"Feature {feature.name} has no feature identifier.")
+    return feature.feature_id
+
+
+class ProgressTracker:
+    """Observing program progress of many observers.
+
+    The features each observer has logged for a club program are kept as a
+    packed :class:`pylunar.FeatureBitset` per observer and club in a SQLite
+    database. The visible features are computed once per club and time
+    quantum and shared by all observers, so finding the features an observer
+    still has to log only intersects two bitsets.
+
+    Parameters
+    ----------
+    filename : str or path-like, optional
+        The progress database. Defaults to an in-memory database.
+    dbname : str, optional
+        The path of the feature database. Defaults to the packaged database.
+    quantum : float, optional
+        The time quantization (seconds) of the shared visibility.
+    cache_size : int, optional
+        The maximum number of cached visibility bitsets.
+
+    Notes
+    -----
+    The visibility checks depend on the colongitude and the librations,
+    which differ by a negligible amount between sites, so the cached
+    visibility does not depend on the observer location. Whether the Moon
+    is above the horizon is checked per site.
+    """
+
+    CLUB_NAMES = ("Lunar", "LunarII")
+    # The observing programs
+
+    def __init__(
+        self,
+        filename: str | os.PathLike[str] = ":memory:",
+        dbname: str | None = None,
+        quantum: float = 600.0,
+        cache_size: int = 256,
+    ):
+        self.dbname = dbname
+        self.quantum = quantum / 86400.0
+        self.cache_size = cache_size
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._programs: dict[str, LunarFeatureContainer] = {}
+        self._visible: OrderedDict[tuple[str, int], FeatureBitset] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> ProgressTracker:
+        """Enter the context.
+
+        Returns
+        -------
+        :class:`pylunar.ProgressTracker`
+            The tracker.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the database when leaving the context.
+
+        Parameters
+        ----------
+        exc_type : type, optional
+            The exception type.
+        exc_value : Exception, optional
+            The exception.
+        traceback : traceback, optional
+            The exception traceback.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """Close the progress database."""
+        self._conn.close()
+
+    def program(self, club_name: str) -> LunarFeatureContainer:
+        """Get the features of a club program.
+
+        Parameters
+        ----------
+        club_name : str
+            The name of the observing club. Values are Lunar and LunarII.
+
+        Returns
+        -------
+        :class:`pylunar.LunarFeatureContainer`
+            The loaded features of the program.
+
+        Raises
+        ------
+        ValueError
+            If the club is unknown.
+        """
+        if club_name not in self.CLUB_NAMES:
+            raise ValueError(f"Unknown club {club_name}.")
+        with self._lock:
+            container = self._programs.get(club_name)
+        if container is None:
+            container = LunarFeatureContainer(club_name, self.dbname)
+            container.load()
+            with self._lock:
+                container = self._programs.setdefault(club_name, container)
+        return container
+
+    def logged(self, observer: str, club_name: str) -> FeatureBitset:
+        """Get the features an observer has logged for a program.
+
+        Parameters
+        ----------
+        observer : str
+            The observer identifier.
+        club_name : str
+            The name of the observing club.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The logged feature identifiers.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "select Logged from Progress where Observer = ? and Club_Name = ?", (observer, club_name)
+            ).fetchone()
+        return FeatureBitset() if row is None else FeatureBitset.from_bytes(row[0])
+
+    def _update(
+        self, observer: str, club_name: str, features: Iterable[LunarFeature | int], add: bool
+    ) -> FeatureBitset:
+        changes = FeatureBitset.from_ids(_feature_id(feature) for feature in features)
+        program = self.program(club_name).feature_set()
+        if changes - program:
+            raise ValueError(f"Features {list(changes - program)} are not part of the {club_name} program.")
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "select Logged from Progress where Observer = ? and Club_Name = ?", (observer, club_name)
+            ).fetchone()
+            logged = FeatureBitset() if row is None else FeatureBitset.from_bytes(row[0])
+            logged = logged | changes if add else logged - changes
+            self._conn.execute(
+                "insert or replace into Progress values (?, ?, ?)", (observer, club_name, logged.to_bytes())
+            )
+        return logged
+
+    def log(self, observer: str, club_name: str, features: Iterable[LunarFeature | int]) -> FeatureBitset:
+        """Record features as logged by an observer.
+
+        Parameters
+        ----------
+        observer : str
+            The observer identifier.
+        club_name : str
+            The name of the observing club.
+        features : iterable of :class:`pylunar.LunarFeature` or int
+            The features or their identifiers.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The logged feature identifiers after the update.
+
+        Raises
+        ------
+        ValueError
+            If a feature is not part of the club program.
+        """
+        return self._update(observer, club_name, features, True)
+
+    def unlog(self, observer: str, club_name: str, features: Iterable[LunarFeature | int]) -> FeatureBitset:
+        """Remove features from the log of an observer.
+
+        Parameters
+        ----------
+        observer : str
+            The observer identifier.
+        club_name : str
+            The name of the observing club.
+        features : iterable of :class:`pylunar.LunarFeature` or int
+            The features or their identifiers.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The logged feature identifiers after the update.
+
+        Raises
+        ------
+        ValueError
+            If a feature is not part of the club program.
+        """
+        return self._update(observer, club_name, features, False)
+
+    def remaining(self, observer: str, club_name: str) -> FeatureBitset:
+        """Get the program features an observer has not logged yet.
+
+        Parameters
+        ----------
+        observer : str
+            The observer identifier.
+        club_name : str
+            The name of the observing club.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The remaining feature identifiers.
+        """
+        return self.program(club_name).feature_set() - self.logged(observer, club_name)
+
+    def progress(self, observer: str, club_name: str) -> tuple[int, int]:
+        """Count the logged features of an observer.
+
+        Parameters
+        ----------
+        observer : str
+            The observer identifier.
+        club_name : str
+            The name of the observing club.
+
+        Returns
+        -------
+        tuple[int, int]
+            The number of logged features and the size of the program.
+        """
+        return len(self.logged(observer, club_name)), len(self.program(club_name))
+
+    def visible_set(self, club_name: str, date: TimeLike) -> FeatureBitset:
+        """Get the program features that are visible at a given time.
+
+        Parameters
+        ----------
+        club_name : str
+            The name of the observing club.
+        date : tuple or float
+            The UTC time as a tuple or an ephem date.
+
+        Returns
+        -------
+        :class:`pylunar.FeatureBitset`
+            The visible feature identifiers for the quantized time.
+        """
+        quantum = round(float(ephem.Date(date)) / self.quantum)
+        key = (club_name, quantum)
+        with self._lock:
+            visible = self._visible.get(key)
+            if visible is not None:
+                self._visible.move_to_end(key)
+                return visible
+
+        program = self.program(club_name)
+        moon_info = MoonInfo(0.0, 0.0)
+        moon_info.update(ephem.Date(quantum * self.quantum))
+        visible = program.visible_set(moon_info)
+        with self._lock:
+            self._visible[key] = visible
+            if len(self._visible) > self.cache_size:
+                self._visible.popitem(last=False)
+        return visible
+
+    def remaining_visible(self, observer: str, club_name: str, moon_info: MoonInfo) -> list[LunarFeature]:
+        """Get the remaining features of an observer that are visible now.
+
+        Parameters
+        ----------
+        observer : str
+            The observer identifier.
+        club_name : str
+            The name of the observing club.
+        moon_info : :class:`pylunar.MoonInfo`
+            Instance of the Lunar information class for the observer site
+            and time.
+
+        Returns
+        -------
+        list[:class:`pylunar.LunarFeature`]
+            The remaining visible features. Empty if the Moon is below the
+            horizon.
+        """
+        if moon_info.altitude() < 0.0:
+            return []
+        visible = self.visible_set(club_name, moon_info.observer.date)
+        return list(self.program(club_name).select(self.remaining(observer, club_name) & visible))
+
+    def remaining_between(
+        self,
+        observer: str,
+        club_name: str,
+        moon_info: MoonInfo,
+        start: TimeLike,
+        end: TimeLike,
+        step: float = 1.0 / 24.0,
+    ) -> list[LunarFeature]:
+        """Get the remaining features of an observer visible over a night.
+
+        The visibility is checked at regular steps while the Moon is above
+        the horizon at the observer site.
+
+        Parameters
+        ----------
+        observer : str
+            The observer identifier.
+        club_name : str
+            The name of the observing club.
+        moon_info : :class:`pylunar.MoonInfo`
+            Instance of the Lunar information class providing the observer
+            location. The instance is not modified.
+        start : tuple or float
+            The UTC start time as a tuple or an ephem date.
+        end : tuple or float
+            The UTC end time as a tuple or an ephem date.
+        step : float, optional
+            The spacing (days) of the checks.
+
+        Returns
+        -------
+        list[:class:`pylunar.LunarFeature`]
+            The remaining features visible at any of the checks.
+        """
+        start_date = float(ephem.Date(start))
+        end_date = float(ephem.Date(end))
+        observer_copy = moon_info.observer.copy()
+        moon = ephem.Moon()
+        visible = FeatureBitset()
+        num_steps = max(1, math.ceil((end_date - start_date) / step))
+        for i in range(num_steps + 1):
+            date = start_date + i * (end_date - start_date) / num_steps
+            observer_copy.date = date
+            moon.compute(observer_copy)
+            if moon.alt >= 0.0:
+                visible = visible | self.visible_set(club_name, date)
+        return list(self.program(club_name).select(self.remaining(observer, club_name) & visible))
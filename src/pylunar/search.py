@@ -0,0 +1,115 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for root finding functions used by the event searches."""
+
+from __future__ import annotations
+
+__all__ = ["brent", "sign_changes"]
+
+from collections.abc import Callable, Sequence
+
+
+def brent(
+    func: Callable[[float], float], a: float, b: float, tol: float = 1.0e-8, max_iter: int = 100
+) -> float:
+    """Find a root of a function within a bracketing interval.
+
+    This is Brent's method, combining bisection, secant and inverse
+    quadratic interpolation steps.
+
+    Parameters
+    ----------
+    func : callable
+        The function to find the root of.
+    a : float
+        The start of the bracketing interval.
+    b : float
+        The end of the bracketing interval.
+    tol : float, optional
+        The absolute tolerance on the root.
+    max_iter : int, optional
+        The maximum number of iterations.
+
+    Returns
+    -------
+    float
+        The root.
+
+    Raises
+    ------
+    ValueError
+        If the function values at the interval ends have the same sign.
+    """
+    fa = func(a)
+    fb = func(b)
+    if fa == 0.0:
+        return a
+    if fb == 0.0:
+        return b
+    if (fa > 0.0) == (fb > 0.0):
+        raise ValueError("Root is not bracketed by the interval.")
+
+    c, fc = a, fa
+    d = e = b - a
+    for _ in range(max_iter):
+        if (fb > 0.0) == (fc > 0.0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol1 = 2.0e-16 * abs(b) + 0.5 * tol
+        xm = 0.5 * (c - b)
+        if abs(xm) <= tol1 or fb == 0.0:
+            return b
+        if abs(e) >= tol1 and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p = 2.0 * xm * s
+                q = 1.0 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2.0 * xm * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0.0:
+                q = -q
+            p = abs(p)
+            if 2.0 * p < min(3.0 * xm * q - abs(tol1 * q), abs(e * q)):
+                e = d
+                d = p / q
+            else:
+                d = xm
+                e = d
+        else:
+            d = xm
+            e = d
+        a, fa = b, fb
+        b += d if abs(d) > tol1 else (tol1 if xm > 0.0 else -tol1)
+        fb = func(b)
+    return b
+
+
+def sign_changes(values: Sequence[float]) -> list[int]:
+    """Find the intervals where a sampled function changes sign.
+
+    Parameters
+    ----------
+    values : sequence of float
+        The function values at the sample points.
+
+    Returns
+    -------
+    list[int]
+        The indices ``i`` for which the function changes sign between the
+        samples ``i`` and ``i + 1``. A zero sample counts as positive.
+    """
+    return [i for i in range(len(values) - 1) if (values[i] >= 0.0) != (values[i + 1] >= 0.0)]
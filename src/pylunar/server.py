@@ -0,0 +1,419 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the local pylunar HTTP service.
+
+Run it with ``python -m pylunar.server``. Every endpoint takes ``lat`` and
+``lon`` in decimal degrees and an optional ISO 8601 ``time``, which defaults
+to now. The answers are JSON:
+
+``/phase``
+    The phase name and emoji and the time the name next changes.
+``/moon``
+    The lunar altitude, azimuth, illumination, colongitude and age.
+``/rise_set``
+    The rise, transit and set times for the local day of ``tz``.
+``/visible``
+    The names of the visible features of the ``club`` program.
+"""
+
+from __future__ import annotations
+
+__all__ = ["LunarService", "ServiceResponse", "main", "make_server"]
+
+import argparse
+import collections
+from collections.abc import Callable, Sequence
+import concurrent.futures
+from datetime import datetime, timedelta, timezone
+import hashlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import math
+import sys
+import threading
+from typing import Any, NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+import ephem
+
+from .conversions import datetime_to_mjd, get_timezone, mjd_to_datetime
+from .lunar_feature_container import LunarFeatureContainer
+from .moon_info import PHASE_EMOJI, MoonInfo
+from .phase_index import PhaseIndex
+
+_SECONDS_PER_DAY = 86400.0
+
+_IMMUTABLE = "public, max-age=31536000, immutable"
+# Cache-Control for answers about an explicit time, which never change
+
+Params = dict[str, str]
+_Key = tuple[str, float, float, float, str]
+
+
+class ServiceResponse(NamedTuple):
+    """A computed answer of the service."""
+
+    body: bytes
+    """The JSON body."""
+    etag: str
+    """The quoted entity tag of the body."""
+    expires: float | None
+    """The ephem date the answer changes, None if it never changes."""
+
+
+class LunarService:
+    """Lunar answers with request coalescing and a shared cache.
+
+    Times are quantized, so requests within the same quantum share an answer.
+    Coordinates are rounded to a grid for the same reason, and phase answers
+    are shared by all locations. Identical requests that arrive while an
+    answer is being computed wait for that computation instead of starting
+    their own. Answers stay in a bounded cache and the HTTP cache headers
+    allow clients to keep them until they change.
+
+    Parameters
+    ----------
+    time_quantum : float, optional
+        The time quantization (seconds).
+    coordinate_quantum : float, optional
+        The coordinate rounding (degrees).
+    cache_size : int, optional
+        The maximum number of cached answers.
+    clock : callable, optional
+        Function returning the current time as an ephem date. Defaults to
+        :func:`ephem.now`.
+    """
+
+    ENDPOINTS = ("phase", "moon", "rise_set", "visible")
+    # The names of the service endpoints
+
+    def __init__(
+        self,
+        time_quantum: float = 60.0,
+        coordinate_quantum: float = 0.01,
+        cache_size: int = 4096,
+        clock: Callable[[], float] | None = None,
+    ):
+        self.time_quantum = time_quantum / _SECONDS_PER_DAY
+        self.coordinate_quantum = coordinate_quantum
+        self.cache_size = cache_size
+        self.clock = ephem.now if clock is None else clock
+        self.phase_index = PhaseIndex.shared()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+        self._cache: collections.OrderedDict[_Key, ServiceResponse] = collections.OrderedDict()
+        self._inflight: dict[_Key, concurrent.futures.Future[ServiceResponse]] = {}
+        self._containers: dict[str, LunarFeatureContainer] = {}
+        self._lock = threading.Lock()
+
+    def _quantize(self, value: float, quantum: float) -> float:
+        # Round first, so values on a boundary do not fall below it.
+        return round(math.floor(round(value / quantum, 6)) * quantum, 9)
+
+    def _key(self, endpoint: str, params: Params) -> tuple[_Key, bool]:
+        if endpoint not in self.ENDPOINTS:
+            raise KeyError(endpoint)
+        latitude = float(params["lat"])
+        longitude = float(params["lon"])
+        if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+            raise ValueError("Coordinates are out of range.")
+        if "time" in params:
+            date = datetime.fromisoformat(params["time"])
+            if date.tzinfo is None:
+                date = date.replace(tzinfo=timezone.utc)
+            mjd, explicit = datetime_to_mjd(date), True
+        else:
+            mjd, explicit = float(self.clock()), False
+        extra = ""
+        if endpoint == "rise_set":
+            extra = params.get("tz", "UTC")
+            get_timezone(extra)
+        elif endpoint == "visible":
+            extra = params.get("club", "Lunar")
+            if extra not in ("Lunar", "LunarII"):
+                raise ValueError(f"Unknown club {extra}.")
+        if endpoint == "phase":
+            # The phase is the same everywhere, so all locations share it.
+            latitude = longitude = 0.0
+        key = (
+            endpoint,
+            self._quantize(mjd, self.time_quantum),
+            self._quantize(latitude + self.coordinate_quantum / 2.0, self.coordinate_quantum),
+            self._quantize(longitude + self.coordinate_quantum / 2.0, self.coordinate_quantum),
+            extra,
+        )
+        return key, explicit
+
+    def get(self, endpoint: str, params: Params) -> tuple[ServiceResponse, bool]:
+        """Get the answer for a request.
+
+        Parameters
+        ----------
+        endpoint : str
+            The endpoint name, one of :attr:`ENDPOINTS`.
+        params : dict[str, str]
+            The query parameters.
+
+        Returns
+        -------
+        tuple[:class:`pylunar.server.ServiceResponse`, bool]
+            The answer and whether the request gave an explicit time.
+
+        Raises
+        ------
+        KeyError
+            Raised for an unknown endpoint or a missing parameter.
+        ValueError
+            Raised for an invalid parameter.
+        """
+        key, explicit = self._key(endpoint, params)
+        with self._lock:
+            # The key holds the quantized time, so a cached answer stays
+            # valid for as long as it is kept.
+            response = self._cache.get(key)
+            if response is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return response, explicit
+            future = self._inflight.get(key)
+            owner = future is None
+            if future is None:
+                future = concurrent.futures.Future()
+                self._inflight[key] = future
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if owner:
+            try:
+                response = self._compute(key)
+            except BaseException as error:
+                with self._lock:
+                    del self._inflight[key]
+                future.set_exception(error)
+                raise
+            with self._lock:
+                del self._inflight[key]
+                self._cache[key] = response
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            future.set_result(response)
+        return future.result(), explicit
+
+    def _container(self, club_name: str) -> LunarFeatureContainer:
+        with self._lock:
+            container = self._containers.get(club_name)
+        if container is None:
+            # Loaded outside of the lock, so requests for other answers do
+            # not wait on the database. The first published load wins.
+            container = LunarFeatureContainer(club_name)
+            container.load()
+            with self._lock:
+                container = self._containers.setdefault(club_name, container)
+        return container
+
+    def _compute(self, key: _Key) -> ServiceResponse:
+        endpoint, date, latitude, longitude, extra = key
+        moon_info = MoonInfo(latitude, longitude)
+        moon_info.update(ephem.Date(date))
+        expires = date + self.time_quantum
+        answer: dict[str, Any] = {}
+        if endpoint != "phase":
+            # The phase answer leaves out the location and the time, so its
+            # entity tag only changes with the phase name.
+            answer["latitude"] = latitude
+            answer["longitude"] = longitude
+            answer["time"] = mjd_to_datetime(date, round_off=True).isoformat()
+        if endpoint == "phase":
+            phase_name = self.phase_index.phase_name(date)
+            expires = self.phase_index.next_change(date)
+            answer["phase_name"] = phase_name
+            answer["emoji"] = PHASE_EMOJI[phase_name]
+            answer["next_change"] = mjd_to_datetime(expires, round_off=True).isoformat()
+        elif endpoint == "moon":
+            answer["altitude"] = moon_info.altitude()
+            answer["azimuth"] = moon_info.azimuth()
+            answer["fractional_phase"] = moon_info.fractional_phase()
+            answer["colong"] = moon_info.colong()
+            answer["age"] = moon_info.age()
+        elif endpoint == "rise_set":
+            tz = get_timezone(extra)
+            local_date = mjd_to_datetime(date, tz)
+            next_day = datetime.combine(local_date.date() + timedelta(days=1), datetime.min.time(), tz)
+            expires = datetime_to_mjd(next_day)
+            answer["timezone"] = extra
+            answer["events"] = [
+                {"kind": kind, "time": value if isinstance(value, str) else datetime(*value).isoformat()}
+                for kind, value in moon_info.rise_set_times(extra)
+            ]
+        else:
+            container = self._container(extra)
+            answer["club"] = extra
+            answer["features"] = [
+                feature.name for feature in container.select(container.visible_set(moon_info))
+            ]
+        body = json.dumps(answer).encode("utf-8")
+        etag = f'"{hashlib.sha1(body, usedforsecurity=False).hexdigest()[:20]}"'
+        return ServiceResponse(body, etag, expires)
+
+    def cache_control(self, response: ServiceResponse, explicit: bool) -> str:
+        """Get the Cache-Control header value for an answer.
+
+        Parameters
+        ----------
+        response : :class:`pylunar.server.ServiceResponse`
+            The answer.
+        explicit : bool
+            Whether the request gave an explicit time.
+
+        Returns
+        -------
+        str
+            The header value. Answers for the current time can be cached
+            until they change.
+        """
+        if explicit or response.expires is None:
+            return _IMMUTABLE
+        max_age = max(0, round((response.expires - float(self.clock())) * _SECONDS_PER_DAY))
+        return f"public, max-age={max_age}"
+
+
+class LunarRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler passing GET requests to the server's service."""
+
+    server: LunarHTTPServer
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Answer a GET request."""
+        url = urlsplit(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            response, explicit = self.server.service.get(url.path.strip("/"), params)
+        except KeyError as error:
+            status = HTTPStatus.NOT_FOUND if error.args[0] not in ("lat", "lon") else HTTPStatus.BAD_REQUEST
+            self._send_error(status, f"Unknown endpoint or missing parameter: {error.args[0]}")
+            return
+        except ValueError as error:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(error))
+            return
+
+        if self.headers.get("If-None-Match") == response.etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            body = b""
+        else:
+            self.send_response(HTTPStatus.OK)
+            body = response.body
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", response.etag)
+        self.send_header("Cache-Control", self.server.service.cache_control(response, explicit))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Log requests only when the server is verbose.
+
+        Parameters
+        ----------
+        format : str
+            The message format.
+        *args : tuple
+            The format arguments.
+        """
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class LunarHTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server holding a :class:`LunarService`.
+
+    Parameters
+    ----------
+    address : tuple[str, int]
+        The host and port to listen on.
+    service : :class:`pylunar.server.LunarService`
+        The service answering the requests.
+    verbose : bool, optional
+        Flag to log every request.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: LunarService, verbose: bool = False):
+        super().__init__(address, LunarRequestHandler)
+        self.service = service
+        self.verbose = verbose
+
+
+def make_server(
+    host: str = "127.0.0.1", port: int = 8000, service: LunarService | None = None, verbose: bool = False
+) -> LunarHTTPServer:
+    """Create the HTTP server.
+
+    Parameters
+    ----------
+    host : str, optional
+        The host to listen on.
+    port : int, optional
+        The port to listen on, 0 picks a free port.
+    service : :class:`pylunar.server.LunarService`, optional
+        The service answering the requests. Defaults to a new service.
+    verbose : bool, optional
+        Flag to log every request.
+
+    Returns
+    -------
+    :class:`pylunar.server.LunarHTTPServer`
+        The server, call ``serve_forever`` to run it.
+    """
+    return LunarHTTPServer((host, port), LunarService() if service is None else service, verbose)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the pylunar HTTP service.
+
+    Parameters
+    ----------
+    argv : list[str], optional
+        The command line arguments. Defaults to ``sys.argv``.
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    parser = argparse.ArgumentParser(prog="python -m pylunar.server", description="Serve lunar information.")
+    parser.add_argument("--host", default="127.0.0.1", help="The host to listen on.")
+    parser.add_argument("--port", type=int, default=8000, help="The port to listen on.")
+    parser.add_argument("--time-quantum", type=float, default=60.0, help="Time quantization in seconds.")
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port, LunarService(args.time_quantum), args.verbose)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
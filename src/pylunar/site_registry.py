@@ -0,0 +1,291 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the SiteRegistry class."""
+
+from __future__ import annotations
+
+__all__ = ["SiteCell", "SiteRegistry"]
+
+import collections
+from collections.abc import Callable, Hashable
+import math
+import threading
+from typing import TypeVar, cast
+
+import ephem
+
+from .helpers import tuple_to_string
+from .moon_info import MoonInfo
+from .pkg_types import DmsCoordinate
+
+T = TypeVar("T")
+
+CellKey = tuple[int, int]
+
+
+def _degrees(value: DmsCoordinate | float) -> float:
+    # Parse DMS tuples the same way as MoonInfo does.
+    if isinstance(value, tuple):
+        return math.degrees(ephem.degrees(tuple_to_string(value)))
+    return float(value)
+
+
+class SiteCell:
+    """Observer and cached results shared by the sites of one grid cell.
+
+    Parameters
+    ----------
+    key : tuple[int, int]
+        The latitude and longitude indexes of the cell.
+    moon_info : :class:`pylunar.MoonInfo`
+        Instance of the Lunar information class for the cell center.
+    maxsize : int
+        The largest number of cached results.
+    """
+
+    def __init__(self, key: CellKey, moon_info: MoonInfo, maxsize: int):
+        self.key = key
+        self.moon_info = moon_info
+        self.maxsize = maxsize
+        self.sites: set[str] = set()
+        self._cache: collections.OrderedDict[Hashable, object] = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Length of the cell.
+
+        Returns
+        -------
+        int
+            The number of cached results.
+        """
+        return len(self._cache)
+
+    def cached(self, key: Hashable, compute: Callable[[MoonInfo], T]) -> T:
+        """Get a cached result or compute it with the cell observer.
+
+        The least recently used result is dropped when the cache is full.
+
+        Parameters
+        ----------
+        key : hashable
+            The cache key, which must identify the computation and its
+            time, i.e. ("rise_set", date, timezone).
+        compute : callable
+            Function computing the result from the cell
+            :class:`pylunar.MoonInfo`.
+
+        Returns
+        -------
+        object
+            The result of the computation.
+        """
+        # The cell observer is shared, so computations are serialized too.
+        with self._lock:
+            try:
+                result = self._cache[key]
+            except KeyError:
+                self.misses += 1
+                result = compute(self.moon_info)
+                self._cache[key] = result
+                if len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+            else:
+                self.hits += 1
+                self._cache.move_to_end(key)
+        return cast(T, result)
+
+
+class SiteRegistry:
+    """Registry of observer sites that share nearby observers.
+
+    Site coordinates are snapped to a latitude and longitude grid. All sites
+    in a grid cell share one :class:`pylunar.SiteCell` holding a
+    :class:`pylunar.MoonInfo` for the cell center and a cache of results, so
+    subscribers a few kilometers apart only cost one computation. With the
+    default resolution of 0.05 degrees a site is at most about 4 km from its
+    cell center, which moves the lunar altitude by up to about two
+    arcminutes and the rise and set times by seconds.
+
+    Parameters
+    ----------
+    resolution : float, optional
+        The size (degrees) of the grid cells.
+    maxsize : int, optional
+        The largest number of cached results per cell.
+    """
+
+    def __init__(self, resolution: float = 0.05, maxsize: int = 256):
+        if resolution <= 0.0:
+            raise ValueError("Grid resolution must be positive.")
+        self.resolution = resolution
+        self.maxsize = maxsize
+        self._cells: dict[CellKey, SiteCell] = {}
+        self._sites: dict[str, SiteCell] = {}
+
+    def __len__(self) -> int:
+        """Length of the registry.
+
+        Returns
+        -------
+        int
+            The number of registered sites.
+        """
+        return len(self._sites)
+
+    def __contains__(self, name: object) -> bool:
+        """Check if a site is registered.
+
+        Parameters
+        ----------
+        name : str
+            The name of the site.
+
+        Returns
+        -------
+        bool
+            True if the site is registered.
+        """
+        return name in self._sites
+
+    @property
+    def cell_count(self) -> int:
+        """The number of distinct cells in use (int)."""
+        return len(self._cells)
+
+    @property
+    def dedup_ratio(self) -> float:
+        """The number of sites per cell in use (float)."""
+        return len(self._sites) / len(self._cells) if self._cells else 0.0
+
+    def cell_key(self, latitude: DmsCoordinate | float, longitude: DmsCoordinate | float) -> CellKey:
+        """Get the grid cell of a location.
+
+        Parameters
+        ----------
+        latitude : tuple of 3 ints or float
+            The latitude of the location in DMS format or in decimal degrees.
+        longitude : tuple of 3 ints or float
+            The longitude of the location in DMS format or in decimal
+            degrees.
+
+        Returns
+        -------
+        tuple[int, int]
+            The latitude and longitude indexes of the cell.
+        """
+        lat = _degrees(latitude)
+        lon = (_degrees(longitude) + 180.0) % 360.0 - 180.0
+        num_lon_cells = round(360.0 / self.resolution)
+        return (round(lat / self.resolution), round(lon / self.resolution) % num_lon_cells)
+
+    def add(self, name: str, latitude: DmsCoordinate | float, longitude: DmsCoordinate | float) -> SiteCell:
+        """Register a site.
+
+        Registering a known name again moves the site to its new location.
+
+        Parameters
+        ----------
+        name : str
+            The unique name of the site.
+        latitude : tuple of 3 ints or float
+            The latitude of the site in DMS format or in decimal degrees.
+        longitude : tuple of 3 ints or float
+            The longitude of the site in DMS format or in decimal degrees.
+
+        Returns
+        -------
+        :class:`pylunar.SiteCell`
+            The cell shared by the site.
+        """
+        key = self.cell_key(latitude, longitude)
+        if name in self._sites:
+            if self._sites[name].key == key:
+                return self._sites[name]
+            self.remove(name)
+        cell = self._cells.get(key)
+        if cell is None:
+            row, column = key
+            center_lon = column * self.resolution
+            if center_lon >= 180.0:
+                center_lon -= 360.0
+            cell = SiteCell(key, MoonInfo(row * self.resolution, center_lon), self.maxsize)
+            self._cells[key] = cell
+        cell.sites.add(name)
+        self._sites[name] = cell
+        return cell
+
+    def remove(self, name: str) -> None:
+        """Unregister a site.
+
+        The cell and its cached results are dropped with its last site.
+
+        Parameters
+        ----------
+        name : str
+            The name of the site.
+        """
+        cell = self._sites.pop(name)
+        cell.sites.discard(name)
+        if not cell.sites:
+            del self._cells[cell.key]
+
+    def cell(self, name: str) -> SiteCell:
+        """Get the cell shared by a site.
+
+        Parameters
+        ----------
+        name : str
+            The name of the site.
+
+        Returns
+        -------
+        :class:`pylunar.SiteCell`
+            The cell of the site.
+        """
+        return self._sites[name]
+
+    def moon_info(self, name: str) -> MoonInfo:
+        """Get the Lunar information instance shared by a site.
+
+        Parameters
+        ----------
+        name : str
+            The name of the site.
+
+        Returns
+        -------
+        :class:`pylunar.MoonInfo`
+            The instance for the cell center of the site.
+        """
+        return self._sites[name].moon_info
+
+    def stats(self) -> dict[str, float]:
+        """Summarize the deduplication and the cache use.
+
+        Returns
+        -------
+        dict[str, float]
+            The number of sites, cells, sites per cell, cache hits, cache
+            misses and the cache hit rate.
+        """
+        hits = sum(cell.hits for cell in self._cells.values())
+        misses = sum(cell.misses for cell in self._cells.values())
+        return {
+            "sites": len(self._sites),
+            "cells": len(self._cells),
+            "dedup_ratio": self.dedup_ratio,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
@@ -0,0 +1,109 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for searching solar altitude events over Lunar features."""
+
+from __future__ import annotations
+
+__all__ = ["SolarAltitudeEvent", "solar_altitude_events"]
+
+from collections.abc import Iterable, Sequence
+import functools
+from operator import attrgetter
+from typing import NamedTuple
+
+from .lunar_feature import LunarFeature
+from .moon_info import MoonInfo
+from .moon_timeline import MoonTimeline
+from .pkg_types import TimeLike
+from .search import brent, sign_changes
+
+SECONDS_TO_DAYS = 1.0 / 86400.0
+
+
+class SolarAltitudeEvent(NamedTuple):
+    """The Sun crossing a given altitude over a Lunar feature."""
+
+    date: float
+    """The ephem date of the crossing."""
+    feature: LunarFeature
+    """The lunar feature."""
+    altitude: float
+    """The solar altitude (degrees) crossed."""
+    rising: bool
+    """True if the Sun is rising over the feature."""
+
+
+def _altitude_difference(
+    timeline: MoonTimeline, feature: LunarFeature, altitude: float, date: float
+) -> float:
+    colong = timeline.colong_at(date)
+    return feature.solar_altitude(colong, timeline.subsolar_lat_at(date)) - altitude
+
+
+def solar_altitude_events(
+    moon_info: MoonInfo,
+    features: Iterable[LunarFeature],
+    start: TimeLike,
+    end: TimeLike,
+    altitudes: Sequence[float] = (0.0,),
+    step: float = 1.0 / 24.0,
+    tolerance: float = 1.0,
+) -> list[SolarAltitudeEvent]:
+    """Find the times the Sun crosses given altitudes over Lunar features.
+
+    The lunar state is sampled once for all features with a
+    :class:`pylunar.MoonTimeline`. Crossings are bracketed by the sign of
+    the altitude difference at the samples and refined with Brent's method
+    on the interpolated colongitude and subsolar latitude, so no further
+    lunar computations are needed per feature.
+
+    Parameters
+    ----------
+    moon_info : :class:`pylunar.MoonInfo`
+        Instance of the Lunar information class providing the observer
+        location. The instance is not modified.
+    features : iterable of :class:`pylunar.LunarFeature`
+        The features to search.
+    start : tuple or float
+        The UTC start time as a tuple or an ephem date.
+    end : tuple or float
+        The UTC end time as a tuple or an ephem date.
+    altitudes : sequence of float, optional
+        The solar altitudes (degrees) to search for.
+    step : float, optional
+        The spacing (days) of the lunar state samples. Crossings of the same
+        altitude closer together than this can be missed.
+    tolerance : float, optional
+        The tolerance (seconds) of the event times.
+
+    Returns
+    -------
+    list[:class:`pylunar.SolarAltitudeEvent`]
+        The events sorted by time.
+    """
+    timeline = MoonTimeline(moon_info, start, end, step)
+    tol = tolerance * SECONDS_TO_DAYS
+    events = []
+    for feature in features:
+        samples = [
+            feature.solar_altitude(colong, subsolar_lat)
+            for colong, subsolar_lat in zip(timeline.colongs, timeline.subsolar_lats, strict=True)
+        ]
+        for altitude in altitudes:
+            differences = [sample - altitude for sample in samples]
+            difference = functools.partial(_altitude_difference, timeline, feature, altitude)
+            for index in sign_changes(differences):
+                date = brent(difference, timeline.dates[index], timeline.dates[index + 1], tol)
+                rising = differences[index + 1] > differences[index]
+                events.append(SolarAltitudeEvent(date, feature, altitude, rising))
+
+    events.sort(key=attrgetter("date"))
+    return events
@@ -0,0 +1,230 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the SpatialIndex class."""
+
+from __future__ import annotations
+
+__all__ = ["SpatialIndex"]
+
+from collections.abc import Iterable
+import functools
+import heapq
+import math
+
+from .catalog import load_catalog
+from .lunar_feature import LunarFeature
+
+FeatureDistance = tuple[float, LunarFeature]
+
+
+def _unit_vector(latitude: float, longitude: float) -> tuple[float, float, float]:
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def _angle(first: tuple[float, float, float], second: tuple[float, float, float]) -> float:
+    # Angle between unit vectors from the cross and dot products, which
+    # stays accurate for small and large angles.
+    cross = (
+        first[1] * second[2] - first[2] * second[1],
+        first[2] * second[0] - first[0] * second[2],
+        first[0] * second[1] - first[1] * second[0],
+    )
+    dot = first[0] * second[0] + first[1] * second[1] + first[2] * second[2]
+    return math.degrees(math.atan2(math.hypot(*cross), dot))
+
+
+class SpatialIndex:
+    """Nearest feature lookups by selenographic coordinate.
+
+    Feature centers are bucketed on a latitude and longitude grid. Queries
+    only visit the cells that can hold features within the search radius,
+    widening the radius for nearest neighbor queries until enough features
+    are found. Distances are great circle angles in degrees. When feature
+    extents are used, the distance is measured to the edge of the feature,
+    taken as a circle with a radius of half its larger angular size, and is
+    zero inside the feature.
+
+    Parameters
+    ----------
+    features : iterable of :class:`pylunar.LunarFeature`
+        The features to index.
+    cell_size : float, optional
+        The size (degrees) of the grid cells.
+    """
+
+    def __init__(self, features: Iterable[LunarFeature], cell_size: float = 5.0):
+        self.features = tuple(features)
+        self.cell_size = cell_size
+        self._num_lon_cells = math.ceil(360.0 / cell_size)
+        self._vectors = [_unit_vector(x.latitude, x.longitude) for x in self.features]
+        self._radii = [
+            max(x.delta_latitude, x.delta_longitude * math.cos(math.radians(x.latitude))) / 2.0
+            for x in self.features
+        ]
+        self._max_radius = max(self._radii, default=0.0)
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        for position, feature in enumerate(self.features):
+            self._cells.setdefault(self._cell(feature.latitude, feature.longitude), []).append(position)
+
+    @classmethod
+    def from_catalog(cls: type[SpatialIndex], dbname: str | None = None) -> SpatialIndex:
+        """Get the shared index over a whole feature catalog.
+
+        The index is built on the first call for a database and shared by
+        all callers.
+
+        Parameters
+        ----------
+        dbname : str, optional
+            The path of the feature database. Defaults to the packaged
+            database.
+
+        Returns
+        -------
+        :class:`pylunar.SpatialIndex`
+            The spatial index.
+        """
+        return _catalog_index(dbname)
+
+    def __len__(self) -> int:
+        """Length of the index.
+
+        Returns
+        -------
+        int
+            The number of indexed features.
+        """
+        return len(self.features)
+
+    @property
+    def cell_count(self) -> int:
+        """The number of grid cells holding features (int)."""
+        return len(self._cells)
+
+    @property
+    def vectors(self) -> list[tuple[float, float, float]]:
+        """The unit vectors of the feature centers (list)."""
+        return self._vectors
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        row = min(math.floor((latitude + 90.0) / self.cell_size), math.ceil(180.0 / self.cell_size) - 1)
+        column = math.floor((longitude % 360.0) / self.cell_size) % self._num_lon_cells
+        return (row, column)
+
+    def _candidates(self, latitude: float, longitude: float, radius: float) -> Iterable[int]:
+        # Visit the cells overlapping the bounding box of the search circle.
+        if radius >= 180.0:
+            for positions in self._cells.values():
+                yield from positions
+            return
+        min_lat = latitude - radius
+        max_lat = latitude + radius
+        if min_lat <= -90.0 or max_lat >= 90.0:
+            columns = range(self._num_lon_cells)
+        else:
+            ratio = math.sin(math.radians(radius)) / math.cos(math.radians(max(-min_lat, max_lat)))
+            half_width = math.degrees(math.asin(min(1.0, ratio)))
+            if half_width >= 90.0:
+                columns = range(self._num_lon_cells)
+            else:
+                first = math.floor(((longitude - half_width) % 360.0) / self.cell_size)
+                count = math.floor(2.0 * half_width / self.cell_size) + 2
+                columns = range(first, first + min(count, self._num_lon_cells))
+        first_row = self._cell(max(min_lat, -90.0), longitude)[0]
+        last_row = self._cell(min(max_lat, 90.0), longitude)[0]
+        for row in range(first_row, last_row + 1):
+            for column in columns:
+                yield from self._cells.get((row, column % self._num_lon_cells), ())
+
+    def _distance(self, point: tuple[float, float, float], position: int, use_extent: bool) -> float:
+        distance = _angle(point, self._vectors[position])
+        if use_extent:
+            distance = max(0.0, distance - self._radii[position])
+        return distance
+
+    def within(
+        self, latitude: float, longitude: float, radius: float, use_extent: bool = True
+    ) -> list[FeatureDistance]:
+        """Find the features within a distance of a point.
+
+        Parameters
+        ----------
+        latitude : float
+            The selenographic latitude (degrees) of the point.
+        longitude : float
+            The selenographic longitude (degrees) of the point.
+        radius : float
+            The search radius (degrees).
+        use_extent : bool, optional
+            Flag to measure the distance to the feature edges instead of
+            their centers.
+
+        Returns
+        -------
+        list[(float, :class:`pylunar.LunarFeature`)]
+            The distances (degrees) and features sorted by distance.
+        """
+        point = _unit_vector(latitude, longitude)
+        search_radius = radius + (self._max_radius if use_extent else 0.0)
+        matches = []
+        for position in self._candidates(latitude, longitude, search_radius):
+            distance = self._distance(point, position, use_extent)
+            if distance <= radius:
+                matches.append((distance, position))
+        matches.sort()
+        return [(distance, self.features[position]) for distance, position in matches]
+
+    def nearest(
+        self, latitude: float, longitude: float, k: int = 1, use_extent: bool = False
+    ) -> list[FeatureDistance]:
+        """Find the features closest to a point.
+
+        Parameters
+        ----------
+        latitude : float
+            The selenographic latitude (degrees) of the point.
+        longitude : float
+            The selenographic longitude (degrees) of the point.
+        k : int, optional
+            The number of features to find.
+        use_extent : bool, optional
+            Flag to measure the distance to the feature edges instead of
+            their centers.
+
+        Returns
+        -------
+        list[(float, :class:`pylunar.LunarFeature`)]
+            The distances (degrees) and features sorted by distance.
+        """
+        k = min(k, len(self.features))
+        if k <= 0:
+            return []
+        point = _unit_vector(latitude, longitude)
+        extent = self._max_radius if use_extent else 0.0
+        radius = self.cell_size
+        while True:
+            # Features outside of the searched circle are further away than
+            # the radius less the largest extent.
+            distances = [
+                (self._distance(point, position, use_extent), position)
+                for position in self._candidates(latitude, longitude, radius + extent)
+            ]
+            closest = heapq.nsmallest(k, distances)
+            if (len(closest) == k and closest[-1][0] <= radius) or radius >= 180.0:
+                return [(distance, self.features[position]) for distance, position in closest]
+            radius *= 2.0
+
+
+@functools.lru_cache(maxsize=8)
+def _catalog_index(dbname: str | None) -> SpatialIndex:
+    return SpatialIndex(load_catalog(dbname))
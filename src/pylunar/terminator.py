@@ -0,0 +1,194 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Module for the lunar terminator geometry."""
+
+from __future__ import annotations
+
+__all__ = ["Terminator", "TerminatorGenerator", "terminator_lines"]
+
+from collections import OrderedDict
+from collections.abc import Iterable
+import functools
+import math
+import threading
+from typing import NamedTuple
+
+import ephem
+
+from .moon_info import MoonInfo
+from .pkg_types import TimeLike
+
+Polyline = tuple[tuple[float, float], ...]
+
+
+class Terminator(NamedTuple):
+    """The sunrise and sunset terminator lines at an instant."""
+
+    date: float
+    """The ephem date of the lunar state."""
+    sunrise: Polyline
+    """The (latitude, longitude) points (degrees) of the sunrise line."""
+    sunset: Polyline
+    """The (latitude, longitude) points (degrees) of the sunset line."""
+
+
+@functools.lru_cache(maxsize=32)
+def _latitude_grid(resolution: float) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    num_points = max(2, round(180.0 / resolution) + 1)
+    latitudes = tuple(-90.0 + 180.0 * i / (num_points - 1) for i in range(num_points))
+    tangents = tuple(math.tan(math.radians(lat)) for lat in latitudes)
+    return latitudes, tangents
+
+
+def _wrap(longitude: float) -> float:
+    return (longitude + 180.0) % 360.0 - 180.0
+
+
+def terminator_lines(
+    colong: float, subsolar_lat: float, resolution: float = 1.0
+) -> tuple[Polyline, Polyline]:
+    """Calculate the terminator lines for a given lunar state.
+
+    The terminator is where the solar altitude of
+    :meth:`pylunar.MoonInfo.solar_altitude` is zero. For every latitude on
+    the grid that gives ``sin(colong + lon) = -tan(subsolar_lat) tan(lat)``
+    which is solved once for the sunrise and once for the sunset line.
+
+    Parameters
+    ----------
+    colong : float
+        The selenographic colongitude in degrees.
+    subsolar_lat : float
+        The subsolar latitude in degrees.
+    resolution : float, optional
+        The latitude spacing (degrees) of the points.
+
+    Returns
+    -------
+    tuple(polyline, polyline)
+        The sunrise and sunset lines as (latitude, longitude) points running
+        from the south to the north pole. Longitudes are in [-180, 180).
+    """
+    latitudes, tangents = _latitude_grid(resolution)
+    factor = -math.tan(math.radians(subsolar_lat))
+    angles = [math.degrees(math.asin(min(1.0, max(-1.0, factor * tangent)))) for tangent in tangents]
+    sunrise = tuple(zip(latitudes, [_wrap(angle - colong) for angle in angles], strict=True))
+    sunset = tuple(zip(latitudes, [_wrap(180.0 - angle - colong) for angle in angles], strict=True))
+    return sunrise, sunset
+
+
+class TerminatorGenerator:
+    """Generate terminator lines for many instants with caching.
+
+    Times are quantized and the lines for each quantized time are kept in a
+    bounded least recently used cache, so animation frames that share a
+    quantized time reuse the same geometry.
+
+    Parameters
+    ----------
+    moon_info : :class:`pylunar.MoonInfo`
+        Instance of the Lunar information class providing the observer
+        location. The instance is not modified.
+    resolution : float, optional
+        The latitude spacing (degrees) of the points.
+    quantum : float, optional
+        The time quantization (seconds) for the cache.
+    cache_size : int, optional
+        The maximum number of cached instants.
+    """
+
+    def __init__(
+        self, moon_info: MoonInfo, resolution: float = 1.0, quantum: float = 60.0, cache_size: int = 1024
+    ):
+        self.resolution = resolution
+        self.quantum = quantum / 86400.0
+        self.cache_size = cache_size
+        self._observer = moon_info.observer.copy()
+        self._cache: OrderedDict[int, Terminator] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def from_moon_info(moon_info: MoonInfo, resolution: float = 1.0) -> Terminator:
+        """Calculate the terminator for the current state of a MoonInfo.
+
+        Parameters
+        ----------
+        moon_info : :class:`pylunar.MoonInfo`
+            Instance of the Lunar information class.
+        resolution : float, optional
+            The latitude spacing (degrees) of the points.
+
+        Returns
+        -------
+        :class:`pylunar.Terminator`
+            The terminator lines.
+        """
+        sunrise, sunset = terminator_lines(moon_info.colong(), moon_info.subsolar_lat(), resolution)
+        return Terminator(float(moon_info.observer.date), sunrise, sunset)
+
+    def at(self, date: TimeLike) -> Terminator:
+        """Get the terminator lines for a given time.
+
+        Parameters
+        ----------
+        date : tuple or float
+            The UTC time as a tuple or an ephem date.
+
+        Returns
+        -------
+        :class:`pylunar.Terminator`
+            The terminator lines for the quantized time.
+        """
+        key = round(float(ephem.Date(date)) / self.quantum)
+        with self._lock:
+            terminator = self._cache.get(key)
+            if terminator is not None:
+                self._cache.move_to_end(key)
+                return terminator
+
+        # Computed outside of the lock with a private observer and body.
+        observer = self._observer.copy()
+        observer.date = key * self.quantum
+        moon = ephem.Moon(observer)
+        sunrise, sunset = terminator_lines(
+            math.degrees(moon.colong), math.degrees(moon.subsolar_lat), self.resolution
+        )
+        terminator = Terminator(key * self.quantum, sunrise, sunset)
+        with self._lock:
+            self._cache[key] = terminator
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return terminator
+
+    def batch(self, dates: Iterable[TimeLike]) -> list[Terminator]:
+        """Get the terminator lines for many times.
+
+        Parameters
+        ----------
+        dates : iterable of tuple or float
+            The UTC times as tuples or ephem dates.
+
+        Returns
+        -------
+        list[:class:`pylunar.Terminator`]
+            The terminator lines in the order of the times.
+        """
+        return [self.at(date) for date in dates]
+
+    def cache_info(self) -> tuple[int, int]:
+        """Get the cache usage.
+
+        Returns
+        -------
+        tuple(int, int)
+            The number of cached instants and the maximum cache size.
+        """
+        return (len(self._cache), self.cache_size)
@@ -0,0 +1,77 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the Almanac class."""
+
+import pathlib
+
+import pytest
+
+from pylunar import Almanac, LunarFeature, LunarFeatureContainer, MoonInfo
+
+
+class TestAlmanac:
+    def setup_class(self) -> None:
+        location = ((35, 58, 10), (-84, 19, 0))
+        self.mi = MoonInfo(location[0], location[1])
+        self.mi.update((2013, 10, 12, 18, 0, 0))
+        self.lfc = LunarFeatureContainer("Lunar")
+        self.lfc.load()
+        self.almanac = Almanac.compute(
+            self.mi, self.lfc, (2013, 10, 12, 0, 0, 0), (2013, 10, 13, 0, 0, 0), 1.0 / 24.0
+        )
+
+    def test_basic_information_after_compute(self) -> None:
+        assert len(self.almanac) == 25
+        assert self.almanac.row_bytes == 19
+        assert len(self.almanac.feature_names) == 90
+        assert self.almanac.feature_set() == self.lfc.feature_set()
+        assert self.mi.observer.date == 41558.25
+
+        self.mi.update((2013, 10, 12, 18, 0, 0))
+        assert self.almanac.columns["colong"][18] == self.mi.colong()
+        assert self.almanac.phase_name(18) == self.mi.phase_name()
+        visible = [feature.name for feature in self.lfc if self.mi.is_visible(feature)]
+        assert sorted(self.almanac.visible_features(18)) == sorted(visible)
+        assert self.almanac.visible_set(18) == self.lfc.visible_set(self.mi)
+
+    def test_catalog_keyed_bitsets(self) -> None:
+        features = list(self.lfc)
+        subset = Almanac.compute(
+            self.mi, reversed(features[::2]), (2013, 10, 12, 0, 0, 0), (2013, 10, 13, 0, 0, 0), 1.0 / 24.0
+        )
+        for row in (0, 18, 24):
+            assert subset.visible_set(row) == self.almanac.visible_set(row) & subset.feature_set()
+        feature = LunarFeature("Test", 1.0, 0.0, 0.0, 1.0, 1.0, "Crater", "q", "c", "Lunar", None)
+        with pytest.raises(ValueError):
+            Almanac.compute(self.mi, [feature], (2013, 10, 12, 0, 0, 0), (2013, 10, 13, 0, 0, 0), 1.0)
+
+    def test_save_and_load(self, tmp_path: pathlib.Path) -> None:
+        filename = tmp_path / "almanac.bin"
+        self.almanac.save(filename)
+
+        loaded = Almanac.load(filename)
+        assert len(loaded) == len(self.almanac)
+        assert loaded.feature_names == self.almanac.feature_names
+        assert loaded.feature_ids == self.almanac.feature_ids
+        for name, _ in Almanac.COLUMNS:
+            assert list(loaded.columns[name]) == list(self.almanac.columns[name])
+        assert isinstance(loaded.columns["colong"], memoryview)
+        assert loaded.visible_features(18) == self.almanac.visible_features(18)
+
+        loaded.close()
+        assert loaded.phase_name(18) == self.almanac.phase_name(18)
+        assert loaded.visible_set(18) == self.almanac.visible_set(18)
+
+    def test_load_bad_file(self, tmp_path: pathlib.Path) -> None:
+        filename = tmp_path / "bad.bin"
+        filename.write_bytes(b"not an almanac file")
+        with pytest.raises(ValueError):
+            Almanac.load(filename)
@@ -0,0 +1,99 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the command line interface."""
+
+import csv
+import json
+import pathlib
+
+import pytest
+
+from pylunar import MoonInfo
+from pylunar.cli import main, read_sites
+
+
+class TestCli:
+    @pytest.fixture
+    def sites(self, tmp_path: pathlib.Path) -> pathlib.Path:
+        filename = tmp_path / "sites.csv"
+        filename.write_text(
+            "name,latitude,longitude,timezone\n"
+            "knoxville,35:58:10,-84:19:0,America/New_York\n"
+            "boston,42.358,-71.06,\n"
+        )
+        return filename
+
+    def test_read_sites(self, sites: pathlib.Path, tmp_path: pathlib.Path) -> None:
+        site_list = read_sites(str(sites))
+        assert len(site_list) == 2
+        assert site_list[0]["latitude"] == pytest.approx(35.0 + 58.0 / 60.0 + 10.0 / 3600.0)
+        assert site_list[1]["longitude"] == -71.06
+        assert site_list[1]["timezone"] == "UTC"
+
+        json_sites = tmp_path / "sites.json"
+        json_sites.write_text(json.dumps([{"name": "a", "latitude": 35.5, "longitude": "-84:19"}]))
+        assert read_sites(str(json_sites))[0]["longitude"] == pytest.approx(-84.0 - 19.0 / 60.0)
+
+    def test_read_sites_zero_degrees(self, tmp_path: pathlib.Path) -> None:
+        filename = tmp_path / "sites.csv"
+        filename.write_text("name,latitude,longitude\nlondon,51:30:26,-0:07:39\nquito,-0:13:47,-78:31:30\n")
+        london, quito = read_sites(str(filename))
+        assert london["longitude"] == pytest.approx(-(7.0 / 60.0 + 39.0 / 3600.0))
+        assert quito["latitude"] == pytest.approx(-(13.0 / 60.0 + 47.0 / 3600.0))
+        moon_info = MoonInfo(london["latitude"], london["longitude"])
+        assert moon_info.observer.long < 0.0
+        assert str(moon_info.observer.long) == "-0:07:39.0"
+
+    def test_jsonl_output(self, sites: pathlib.Path, capsys: pytest.CaptureFixture[str]) -> None:
+        args = ["almanac", str(sites), "--start", "2013-10-12T18:00", "--end", "2013-10-13T18:00"]
+        status = main([*args, "--format", "jsonl"])
+        assert status == 0
+        captured = capsys.readouterr()
+        rows = [json.loads(line) for line in captured.out.splitlines()]
+        assert len(rows) == 4
+        assert rows[0]["site"] == "knoxville"
+        assert rows[0]["time"] == "2013-10-12T18:00:00+00:00"
+        assert rows[0]["phase_name"] == "WAXING_GIBBOUS"
+        assert rows[0]["solar_altitudes"]["Rupes Recta"] == 1.3038753306292297
+        assert len(rows[0]["visible_features"]) == 26
+        assert "rows/s" in captured.err
+
+    def test_resume(self, sites: pathlib.Path, tmp_path: pathlib.Path) -> None:
+        output = tmp_path / "almanac.csv"
+        args = ["almanac", str(sites), "--start", "2013-10-01", "--end", "2013-10-05", "-o", str(output)]
+        args.append("-q")
+        assert main(args) == 0
+        complete = output.read_text()
+
+        # Simulate an interrupted run with a partially written row.
+        output.write_text(complete[: complete.index("boston") + 20])
+        assert main([*args, "--resume", "--jobs", "2"]) == 0
+        with open(output) as ifile:
+            rows = list(csv.DictReader(ifile))
+        assert len(rows) == 10
+        assert [(row["site"], row["time"]) for row in rows] == [
+            (row["site"], row["time"]) for row in csv.DictReader(complete.splitlines())
+        ]
+
+    def test_resume_jsonl(self, sites: pathlib.Path, tmp_path: pathlib.Path) -> None:
+        output = tmp_path / "almanac.jsonl"
+        args = ["almanac", str(sites), "--start", "2013-10-01", "--end", "2013-10-03", "-o", str(output)]
+        args.extend(["--format", "jsonl", "-q"])
+        assert main(args) == 0
+        complete = output.read_text().splitlines()
+
+        output.write_text("\n".join(complete[:4]) + "\n" + complete[4][:30])
+        assert main([*args, "--resume"]) == 0
+        assert output.read_text().splitlines() == complete
+
+    def test_resume_needs_output(self, sites: pathlib.Path) -> None:
+        with pytest.raises(SystemExit):
+            main(["almanac", str(sites), "--start", "2013-10-01", "--end", "2013-10-05", "--resume"])
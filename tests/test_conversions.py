@@ -0,0 +1,71 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the time conversion functions."""
+
+from datetime import datetime, timezone
+
+import ephem
+import pytest
+
+from pylunar import datetime_to_mjd, mjd_to_date_tuple, mjd_to_datetime
+from pylunar.conversions import (
+    epoch_to_mjd,
+    epochs_to_mjds,
+    get_timezone,
+    mjd_to_epoch,
+    mjds_to_datetimes,
+    mjds_to_epochs,
+)
+
+
+class TestConversions:
+    def setup_class(self) -> None:
+        self.mjd = 41564.48448662116
+        self.mjds = [41564.48448662116, 41558.25, 43000.123456789]
+
+    def test_mjd_to_datetime(self) -> None:
+        date = mjd_to_datetime(self.mjd)
+        assert date.tzinfo is timezone.utc
+        assert date.timetuple()[:6] == (2013, 10, 18, 23, 37, 39)
+        assert mjd_to_datetime(self.mjd, round_off=True).microsecond == 0
+        local_date = mjd_to_datetime(self.mjd, "America/New_York", round_off=True)
+        assert local_date.timetuple()[:6] == (2013, 10, 18, 19, 37, 39)
+        assert mjd_to_datetime(self.mjd, "Not/A_Zone").tzinfo is timezone.utc
+
+    def test_round_off_matches_ephem(self) -> None:
+        for mjd in self.mjds:
+            truth = tuple(int(x) for x in ephem.Date(mjd).tuple())
+            assert mjd_to_date_tuple(mjd, round_off=True) == truth
+            assert mjd_to_datetime(mjd, round_off=True).timetuple()[:6] == truth
+
+    def test_datetime_to_mjd(self) -> None:
+        date = datetime(2013, 10, 12, 18, 0, 0)
+        assert datetime_to_mjd(date) == float(ephem.Date(date))
+        assert datetime_to_mjd(date.replace(tzinfo=timezone.utc)) == 41558.25
+        assert datetime_to_mjd(mjd_to_datetime(self.mjd)) == pytest.approx(self.mjd, abs=1e-10)
+
+    def test_epoch(self) -> None:
+        assert mjd_to_epoch(25567.5) == 0.0
+        assert epoch_to_mjd(0.0) == 25567.5
+        assert epoch_to_mjd(mjd_to_epoch(self.mjd)) == pytest.approx(self.mjd, abs=1e-10)
+        timestamp = mjd_to_datetime(self.mjd).timestamp()
+        assert mjd_to_epoch(self.mjd) == pytest.approx(timestamp, abs=1e-5)
+
+    def test_batch_conversions(self) -> None:
+        epochs = mjds_to_epochs(self.mjds)
+        assert list(epochs) == [mjd_to_epoch(x) for x in self.mjds]
+        assert list(epochs_to_mjds(epochs)) == pytest.approx(self.mjds, abs=1e-10)
+        dates = mjds_to_datetimes(self.mjds, "America/New_York", round_off=True)
+        assert dates == [mjd_to_datetime(x, "America/New_York", round_off=True) for x in self.mjds]
+
+    def test_get_timezone(self) -> None:
+        assert get_timezone("America/New_York") is get_timezone("America/New_York")
+        assert get_timezone("Bad/Zone") is timezone.utc
@@ -0,0 +1,69 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the dark sky calendar."""
+
+import math
+
+import ephem
+
+from pylunar import DarkSkyCalendar, DarkWindow, MoonInfo
+
+
+class TestDarkSkyCalendar:
+    def setup_class(self) -> None:
+        self.mi = MoonInfo((35, 58, 10), (-84, 19, 0))
+        self.calendar = DarkSkyCalendar(self.mi, max_illumination=0.25)
+        self.windows = list(self.calendar.windows((2024, 1, 20), (2024, 2, 20)))
+
+    def test_windows_match_sampling(self) -> None:
+        observer = self.mi.observer.copy()
+        observer.pressure = 0
+        sun = ephem.Sun()
+        moon = ephem.Moon()
+        start = float(ephem.Date((2024, 1, 20)))
+        for step in range(31 * 96):
+            observer.date = date = start + step / 96.0
+            sun.compute(observer)
+            moon.compute(observer)
+            moon_down = math.degrees(moon.alt + moon.radius) < -34.0 / 60.0
+            expected = math.degrees(sun.alt) < -18.0 and (moon_down or moon.moon_phase < 0.25)
+            assert any(window.start <= date < window.end for window in self.windows) == expected
+
+    def test_month_boundary(self) -> None:
+        calendar = DarkSkyCalendar(MoonInfo(36.0, 0.0))
+        windows = list(calendar.windows((2024, 10, 30), (2024, 11, 3)))
+        boundary = float(ephem.Date((2024, 11, 1)))
+        spanning = [window for window in windows if window.start < boundary < window.end]
+        assert len(spanning) == 1
+        assert spanning[0].hours > 8.0
+        assert all(
+            earlier.end < later.start for earlier, later in zip(windows[:-1], windows[1:], strict=True)
+        )
+
+    def test_months(self) -> None:
+        months = list(self.calendar.months((2024, 1, 20), (2024, 2, 20)))
+        assert [(year, month) for year, month, _ in months] == [(2024, 1), (2024, 2)]
+        assert [window for _, _, windows in months for window in windows] == self.windows
+
+    def test_illumination_threshold(self) -> None:
+        strict = DarkSkyCalendar(self.mi)
+        windows = list(strict.windows((2024, 1, 20), (2024, 2, 20)))
+        assert not any(window.moon_up for window in windows)
+        assert any(window.moon_up for window in self.windows)
+        assert sum(window.hours for window in windows) < sum(window.hours for window in self.windows)
+
+    def test_no_darkness(self) -> None:
+        calendar = DarkSkyCalendar(MoonInfo(65.0, 20.0))
+        assert list(calendar.windows((2024, 6, 10), (2024, 6, 20))) == []
+
+    def test_window(self) -> None:
+        window = DarkWindow(1.0, 1.5, False)
+        assert window.hours == 12.0
@@ -0,0 +1,91 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the DiskProjector class."""
+
+import math
+
+import pytest
+
+from pylunar import DiskProjector, LunarFeature, MoonInfo
+
+
+def make_feature(name: str, latitude: float, longitude: float) -> LunarFeature:
+    return LunarFeature(name, 1.0, latitude, longitude, 0.0, 0.0, "Crater", "q", "c", "Lunar", None)
+
+
+class TestDiskProjector:
+    def setup_class(self) -> None:
+        self.features = [
+            make_feature("Center", 0.0, 0.0),
+            make_feature("East", 0.0, 90.0),
+            make_feature("North", 90.0, 0.0),
+            make_feature("Far", 0.0, 180.0),
+        ]
+        self.projector = DiskProjector(self.features)
+        self.mi = MoonInfo((35, 58, 10), (-84, 19, 0))
+        self.mi.update((2013, 10, 18, 22, 0, 0))
+
+    def test_mean_orientation(self) -> None:
+        projection = self.projector.project_state(1.0, 0.0, 0.0, 0.0, 900.0)
+        assert list(projection.x) == pytest.approx([0.0, 1.0, 0.0, 0.0], abs=1e-12)
+        assert list(projection.y) == pytest.approx([0.0, 0.0, 1.0, 0.0], abs=1e-12)
+        assert (projection.near_side[0], projection.near_side[3]) == (1, 0)
+
+    def test_position_angle(self) -> None:
+        projection = self.projector.project_state(1.0, 0.0, 0.0, 90.0, 900.0)
+        assert projection.x[2] == pytest.approx(-1.0)
+        assert projection.y[2] == pytest.approx(0.0, abs=1e-12)
+        assert projection.x[1] == pytest.approx(0.0, abs=1e-12)
+        assert projection.y[1] == pytest.approx(1.0)
+
+    def test_libration(self) -> None:
+        # The point facing the Earth projects to the disk center.
+        projector = DiskProjector([make_feature("Facing", -3.0, 6.0)])
+        projection = projector.project_state(1.0, 6.0, -3.0, 20.0, 900.0)
+        assert projection.x[0] == pytest.approx(0.0, abs=1e-12)
+        assert projection.y[0] == pytest.approx(0.0, abs=1e-12)
+        # A libration in longitude brings the far side limb into view.
+        limb = DiskProjector([make_feature("Limb", 0.0, 92.0)])
+        assert limb.project_state(1.0, 0.0, 0.0, 0.0, 900.0).near_side[0] == 0
+        assert limb.project_state(1.0, 5.0, 0.0, 0.0, 900.0).near_side[0] == 1
+
+    def test_project(self) -> None:
+        projection = self.projector.project(self.mi)
+        assert projection.date == pytest.approx(float(self.mi.observer.date))
+        assert projection.radius == pytest.approx(self.mi.angular_size() * 1800.0)
+        assert projection.position_angle == pytest.approx(self.mi.axis_position_angle())
+        for x, y in zip(projection.x, projection.y, strict=True):
+            assert math.hypot(x, y) <= 1.0 + 1e-12
+
+    def test_to_pixels(self) -> None:
+        projection = self.projector.project_state(1.0, 0.0, 0.0, 0.0, 900.0)
+        columns, rows = projection.to_pixels(2.0, (320.0, 240.0))
+        assert list(columns) == pytest.approx([320.0, 770.0, 320.0, 320.0])
+        assert list(rows) == pytest.approx([240.0, 240.0, -210.0, 240.0])
+
+    def test_project_many(self) -> None:
+        start = float(self.mi.observer.date)
+        dates = [start + hour / 24.0 for hour in range(3)]
+        projections = list(self.projector.project_many(self.mi, dates))
+        assert [projection.date for projection in projections] == pytest.approx(dates)
+        assert float(self.mi.observer.date) == start
+        first = self.projector.project(self.mi)
+        assert list(projections[0].x) == pytest.approx(list(first.x))
+        assert list(projections[0].y) == pytest.approx(list(first.y))
+
+    def test_catalog(self) -> None:
+        projector = DiskProjector.from_catalog()
+        assert len(projector) == 175
+        assert DiskProjector.from_catalog() is projector
+        rebuilt = DiskProjector(projector.features).project(self.mi)
+        assert list(rebuilt.x) == pytest.approx(list(projector.project(self.mi).x))
+        with pytest.raises(ValueError):
+            DiskProjector(self.features, [(1.0, 0.0, 0.0)])
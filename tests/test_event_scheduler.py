@@ -0,0 +1,89 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the EventScheduler class."""
+
+import ephem
+import pytest
+
+from pylunar import EventScheduler, LunarFeatureContainer, MoonInfo
+
+
+class TestEventScheduler:
+    def setup_class(self) -> None:
+        location = ((35, 58, 10), (-84, 19, 0))
+        self.mi = MoonInfo(location[0], location[1])
+        self.lfc = LunarFeatureContainer("Lunar")
+        self.lfc.load(limit=20)
+        self.start = float(ephem.Date((2024, 1, 1, 0, 0, 0)))
+
+    def test_visibility_events(self) -> None:
+        scheduler = EventScheduler(self.start)
+        scheduler.add_site("home", self.mi, self.lfc)
+        assert len(scheduler) == 1
+        events = scheduler.next_events(self.start + 30.0)
+        dates = [event.date for event in events]
+        assert dates == sorted(dates)
+        assert all(self.start <= date <= self.start + 30.0 for date in dates)
+
+        visible = {feature.feature_id: False for feature in self.lfc}
+        transitions = [event for event in events if event.kind in ("visible", "hidden")]
+        index = 0
+        date = self.start + 0.01
+        while date < self.start + 30.0:
+            while index < len(transitions) and transitions[index].date <= date:
+                event = transitions[index]
+                assert event.feature is not None
+                assert visible[event.feature.feature_id] != (event.kind == "visible")
+                visible[event.feature.feature_id] = event.kind == "visible"
+                index += 1
+            self.mi.update(ephem.Date(date))
+            for feature in self.lfc:
+                assert self.mi.is_visible(feature) == visible[feature.feature_id]
+            date += 0.25
+
+    def test_rise_set_and_phases(self) -> None:
+        scheduler = EventScheduler(self.start)
+        scheduler.add_site("home", self.mi, [])
+        events = scheduler.next_events(self.start + 10.0)
+        kinds = [event.kind for event in events if event.kind in ("moonrise", "moonset")]
+        assert all(first != second for first, second in zip(kinds[:-1], kinds[1:], strict=True))
+        assert len(kinds) == 20
+        phases = [event for event in events if event.kind in EventScheduler.EVENT_KINDS[4:]]
+        assert [event.kind for event in phases] == ["last_quarter"]
+        assert ephem.Date(phases[0].date).tuple()[:3] == (2024, 1, 4)
+        later = scheduler.next_events(self.start + 12.0)
+        new_moon = [event for event in later if event.kind == "new_moon"]
+        assert ephem.Date(new_moon[0].date).tuple()[:3] == (2024, 1, 11)
+
+    def test_incremental_dispatch(self) -> None:
+        scheduler = EventScheduler(self.start)
+        scheduler.add_site("home", self.mi, self.lfc)
+        scheduler.add_site("away", MoonInfo((51, 28, 38), (0, 0, 0)), self.lfc)
+        first = scheduler.next_events(self.start + 3.0)
+        second = scheduler.next_events(self.start + 6.0)
+        assert {event.site for event in first} == {"home", "away"}
+        assert scheduler.now == self.start + 6.0
+        assert first[-1].date <= second[0].date
+        next_event = scheduler.peek()
+        assert next_event is not None
+        assert next_event.date > self.start + 6.0
+
+        scheduler.remove_site("away")
+        assert {event.site for event in scheduler.next_events(self.start + 9.0)} == {"home"}
+        with pytest.raises(ValueError):
+            scheduler.add_site("home", self.mi, [])
+
+    def test_lookahead(self) -> None:
+        scheduler = EventScheduler(self.start, lookahead=10.0)
+        scheduler.add_site("pole", MoonInfo((89, 59, 0), (0, 0, 0)), [])
+        events = scheduler.next_events(self.start + 400.0)
+        assert all(event.kind not in ("visible", "hidden") for event in events)
+        assert scheduler.peek() is not None
@@ -0,0 +1,55 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the FeatureBitset class."""
+
+import pytest
+
+from pylunar import FeatureBitset, LunarFeature
+
+
+class TestFeatureBitset:
+    def setup_class(self) -> None:
+        self.first = FeatureBitset.from_ids([1, 3, 5, 64])
+        self.second = FeatureBitset.from_ids([3, 4, 64, 200])
+
+    def test_basic_information_after_creation(self) -> None:
+        assert len(FeatureBitset()) == 0
+        assert not FeatureBitset()
+        assert len(self.first) == 4
+        assert list(self.first) == [1, 3, 5, 64]
+        assert 5 in self.first
+        assert 4 not in self.first
+        assert -1 not in self.first
+        with pytest.raises(ValueError):
+            FeatureBitset(-1)
+
+    def test_set_algebra(self) -> None:
+        assert list(self.first | self.second) == [1, 3, 4, 5, 64, 200]
+        assert list(self.first & self.second) == [3, 64]
+        assert list(self.first - self.second) == [1, 5]
+        assert list(self.first ^ self.second) == [1, 4, 5, 200]
+        assert self.first & self.second == FeatureBitset.from_ids([64, 3])
+        assert len({self.first, FeatureBitset.from_ids([1, 3, 5, 64])}) == 1
+
+    def test_bytes_round_trip(self) -> None:
+        data = self.second.to_bytes()
+        assert len(data) == 26
+        assert FeatureBitset.from_bytes(data) == self.second
+        assert len(self.second.to_bytes(32)) == 32
+
+    def test_from_features(self) -> None:
+        feature = LunarFeature(
+            "A", 0.1, 0.0, 46.0, 0.01, 0.01, "Crater", "Taruntius", "LAC-61", "Lunar", None, feature_id=7
+        )
+        assert list(FeatureBitset.from_features([feature])) == [7]
+        feature.feature_id = None
+        with pytest.raises(ValueError):
+            FeatureBitset.from_features([feature])
@@ -0,0 +1,133 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the LiveMoon class."""
+
+import threading
+import time
+
+import ephem
+import pytest
+
+from pylunar import LiveMoon, LunarFeature, LunarFeatureContainer, MoonInfo
+
+
+class FakeClock:
+    def __init__(self, date: float):
+        self.date = date
+        self.calls = 0
+
+    def __call__(self) -> float:
+        self.calls += 1
+        return self.date
+
+
+class FailingClock(FakeClock):
+    def __init__(self, date: float):
+        super().__init__(date)
+        self.failing = False
+
+    def __call__(self) -> float:
+        if self.failing:
+            self.calls += 1
+            raise RuntimeError("Clock is unavailable.")
+        return super().__call__()
+
+
+class TestLiveMoon:
+    def setup_class(self) -> None:
+        location = ((35, 58, 10), (-84, 19, 0))
+        self.mi = MoonInfo(location[0], location[1])
+        self.lfc = LunarFeatureContainer("Lunar")
+        self.lfc.load()
+        self.date = float(ephem.Date((2013, 10, 18, 22, 0, 0)))
+
+    def test_snapshot(self) -> None:
+        live = LiveMoon(self.mi, self.lfc, clock=FakeClock(self.date))
+        snapshot = live.snapshot()
+        self.mi.update((2013, 10, 18, 22, 0, 0))
+        assert snapshot.date == self.date
+        assert snapshot.phase_name == self.mi.phase_name()
+        assert snapshot.colong == pytest.approx(self.mi.colong())
+        assert snapshot.altitude == pytest.approx(self.mi.altitude())
+        assert snapshot.visible == self.lfc.visible_set(self.mi)
+        assert live.snapshot() is snapshot
+        assert not live.running
+
+    def test_background_refresh(self) -> None:
+        clock = FakeClock(self.date)
+        with LiveMoon(self.mi, interval=0.01, clock=clock) as live:
+            assert live.running
+            first = live.snapshot()
+            clock.date += 0.5
+            deadline = time.monotonic() + 5.0
+            while live.snapshot().date == first.date and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert live.snapshot().date == self.date + 0.5
+        assert not live.running
+        calls = clock.calls
+        time.sleep(0.05)
+        assert clock.calls == calls
+
+    def test_refresh_failure(self) -> None:
+        clock = FailingClock(self.date)
+        with LiveMoon(self.mi, interval=0.01, clock=clock) as live:
+            clock.failing = True
+            deadline = time.monotonic() + 5.0
+            while live.last_error is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert isinstance(live.last_error, RuntimeError)
+            assert live.running
+            assert live.snapshot().date == self.date
+            clock.date += 0.5
+            clock.failing = False
+            while live.snapshot().date == self.date and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert live.snapshot().date == self.date + 0.5
+            assert live.last_error is None
+
+    def test_staleness_bound(self) -> None:
+        clock = FakeClock(self.date)
+        live = LiveMoon(self.mi, max_age=0.0, clock=clock)
+        first = live.snapshot()
+        clock.date += 1.0
+        second = live.snapshot()
+        assert second.date == self.date + 1.0
+        assert second.created > first.created
+
+    def test_concurrent_readers(self) -> None:
+        live = LiveMoon(self.mi, interval=0.001, clock=FakeClock(self.date))
+        errors = []
+
+        def read() -> None:
+            for _ in range(200):
+                snapshot = live.snapshot()
+                if snapshot.date != self.date:
+                    errors.append(snapshot)
+
+        with live:
+            threads = [threading.Thread(target=read) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert errors == []
+
+    def test_bad_arguments(self) -> None:
+        with pytest.raises(ValueError):
+            LiveMoon(self.mi, interval=0.0)
+        feature = LunarFeature("Test", 1.0, 0.0, 0.0, 1.0, 1.0, "Crater", "q", "c", "Lunar", None)
+        with pytest.raises(ValueError):
+            LiveMoon(self.mi, [feature])
+        live = LiveMoon(self.mi, interval=10.0)
+        live.start()
+        with pytest.raises(RuntimeError):
+            live.start()
+        live.stop()
@@ -0,0 +1,86 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the LunarEventFinder class."""
+
+import math
+
+import ephem
+import pytest
+
+from pylunar import LunarEventFinder, LunarFeature, MoonInfo
+
+
+class TestLunarEventFinder:
+    def setup_class(self) -> None:
+        location = ((35, 58, 10), (-84, 19, 0))
+        self.mi = MoonInfo(location[0], location[1])
+        self.mare_australe = LunarFeature(
+            "Mare Australe",
+            603.0,
+            -38.92,
+            93.0,
+            19.87,
+            24.4,
+            "Mare",
+            "Mare Australe",
+            "LAC-115",
+            "LunarII",
+            "Binocular",
+        )
+
+    def test_events(self) -> None:
+        finder = LunarEventFinder()
+        events = finder.events((2024, 1, 1, 0, 0, 0), (2024, 4, 1, 0, 0, 0))
+        assert len(finder) == 4
+        dates = [event.date for event in events]
+        assert dates == sorted(dates)
+        perigees = [event for event in events if event.kind == "perigee"]
+        assert [ephem.Date(x.date).tuple()[:3] for x in perigees] == [
+            (2024, 1, 13),
+            (2024, 2, 10),
+            (2024, 3, 10),
+        ]
+        assert perigees[-1].value == pytest.approx(356895.0, abs=1.0)
+        assert len([event for event in events if event.kind == "apogee"]) == 4
+        for kind in LunarEventFinder.EVENT_KINDS[2:]:
+            assert len([event for event in events if event.kind == kind]) == 3
+
+        distance = ephem.Moon(ephem.Date(perigees[0].date)).earth_distance
+        for offset in (-0.1, 0.1):
+            assert ephem.Moon(ephem.Date(perigees[0].date + offset)).earth_distance > distance
+
+        apogees = finder.events((2024, 1, 1, 0, 0, 0), (2024, 4, 1, 0, 0, 0), kinds=["apogee"])
+        assert [event.kind for event in apogees] == ["apogee"] * 4
+        assert len(finder) == 4
+
+    def test_next_events(self) -> None:
+        finder = LunarEventFinder()
+        perigee = finder.next_perigee((2024, 1, 14, 0, 0, 0))
+        assert ephem.Date(perigee.date).tuple()[:3] == (2024, 2, 10)
+        apogee = finder.next_apogee((2024, 1, 14, 0, 0, 0))
+        assert ephem.Date(apogee.date).tuple()[:3] == (2024, 1, 29)
+
+    def test_libration_windows(self) -> None:
+        finder = LunarEventFinder()
+        start = ephem.Date((2024, 1, 1, 0, 0, 0))
+        end = ephem.Date((2024, 3, 1, 0, 0, 0))
+        windows = finder.libration_windows(self.mare_australe, start, end, 3.0)
+        assert len(windows) == 2
+        for window_start, window_end in windows:
+            assert start <= window_start < window_end <= end
+
+        date = float(start)
+        while date < end:
+            self.mi.update(ephem.Date(date))
+            total = math.hypot(self.mi.libration_lat(), self.mi.libration_lon())
+            is_ok = self.mi.is_libration_ok(self.mare_australe) and total >= 3.0
+            assert is_ok == any(a <= date < b for a, b in windows)
+            date += 0.1
@@ -42,6 +42,7 @@ class TestLunarFeature:
         assert lf.quad_code == self.feature_info[8]
         assert lf.code_name == self.feature_info[9]
         assert lf.lunar_club_type == self.feature_info[10]
+        assert lf.feature_id is None
         assert lf.latitude_range() == (-62.430559651643, -54.815102116853005)
         assert lf.longitude_range() == (-22.034792792535, -7.420187842583001)
         assert lf.feature_angle() == 194.10225514559056
@@ -76,6 +77,7 @@ class TestLunarFeature:
         assert lf.quad_code == feature_row[9]
         assert lf.code_name == feature_row[10]
         assert lf.lunar_club_type == feature_row[11]
+        assert lf.feature_id == feature_row[0]
 
     def test_list_from_feature(self) -> None:
         lf = LunarFeature(*self.feature_info)
@@ -10,6 +10,8 @@
 
 """Tests for the LunarFeatureContainer class."""
 
+import pytest
+
 from pylunar import LunarFeatureContainer, MoonInfo
 
 
@@ -70,3 +72,55 @@ class TestLunarFeatureContainer:
         ilfc2 = iter(lc2_lfc)
         feature2 = next(ilfc2)
         assert feature2.name == "Vallis Alpes"
+
+    def test_feature_sets(self) -> None:
+        location = ((35, 58, 10), (-84, 19, 0))
+        mi = MoonInfo(location[0], location[1])
+
+        lc_lfc = LunarFeatureContainer("Lunar")
+        lc_lfc.load(limit=10)
+        assert lc_lfc[3].name == "Vallis Alpes"
+        assert len(lc_lfc.feature_set()) == 10
+
+        mi.update((2013, 10, 12, 18, 0, 0))
+        first = lc_lfc.visible_set(mi)
+        assert len(first) == 6
+        assert [feature.name for feature in lc_lfc.select(first)][0] == "Vallis Alpes"
+        lc_lfc.load(mi, limit=10)
+        assert lc_lfc.feature_set() == first
+
+        mi.update((2013, 10, 13, 18, 0, 0))
+        lc_lfc.load(limit=10)
+        second = lc_lfc.visible_set(mi)
+        assert len(first & second) + len(first - second) == len(first)
+        assert len(first | second) == len(first) + len(second - first)
+
+    def test_query(self) -> None:
+        lc_lfc = LunarFeatureContainer("Lunar")
+        lc_lfc.load()
+        query = lc_lfc.query()
+        assert len(query) == 90
+        assert query.facets("lunar_club_type") == {"Naked Eye": 10, "Binocular": 45, "Telescopic": 35}
+
+        craters = query.where(feature_type="Crater")
+        assert len(craters) == 55
+        assert all(feature.feature_type == "Crater" for feature in craters)
+        assert craters.facets("lunar_club_type")["Naked Eye"] == 0
+        both = query.where(feature_type=["Crater", "Mare"], lunar_club_type="Binocular")
+        assert len(both) == len(both & craters) + len(both - craters)
+
+        large = craters.diameter(minimum=50.0, maximum=100.0)
+        assert len(large) == 22
+        assert all(50.0 <= feature.diameter <= 100.0 for feature in large)
+        names = [feature.name for feature in craters.by_diameter(reverse=True)]
+        assert names[:3] == ["Clavius", "Schickard", "Petavius"]
+        assert len(query.where(quad_code="LAC-112") | craters) >= len(craters)
+
+        location = ((35, 58, 10), (-84, 19, 0))
+        mi = MoonInfo(location[0], location[1])
+        mi.update((2013, 10, 12, 18, 0, 0))
+        assert query.visible(mi).feature_set == lc_lfc.visible_set(mi)
+        with pytest.raises(ValueError):
+            query.facets("name")
+        with pytest.raises(ValueError):
+            query & LunarFeatureContainer("Lunar").query()
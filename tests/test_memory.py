@@ -0,0 +1,90 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Memory budget tests for catalogs, containers and caches.
+
+The budgets are about 1.3 times the measured sizes, so a regression in the
+per-object footprint fails here. ``scripts/memory_footprint.py`` reports the
+same sizes for larger catalogs.
+"""
+
+from collections.abc import Callable
+import gc
+import pathlib
+import sqlite3
+import tracemalloc
+from typing import TypeVar
+
+import pytest
+
+from pylunar import LunarFeatureContainer, MoonInfo, MoonTimeline, PhaseIndex, load_catalog
+from pylunar.catalog import default_database
+
+T = TypeVar("T")
+
+LOCATION = ((35, 58, 10), (-84, 19, 0))
+NUM_ROWS = 2000
+
+
+def measure(func: Callable[[], T]) -> tuple[T, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+@pytest.fixture(scope="module")
+def synthetic_database(tmp_path_factory: pytest.TempPathFactory) -> str:
+    conn = sqlite3.connect(default_database())
+    schema = conn.execute("select sql from sqlite_master where name = 'Features'").fetchone()[0]
+    template = conn.execute("select * from Features").fetchall()
+    conn.close()
+    filename = str(pathlib.Path(tmp_path_factory.mktemp("memory")) / "lunar.db")
+    conn = sqlite3.connect(filename)
+    conn.execute(schema)
+    rows = []
+    for feature_id in range(1, NUM_ROWS + 1):
+        row = list(template[feature_id % len(template)])
+        row[0] = feature_id
+        row[1] = f"{row[1]} {feature_id}"
+        rows.append(row)
+    conn.executemany(f"insert into Features values ({', '.join('?' * len(template[0]))})", rows)
+    conn.commit()
+    conn.close()
+    return filename
+
+
+def test_catalog_budget(synthetic_database: str) -> None:
+    features, size = measure(lambda: load_catalog(synthetic_database))
+    assert len(features) == NUM_ROWS
+    assert size / NUM_ROWS < 460
+    assert not hasattr(features[0], "__dict__")
+
+
+def test_container_budget(synthetic_database: str) -> None:
+    load_catalog(synthetic_database)
+    container = LunarFeatureContainer("Lunar", synthetic_database)
+    _, size = measure(container.load)
+    assert len(container) > NUM_ROWS // 3
+    assert size / len(container) < 220
+
+
+def test_moon_info_budget() -> None:
+    moon_info, size = measure(lambda: MoonInfo(*LOCATION))
+    assert size < 1600
+    timeline, size = measure(lambda: MoonTimeline(moon_info, (2024, 1, 1), (2024, 2, 1)))
+    assert size / len(timeline) < 210
+    index, size = measure(lambda: PhaseIndex((2024, 1, 1), (2025, 1, 1)))
+    assert size / len(index) < 60
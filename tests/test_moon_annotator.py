@@ -0,0 +1,64 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the MoonAnnotator class."""
+
+import random
+
+import ephem
+import pytest
+
+from pylunar import MoonAnnotator, MoonInfo
+
+
+class TestMoonAnnotator:
+    def setup_class(self) -> None:
+        self.mi = MoonInfo((35, 58, 10), (-84, 19, 0))
+        self.other = MoonInfo((-33, 52, 0), (151, 12, 0))
+        start = float(ephem.Date((2013, 10, 1, 0, 0, 0)))
+        generator = random.Random(42)
+        self.dates = [start + generator.uniform(0.0, 90.0) for _ in range(60)]
+        self.dates += self.dates[:10]
+        generator.shuffle(self.dates)
+
+    def check(self, annotation: object, moon_info: MoonInfo, date: float) -> None:
+        moon_info.update(ephem.Date(date))
+        assert annotation == (
+            date,
+            pytest.approx(moon_info.altitude()),
+            pytest.approx(moon_info.azimuth()),
+            pytest.approx(moon_info.fractional_phase()),
+            moon_info.phase_name(),
+            pytest.approx(moon_info.colong()),
+            pytest.approx(moon_info.age()),
+        )
+
+    def test_annotate(self) -> None:
+        annotator = MoonAnnotator(self.mi)
+        annotations = list(annotator.annotate(self.dates))
+        assert len(annotations) == len(self.dates)
+        for annotation, date in zip(annotations, self.dates, strict=True):
+            self.check(annotation, self.mi, date)
+
+    def test_annotate_sites(self) -> None:
+        annotator = MoonAnnotator(self.mi)
+        sites = [self.mi if i % 3 else self.other for i in range(len(self.dates))]
+        annotations = list(annotator.annotate(self.dates, sites))
+        for annotation, date, site in zip(annotations, self.dates, sites, strict=True):
+            self.check(annotation, site, date)
+        assert annotations[0].altitude != next(annotator.annotate([self.dates[0]])).altitude
+
+    def test_columns(self) -> None:
+        annotator = MoonAnnotator(self.mi)
+        columns = annotator.columns([(2013, 10, 18, 22, 0, 0), (2013, 10, 5, 0, 0, 0)])
+        assert set(columns) == {*MoonAnnotator.NUMERIC_FIELDS, "phase_name"}
+        assert columns["phase_name"] == ["FULL_MOON", "NEW_MOON"]
+        assert columns["date"][0] > columns["date"][1]
+        assert annotator.columns([])["phase_name"] == []
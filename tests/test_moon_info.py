@@ -137,6 +137,35 @@ class TestMoonInfo:
         self.mi.update((2013, 11, 2, 23, 0, 0))
         assert self.mi.phase_emoji() == "🌘"
 
+    def test_phase_shape_in_ascii(self) -> None:
+        self.mi.update((2013, 10, 24, 15, 0, 0))
+        assert self.mi.phase_shape_in_ascii().splitlines()[1] == " .'   `::."
+        self.mi.update((2013, 11, 2, 23, 0, 0))
+        assert self.mi.phase_shape_in_ascii().splitlines()[1] == " .' .::::."
+
+    def test_bright_limb_angle(self) -> None:
+        self.mi.update((2013, 10, 8, 6, 0, 0))
+        assert round(self.mi.bright_limb_angle(), 2) == 282.10
+        self.mi.update((2013, 10, 24, 15, 0, 0))
+        assert round(self.mi.bright_limb_angle(), 2) == 94.54
+
+    def test_axis_position_angle(self) -> None:
+        # Meeus, Astronomical Algorithms, example 53.a gives 15.08 degrees.
+        self.mi.update((1992, 4, 12, 0, 0, 0))
+        assert round(self.mi.axis_position_angle(), 1) == 15.1
+
+    def test_copy(self) -> None:
+        self.mi.update(self.obs_datetime)
+        self.mi.observer.elevation = 250.0
+        clone = self.mi.copy()
+        assert clone.observer is not self.mi.observer
+        assert clone.observer.elevation == 250.0
+        assert clone.colong() == self.mi.colong()
+        clone.update(self.date_list[0])
+        assert self.mi.observer.date == 41564.416666666664
+        assert clone.altitude() != self.mi.altitude()
+        self.mi.observer.elevation = 0.0
+
     def test_colong_to_long(self) -> None:
         self.mi.update(self.date_list[0])
         assert self.mi.colong_to_long() == 85.63604081994191
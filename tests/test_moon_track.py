@@ -0,0 +1,74 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the adaptive lunar track."""
+
+import math
+
+import ephem
+import pytest
+
+from pylunar import MoonInfo, MoonTrack
+
+
+def separation(altaz1: tuple[float, float], altaz2: tuple[float, float]) -> float:
+    alt1, az1 = (math.radians(value) for value in altaz1)
+    alt2, az2 = (math.radians(value) for value in altaz2)
+    cos_sep = math.sin(alt1) * math.sin(alt2) + math.cos(alt1) * math.cos(alt2) * math.cos(az1 - az2)
+    return math.degrees(math.acos(min(1.0, cos_sep)))
+
+
+class TestMoonTrack:
+    def setup_class(self) -> None:
+        self.mi = MoonInfo((35, 58, 10), (-84, 19, 0))
+        self.mi.update((2013, 10, 18, 22, 0, 0))
+        self.track = MoonTrack(self.mi, (2013, 10, 18, 22, 0, 0), (2013, 10, 19, 22, 0, 0))
+
+    def test_accuracy(self) -> None:
+        observer = self.mi.observer.copy()
+        observer.pressure = 0
+        moon = ephem.Moon()
+        worst = 0.0
+        for minute in range(0, 1441, 7):
+            observer.date = self.track.start + minute / 1440.0
+            moon.compute(observer)
+            expected = (math.degrees(moon.alt), math.degrees(moon.az))
+            worst = max(worst, separation(self.track.at(observer.date), expected))
+        assert worst < self.track.tolerance
+        assert self.track.computes == len(self.track)
+        assert self.track.computes < 1440 / 10
+
+    def test_events(self) -> None:
+        events = self.track.events
+        assert [event.event for event in events] == ["rise", "transit", "set"]
+        rise_set = dict(self.mi.rise_set_times("UTC"))
+        rise = ephem.Date(events[0].date).tuple()
+        assert rise[:5] == rise_set["rise"][:5]
+        assert events[1].azimuth == pytest.approx(180.0, abs=1.0e-3)
+        assert events[0].altitude == pytest.approx(-0.567 - self.mi.angular_size() / 2.0, abs=0.01)
+        assert all(sample in self.track.samples for sample in events)
+
+    def test_samples(self) -> None:
+        dates = [sample.date for sample in self.track.samples]
+        assert dates == sorted(dates)
+        assert dates[0] == self.track.start
+        assert dates[-1] == self.track.end
+        sample = self.track.samples[len(self.track) // 2]
+        assert self.track.at(sample.date) == pytest.approx((sample.altitude, sample.azimuth))
+
+    def test_tolerance(self) -> None:
+        fine = MoonTrack(self.mi, self.track.start, self.track.end, tolerance=0.01)
+        assert len(fine) > len(self.track)
+
+    def test_bad_range(self) -> None:
+        with pytest.raises(ValueError):
+            MoonTrack(self.mi, (2013, 10, 19), (2013, 10, 18))
+        with pytest.raises(ValueError):
+            self.track.at(self.track.end + 1.0)
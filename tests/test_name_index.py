@@ -0,0 +1,60 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the NameIndex class."""
+
+from pylunar import LunarFeature, NameIndex, load_catalog
+from pylunar.name_index import normalize_name
+
+
+class TestNameIndex:
+    def setup_class(self) -> None:
+        self.index = NameIndex.from_catalog()
+
+    def test_catalog(self) -> None:
+        catalog = load_catalog()
+        assert len(catalog) == 175
+        assert catalog[0].feature_id == 1
+        assert load_catalog() is catalog
+        assert len(self.index) == 175
+        assert NameIndex.from_catalog() is self.index
+
+    def test_normalize_name(self) -> None:
+        assert normalize_name("  Mare  Imbrium ") == "mare imbrium"
+        assert normalize_name("Ångström-A") == "angstrom a"
+
+    def test_get(self) -> None:
+        feature = self.index.get("COPERNICUS")
+        assert feature is not None
+        assert feature.name == "Copernicus"
+        assert self.index.get("Vulcan") is None
+
+    def test_prefix(self) -> None:
+        names = [feature.name for feature in self.index.prefix("mare", limit=3)]
+        assert names == ["Mare Australe", "Mare Cognitum", "Mare Crisium"]
+        assert [feature.name for feature in self.index.prefix("imbr")] == ["Mare Imbrium"]
+        assert self.index.prefix("") == []
+        assert self.index.prefix("xyz") == []
+
+    def test_fuzzy(self) -> None:
+        assert [feature.name for feature in self.index.fuzzy("Copernicos")] == ["Copernicus"]
+        assert [feature.name for feature in self.index.fuzzy("Ptolemeus")] == ["Ptolemaeus"]
+        assert [feature.name for feature in self.index.fuzzy("imbrum")] == ["Mare Imbrium"]
+        assert [feature.name for feature in self.index.fuzzy("Týcho")] == ["Tycho"]
+        assert self.index.fuzzy("Zzzzzzzz") == []
+
+    def test_custom_features(self) -> None:
+        features = [
+            LunarFeature("Ångström", 9.5, 29.9, -41.6, 0.3, 0.4, "Crater", "q", "LAC-39", "Lunar", None, 7),
+            LunarFeature("Ångström A", 3.0, 30.0, -41.0, 0.1, 0.1, "Crater", "q", "LAC-39", "Lunar", None, 8),
+        ]
+        index = NameIndex(features)
+        assert [feature.feature_id for feature in index.prefix("angs")] == [7, 8]
+        assert [feature.feature_id for feature in index.fuzzy("angstrem")] == [7]
@@ -0,0 +1,62 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the ObservingPlanner class."""
+
+import ephem
+
+from pylunar import LunarFeatureContainer, MoonInfo, MoonTimeline, ObservingPlanner
+
+
+class TestObservingPlanner:
+    def setup_class(self) -> None:
+        location = ((35, 58, 10), (-84, 19, 0))
+        self.mi = MoonInfo(location[0], location[1])
+        self.lfc = LunarFeatureContainer("Lunar")
+        self.lfc.load()
+        self.planner = ObservingPlanner(self.mi, self.lfc)
+
+    def test_basic_information_after_creation(self) -> None:
+        assert len(self.planner) == 180
+
+    def test_timeline(self) -> None:
+        timeline = MoonTimeline(self.mi, (2013, 10, 12, 18, 0, 0), (2013, 10, 13, 6, 0, 0))
+        assert len(timeline) == 13
+        colong = timeline.colongs[5]
+        assert timeline.date_at_colong(colong) == timeline.dates[5]
+        assert timeline.date_at_colong(timeline.colongs[0] - 1.0) is None
+        assert timeline.align(timeline.colongs[0] - 1.0) == timeline.colongs[0] + 359.0
+
+    def test_moon_up_intervals(self) -> None:
+        intervals = self.planner.moon_up_intervals((2013, 10, 12, 18, 0, 0), (2013, 10, 13, 18, 0, 0))
+        assert len(intervals) == 1
+        assert ephem.Date(intervals[0][0]).tuple()[:4] == (2013, 10, 12, 19)
+        assert ephem.Date(intervals[0][1]).tuple()[:4] == (2013, 10, 13, 6)
+
+    def test_plan_night(self) -> None:
+        plan = self.planner.plan_night((2013, 10, 12, 18, 0, 0))
+        assert len(plan) == 31
+        assert plan[0].start == (2013, 10, 13, 0, 0, 30)
+        assert plan[0].feature.name == "Mare Crisium"
+        starts = [entry.start for entry in plan]
+        assert starts == sorted(starts)
+
+        for entry in plan:
+            middle = (ephem.Date(entry.start) + ephem.Date(entry.end)) / 2.0
+            self.mi.update(ephem.Date(middle))
+            assert self.mi.is_visible(entry.feature)
+            assert entry.time_of_day == self.mi.time_of_day()
+
+    def test_visibility_windows(self) -> None:
+        windows = [MoonInfo.visibility_windows(feature) for feature in self.lfc]
+        assert sum(len(x) for x in windows) == len(self.planner)
+        for feature_windows in windows:
+            for start, end, _ in feature_windows:
+                assert start < end
@@ -0,0 +1,94 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the phase disk renderer."""
+
+import struct
+import zlib
+
+import pytest
+
+from pylunar import MoonInfo, PhaseDiskRenderer
+from pylunar.phase_disk import DARK_LEVEL, LIT_LEVEL, encode_png, phase_disk_raster, phase_disk_svg
+
+
+def lit_fraction(raster: bytes) -> float:
+    gray = raster[0::2]
+    alpha = raster[1::2]
+    lit = sum(a * (g - DARK_LEVEL) / (LIT_LEVEL - DARK_LEVEL) for g, a in zip(gray, alpha, strict=True))
+    return lit / sum(alpha)
+
+
+def lit_side(raster: bytes, size: int) -> float:
+    # The mean column of the lit pixels relative to the center.
+    columns = [
+        (index % size) - size / 2.0 + 0.5
+        for index in range(size * size)
+        if raster[2 * index] > (LIT_LEVEL + DARK_LEVEL) / 2
+    ]
+    return sum(columns) / len(columns)
+
+
+class TestPhaseDisk:
+    def setup_class(self) -> None:
+        self.mi = MoonInfo((35, 58, 10), (-84, 19, 0))
+
+    @pytest.mark.parametrize("fractional_phase", [0.1, 0.5, 0.8])
+    def test_raster_illumination(self, fractional_phase: float) -> None:
+        raster = phase_disk_raster(fractional_phase, 270.0, 48)
+        assert len(raster) == 2 * 48 * 48
+        assert lit_fraction(raster) == pytest.approx(fractional_phase, abs=0.02)
+
+    def test_raster_orientation(self) -> None:
+        assert lit_side(phase_disk_raster(0.3, 270.0, 32), 32) > 5.0
+        assert lit_side(phase_disk_raster(0.3, 90.0, 32), 32) < -5.0
+        assert lit_fraction(phase_disk_raster(0.0, 90.0, 32)) == 0.0
+        assert lit_fraction(phase_disk_raster(1.0, 90.0, 32)) == pytest.approx(1.0)
+
+    def test_svg(self) -> None:
+        svg = phase_disk_svg(0.25, 270.0, 32)
+        assert svg.startswith('<svg xmlns="http://www.w3.org/2000/svg"')
+        assert 'width="32"' in svg
+        assert "A0.5000,1 0 0,0 0,-1Z" in svg
+        assert 'rotate(0.0)"' in svg
+        assert "A0.5000,1 0 0,1 0,-1Z" in phase_disk_svg(0.75, 90.0)
+        assert 'rotate(180.0)"' in phase_disk_svg(0.75, 90.0)
+
+    def test_png(self) -> None:
+        raster = phase_disk_raster(0.4, 120.0, 16)
+        png = encode_png(raster, 16)
+        assert png.startswith(b"\x89PNG\r\n\x1a\n")
+        length = struct.unpack(">I", png[8:12])[0]
+        assert struct.unpack(">II", png[16:24]) == (16, 16)
+        idat_start = 8 + 12 + length
+        idat_length = struct.unpack(">I", png[idat_start : idat_start + 4])[0]
+        assert png[idat_start + 4 : idat_start + 8] == b"IDAT"
+        scanlines = zlib.decompress(png[idat_start + 8 : idat_start + 8 + idat_length])
+        assert b"".join(scanlines[row * 33 + 1 : (row + 1) * 33] for row in range(16)) == raster
+        assert png.endswith(b"IEND\xaeB`\x82")
+
+    def test_renderer_cache(self) -> None:
+        renderer = PhaseDiskRenderer(size=16, cache_size=2)
+        self.mi.update((2013, 10, 8, 6, 0, 0))
+        svg = renderer.svg(self.mi)
+        self.mi.update((2013, 10, 8, 6, 1, 0))
+        assert renderer.svg(self.mi) is svg
+        assert renderer.stats()["hits"] == 1
+        key = renderer.key(self.mi.fractional_phase(), self.mi.bright_limb_angle())
+        assert svg == phase_disk_svg(key[0] * 0.005, key[1] * 2.0, 16)
+        assert lit_side(renderer.raster(self.mi), 16) > 0.0
+        assert renderer.png(self.mi).startswith(b"\x89PNG")
+        assert len(renderer) == 2
+        assert renderer.stats() == {"images": 2, "hits": 1, "misses": 3, "hit_rate": 0.25}
+
+    def test_key(self) -> None:
+        renderer = PhaseDiskRenderer()
+        assert renderer.key(0.5012, 359.5) == (100, 0)
+        assert renderer.key(0.0, 181.2) == (0, 91)
@@ -0,0 +1,107 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the PhaseIndex class."""
+
+import ephem
+
+from pylunar import MoonInfo, PhaseIndex
+
+
+class TestPhaseIndex:
+    def setup_class(self) -> None:
+        location = ((35, 58, 10), (-84, 19, 0))
+        self.mi = MoonInfo(location[0], location[1])
+        self.date_list = [
+            (2013, 10, 5, 0, 0, 0),
+            (2013, 10, 8, 6, 0, 0),
+            (2013, 10, 11, 22, 0, 0),
+            (2013, 10, 12, 3, 30, 0),
+            (2013, 10, 18, 18, 0, 0),
+            (2013, 10, 19, 1, 30, 0),
+            (2013, 10, 24, 15, 0, 0),
+            (2013, 10, 26, 23, 40, 0),
+            (2013, 11, 2, 23, 0, 0),
+        ]
+
+    def test_basic_information_after_creation(self) -> None:
+        index = PhaseIndex()
+        assert len(index) == 0
+        assert index.covered_range is None
+
+        index = PhaseIndex((2013, 10, 1, 0, 0, 0), (2013, 11, 1, 0, 0, 0))
+        covered = index.covered_range
+        assert covered is not None
+        assert covered[0] <= ephem.Date((2013, 10, 1, 0, 0, 0))
+        assert covered[1] > ephem.Date((2013, 11, 1, 0, 0, 0))
+
+    def test_phase_names_match_moon_info(self) -> None:
+        index = PhaseIndex()
+        truth = []
+        for date in self.date_list:
+            self.mi.update(date)
+            truth.append(self.mi.phase_name())
+            assert index.phase_name(date) == truth[-1]
+            assert index.phase_emoji(date) == self.mi.phase_emoji()
+        assert index.phase_names(self.date_list) == truth
+        assert index.phase_names([]) == []
+
+    def test_main_phase_cutoff(self) -> None:
+        index = PhaseIndex()
+        full_moon = float(ephem.next_full_moon((2013, 10, 1, 0, 0, 0)))
+        hours = 1.0 / 24.0
+        assert index.phase_name(full_moon - 2.01 * hours) == "WAXING_GIBBOUS"
+        assert index.phase_name(full_moon - 1.99 * hours) == "FULL_MOON"
+        assert index.phase_name(full_moon + 1.99 * hours) == "FULL_MOON"
+        assert index.phase_name(full_moon + 2.01 * hours) == "WANING_GIBBOUS"
+
+    def test_extension(self) -> None:
+        index = PhaseIndex((2013, 10, 1, 0, 0, 0), (2013, 11, 1, 0, 0, 0))
+        size = len(index)
+        index.phase_name((2013, 10, 15, 0, 0, 0))
+        assert len(index) == size
+        self.mi.update((2014, 6, 1, 0, 0, 0))
+        assert index.phase_name((2014, 6, 1, 0, 0, 0)) == self.mi.phase_name()
+        assert len(index) > size
+        self.mi.update((2012, 6, 1, 0, 0, 0))
+        assert index.phase_name((2012, 6, 1, 0, 0, 0)) == self.mi.phase_name()
+
+    def test_sequential_lookups(self) -> None:
+        index = PhaseIndex()
+        start = float(ephem.Date((2013, 1, 1, 0, 0, 0)))
+        sizes = set()
+        for i in range(4 * 365):
+            date = start + i * 0.25
+            index.phase_name(date)
+            sizes.add(len(index))
+        # Every extension adds at least one lunation of main phases.
+        assert len(sizes) <= 365 // 29 + 2
+
+        covered = index.covered_range
+        assert covered is not None
+        boundaries = index._table[0]
+        assert list(boundaries) == sorted(boundaries)
+        index.phase_name(covered[0] - 100.0)
+        boundaries = index._table[0]
+        assert list(boundaries) == sorted(boundaries)
+        for date in (covered[0] - 100.0, covered[0] - 50.0, covered[0] + 3.0):
+            self.mi.update(ephem.Date(date))
+            assert index.phase_name(date) == self.mi.phase_name()
+
+    def test_next_change(self) -> None:
+        index = PhaseIndex()
+        date = float(ephem.Date((2013, 10, 18, 12, 0, 0)))
+        change = index.next_change(date)
+        # The full moon of 2013-10-18 23:38 UTC starts its bucket two hours
+        # earlier.
+        assert ephem.Date(change).tuple()[:4] == (2013, 10, 18, 21)
+        assert index.phase_name(change - 1.0e-4) == "WAXING_GIBBOUS"
+        assert index.phase_name(change) == "FULL_MOON"
+        assert index.next_change(change) > change
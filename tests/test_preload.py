@@ -0,0 +1,55 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the warmup function."""
+
+import gc
+
+import ephem
+
+import pylunar
+from pylunar import AltitudeDict, LunarFeatureContainer, MoonInfo, NameIndex, PhaseIndex, SpatialIndex
+
+
+def test_warmup() -> None:
+    start = (2024, 1, 1, 0, 0, 0)
+    report = pylunar.warmup(start=start, freeze=False)
+    assert report.features == len(pylunar.load_catalog()) == 175
+    assert report.name_keys == NameIndex.from_catalog().key_count
+    assert report.spatial_cells == SpatialIndex.from_catalog().cell_count
+    assert report.phase_buckets == len(PhaseIndex.shared())
+    assert report.covered_range is not None
+    assert report.covered_range[0] <= float(ephem.Date(start))
+    assert report.covered_range[1] >= float(ephem.Date(start)) + 365.0
+    assert report.allocated_bytes >= 0
+    assert report.frozen_objects == 0
+
+
+def test_warmup_freeze() -> None:
+    try:
+        report = pylunar.warmup(start=(2024, 1, 1, 0, 0, 0))
+        assert report.frozen_objects > 0
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+
+def test_shared_features() -> None:
+    catalog = {feature.feature_id: feature for feature in pylunar.load_catalog()}
+    lfc = LunarFeatureContainer("LunarII")
+    lfc.load()
+    assert all(feature is catalog[feature.feature_id] for feature in lfc)
+    assert None in lfc.club_type
+
+    mi = MoonInfo((35, 58, 10), (-84, 19, 0))
+    mi.update((2013, 10, 12, 18, 0, 0))
+    altitudes = AltitudeDict()
+    altitudes.load(mi)
+    assert list(altitudes) == list(AltitudeDict.FEATURES)
@@ -0,0 +1,80 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the observing program progress tracker."""
+
+from pathlib import Path
+
+import pytest
+
+from pylunar import FeatureBitset, LunarFeatureContainer, MoonInfo, ProgressTracker
+
+
+class TestProgressTracker:
+    def setup_class(self) -> None:
+        self.mi = MoonInfo((35, 58, 10), (-84, 19, 0))
+        self.mi.update((2013, 10, 18, 23, 30, 0))
+        self.lfc = LunarFeatureContainer("Lunar")
+        self.lfc.load()
+        self.features = list(self.lfc)
+
+    def test_log(self, tmp_path: Path) -> None:
+        filename = tmp_path / "progress.db"
+        with ProgressTracker(filename) as tracker:
+            logged = tracker.log("ann", "Lunar", self.features[:3])
+            assert logged == FeatureBitset.from_features(self.features[:3])
+            ids = [self.features[3].feature_id, self.features[0].feature_id]
+            assert None not in ids
+            tracker.log("ann", "Lunar", [feature_id for feature_id in ids if feature_id is not None])
+            assert tracker.progress("ann", "Lunar") == (4, len(self.lfc))
+            tracker.unlog("ann", "Lunar", self.features[:1])
+            assert tracker.progress("bob", "Lunar") == (0, len(self.lfc))
+        with ProgressTracker(filename) as tracker:
+            assert tracker.logged("ann", "Lunar") == FeatureBitset.from_features(self.features[1:4])
+            assert tracker.remaining("ann", "Lunar") == self.lfc.feature_set() - tracker.logged(
+                "ann", "Lunar"
+            )
+            assert len(tracker.logged("ann", "LunarII")) == 0
+
+    def test_bad_features(self) -> None:
+        tracker = ProgressTracker()
+        lunar2 = LunarFeatureContainer("LunarII")
+        lunar2.load()
+        only_lunar2 = next(feature for feature in lunar2 if feature.feature_id not in self.lfc.features)
+        with pytest.raises(ValueError):
+            tracker.log("ann", "Lunar", [only_lunar2])
+        with pytest.raises(ValueError):
+            tracker.program("Sun")
+
+    def test_remaining_visible(self) -> None:
+        tracker = ProgressTracker()
+        visible = [feature for feature in self.lfc if self.mi.is_visible(feature)]
+        assert visible
+        tracker.log("ann", "Lunar", visible[:2])
+        remaining = tracker.remaining_visible("ann", "Lunar", self.mi)
+        assert remaining == visible[2:]
+        assert tracker.remaining_visible("bob", "Lunar", self.mi) == visible
+        assert tracker.visible_set("Lunar", self.mi.observer.date) is tracker.visible_set(
+            "Lunar", self.mi.observer.date + 60.0 / 86400.0
+        )
+
+        down = MoonInfo((35, 58, 10), (-84, 19, 0))
+        down.update((2013, 10, 18, 20, 0, 0))
+        assert down.altitude() < 0.0
+        assert tracker.remaining_visible("bob", "Lunar", down) == []
+
+    def test_remaining_between(self) -> None:
+        tracker = ProgressTracker()
+        night = tracker.remaining_between("bob", "Lunar", self.mi, (2013, 10, 18, 22), (2013, 10, 19, 12))
+        assert set(tracker.remaining_visible("bob", "Lunar", self.mi)) <= set(night)
+        tracker.log("bob", "Lunar", night)
+        assert (
+            tracker.remaining_between("bob", "Lunar", self.mi, (2013, 10, 18, 22), (2013, 10, 19, 12)) == []
+        )
@@ -0,0 +1,177 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the pylunar HTTP service."""
+
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import ephem
+import pytest
+
+from pylunar import LunarFeatureContainer, MoonInfo, PhaseIndex
+from pylunar.conversions import mjd_to_datetime
+from pylunar.server import LunarHTTPServer, LunarService, ServiceResponse, make_server
+
+PARAMS = {"lat": "35.9694", "lon": "-84.3167", "time": "2013-10-18T22:00:00"}
+
+
+class SlowService(LunarService):
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+        self.computed = 0
+
+    def _compute(self, key: tuple[str, float, float, float, str]) -> ServiceResponse:
+        self.release.wait(5.0)
+        self.computed += 1
+        return super()._compute(key)
+
+
+@pytest.fixture(scope="module")
+def server() -> Generator[LunarHTTPServer, None, None]:
+    server = make_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(
+    server: LunarHTTPServer, path: str, headers: dict[str, str] | None = None
+) -> tuple[int, dict[str, str], bytes]:
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, dict(error.headers), error.read()
+
+
+class TestLunarService:
+    def setup_class(self) -> None:
+        self.mi = MoonInfo(35.97, -84.32)
+        self.mi.update((2013, 10, 18, 22, 0, 0))
+
+    def test_answers(self) -> None:
+        service = LunarService()
+        response, explicit = service.get("moon", PARAMS)
+        assert explicit
+        answer = json.loads(response.body)
+        assert answer["time"] == "2013-10-18T22:00:00+00:00"
+        assert (answer["latitude"], answer["longitude"]) == (35.97, -84.32)
+        assert answer["altitude"] == pytest.approx(self.mi.altitude())
+        assert answer["fractional_phase"] == pytest.approx(self.mi.fractional_phase())
+
+        answer = json.loads(service.get("phase", PARAMS)[0].body)
+        assert answer["phase_name"] == "FULL_MOON"
+        next_change = PhaseIndex.shared().next_change(float(ephem.Date((2013, 10, 18, 22, 0, 0))))
+        assert answer["next_change"] == mjd_to_datetime(next_change, round_off=True).isoformat()
+
+        answer = json.loads(service.get("rise_set", {**PARAMS, "tz": "America/New_York"})[0].body)
+        expected = self.mi.rise_set_times("America/New_York")
+        assert [event["kind"] for event in answer["events"]] == [kind for kind, _ in expected]
+
+        lfc = LunarFeatureContainer("Lunar")
+        lfc.load(self.mi)
+        answer = json.loads(service.get("visible", PARAMS)[0].body)
+        assert answer["features"] == [feature.name for feature in lfc]
+
+    def test_quantized_cache(self) -> None:
+        service = LunarService()
+        first = service.get("moon", PARAMS)[0]
+        params = {"lat": "35.972", "lon": "-84.318", "time": "2013-10-18T22:00:40"}
+        assert service.get("moon", params)[0] is first
+        assert service.stats == {"hits": 1, "misses": 1, "coalesced": 0}
+
+    def test_coalescing(self) -> None:
+        service = SlowService()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(service.get, "moon", PARAMS) for _ in range(8)]
+            while service.stats["misses"] + service.stats["coalesced"] < 8:
+                threading.Event().wait(0.01)
+            service.release.set()
+            responses = {future.result()[0] for future in futures}
+        assert len(responses) == 1
+        assert service.computed == 1
+        assert service.stats["coalesced"] == 7
+
+    def test_catalog_load_outside_lock(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        class SlowContainer(LunarFeatureContainer):
+            def load(self, moon_info: MoonInfo | None = None, limit: int | None = None) -> None:
+                started.set()
+                release.wait(5.0)
+                super().load(moon_info, limit)
+
+        monkeypatch.setattr("pylunar.server.LunarFeatureContainer", SlowContainer)
+        service = LunarService()
+        cached = service.get("moon", PARAMS)[0]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future = executor.submit(service.get, "visible", PARAMS)
+            assert started.wait(5.0)
+            # A cache hit does not wait for the catalog load.
+            hit = executor.submit(service.get, "moon", PARAMS)
+            assert hit.result(timeout=1.0)[0] is cached
+            assert not future.done()
+            release.set()
+            assert json.loads(future.result()[0].body)["club"] == "Lunar"
+
+    def test_cache_control(self) -> None:
+        date = float(ephem.Date((2013, 10, 18, 12, 0, 0)))
+        service = LunarService(clock=lambda: date)
+        params = {"lat": "35.97", "lon": "-84.32"}
+        response, explicit = service.get("phase", params)
+        assert not explicit
+        max_age = round((PhaseIndex.shared().next_change(date) - date) * 86400.0)
+        assert service.cache_control(response, explicit) == f"public, max-age={max_age}"
+        response, explicit = service.get("moon", params)
+        assert service.cache_control(response, explicit) == "public, max-age=60"
+        response, explicit = service.get("moon", PARAMS)
+        assert "immutable" in service.cache_control(response, explicit)
+
+    def test_bad_requests(self) -> None:
+        service = LunarService()
+        with pytest.raises(KeyError):
+            service.get("sun", PARAMS)
+        with pytest.raises(KeyError):
+            service.get("moon", {"lat": "35.0"})
+        with pytest.raises(ValueError):
+            service.get("moon", {**PARAMS, "lat": "95.0"})
+        with pytest.raises(ValueError):
+            service.get("visible", {**PARAMS, "club": "Sun"})
+
+
+def test_http(server: LunarHTTPServer) -> None:
+    status, headers, body = fetch(server, "/phase?lat=35.97&lon=-84.32&time=2013-10-18T22:00:00")
+    assert status == 200
+    assert headers["Content-Type"] == "application/json"
+    assert json.loads(body)["emoji"] == "🌕"
+    assert "immutable" in headers["Cache-Control"]
+
+    status, _, body = fetch(
+        server, "/phase?lat=35.97&lon=-84.32&time=2013-10-18T22:00:00", {"If-None-Match": headers["ETag"]}
+    )
+    assert status == 304
+    assert body == b""
+
+    assert fetch(server, "/sun?lat=1&lon=1")[0] == 404
+    assert fetch(server, "/moon?lat=1")[0] == 400
+    status, _, body = fetch(server, "/moon?lat=1&lon=1&time=yesterday")
+    assert status == 400
+    assert "error" in json.loads(body)
@@ -0,0 +1,87 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the SiteRegistry class."""
+
+from datetime import datetime, timedelta
+import math
+
+import pytest
+
+from pylunar import MoonInfo, SiteRegistry
+from pylunar.pkg_types import MoonPhases
+
+
+class TestSiteRegistry:
+    def test_deduplication(self) -> None:
+        registry = SiteRegistry()
+        first = registry.add("home", (35, 58, 10), (-84, 19, 0))
+        second = registry.add("neighbor", 35.97, -84.31)
+        third = registry.add("away", -33.87, 151.21)
+        assert first is second
+        assert first is not third
+        assert len(registry) == 3
+        assert "home" in registry
+        assert registry.cell_count == 2
+        assert registry.dedup_ratio == 1.5
+        assert registry.moon_info("home") is registry.moon_info("neighbor")
+        assert sorted(first.sites) == ["home", "neighbor"]
+
+        observer = first.moon_info.observer
+        assert math.degrees(observer.lat) == pytest.approx(35.95)
+        assert math.degrees(observer.long) == pytest.approx(-84.3)
+
+    def test_remove_and_move(self) -> None:
+        registry = SiteRegistry()
+        registry.add("home", 35.97, -84.31)
+        registry.add("neighbor", 35.96, -84.32)
+        registry.remove("home")
+        assert registry.cell_count == 1
+        registry.add("neighbor", 10.0, 10.0)
+        assert registry.cell_count == 1
+        assert registry.cell("neighbor").key == registry.cell_key(10.0, 10.0)
+        registry.remove("neighbor")
+        assert registry.cell_count == 0
+        assert registry.dedup_ratio == 0.0
+
+    def test_date_line(self) -> None:
+        registry = SiteRegistry()
+        assert registry.add("east", 0.0, 179.99) is registry.add("west", 0.0, -179.99)
+        observer = registry.moon_info("east").observer
+        assert math.degrees(observer.long) == pytest.approx(-180.0)
+
+    def test_cached_results(self) -> None:
+        registry = SiteRegistry(maxsize=2)
+        cell = registry.add("home", (35, 58, 10), (-84, 19, 0))
+        registry.add("neighbor", 35.97, -84.31)
+
+        def rise_set(moon_info: MoonInfo) -> MoonPhases:
+            moon_info.update((2013, 10, 18, 22, 0, 0))
+            return moon_info.rise_set_times("America/New_York")
+
+        first = registry.cell("home").cached(("rise_set", 1), rise_set)
+        assert registry.cell("neighbor").cached(("rise_set", 1), rise_set) is first
+        cell.cached(("rise_set", 2), rise_set)
+        cell.cached(("rise_set", 3), rise_set)
+        assert len(cell) == 2
+        stats = registry.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 3
+        assert stats["hit_rate"] == 0.25
+
+        location = MoonInfo((35, 58, 10), (-84, 19, 0))
+        for (kind, exact), (cell_kind, shared) in zip(rise_set(location), first, strict=True):
+            assert kind == cell_kind
+            assert isinstance(exact, tuple) and isinstance(shared, tuple)
+            assert abs(datetime(*exact) - datetime(*shared)) < timedelta(seconds=10)
+
+    def test_bad_resolution(self) -> None:
+        with pytest.raises(ValueError):
+            SiteRegistry(0.0)
@@ -0,0 +1,70 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the solar altitude event search."""
+
+import math
+
+import ephem
+import pytest
+
+from pylunar import LunarFeature, MoonInfo, solar_altitude_events
+from pylunar.search import brent, sign_changes
+
+
+class TestSolarEvents:
+    def setup_class(self) -> None:
+        location = ((35, 58, 10), (-84, 19, 0))
+        self.mi = MoonInfo(location[0], location[1])
+        self.copernicus = LunarFeature(
+            "Copernicus",
+            96.0699,
+            9.62094521642403,
+            -20.078620508253,
+            3.1684722900391,
+            3.21326828003004,
+            "Crater",
+            "Copernicus",
+            "LAC-58",
+            "Lunar",
+            "Binocular",
+        )
+        self.tycho = LunarFeature(
+            "Tycho", 85.29, -43.3, -11.36, 2.8, 3.9, "Crater", "Tycho", "LAC-112", "Both", "Naked Eye"
+        )
+
+    def test_search_helpers(self) -> None:
+        assert brent(math.cos, 0.0, 3.0) == pytest.approx(math.pi / 2.0, abs=1e-8)
+        assert brent(lambda x: x - 1.0, 1.0, 2.0) == 1.0
+        with pytest.raises(ValueError):
+            brent(math.cos, 0.0, 1.0)
+        assert sign_changes([1.0, 0.5, -0.5, -1.0, 0.0, 2.0]) == [1, 3]
+
+    def test_lunation_events(self) -> None:
+        events = solar_altitude_events(
+            self.mi, [self.copernicus, self.tycho], (1992, 4, 1, 0, 0, 0), (1992, 5, 1, 0, 0, 0), (0.0, 5.0)
+        )
+        assert len(events) == 8
+        dates = [event.date for event in events]
+        assert dates == sorted(dates)
+        for event in events:
+            self.mi.update(ephem.Date(event.date))
+            assert self.mi.solar_altitude(event.feature) == pytest.approx(event.altitude, abs=1e-3)
+
+        sunrise = [x for x in events if x.feature.name == "Copernicus" and x.altitude == 0.0 and x.rising]
+        assert len(sunrise) == 1
+        assert ephem.Date(sunrise[0].date).tuple()[:3] == (1992, 4, 11)
+        rising = [x.rising for x in events if x.feature.name == "Tycho" and x.altitude == 5.0]
+        assert rising == [True, False]
+
+    def test_moon_info_unchanged(self) -> None:
+        self.mi.update((1992, 4, 12, 0, 0, 0))
+        solar_altitude_events(self.mi, [self.copernicus], (1992, 4, 1, 0, 0, 0), (1992, 4, 20, 0, 0, 0))
+        assert self.mi.solar_altitude(self.copernicus) == 1.9649120982751562
@@ -0,0 +1,54 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the SpatialIndex class."""
+
+import pytest
+
+from pylunar import LunarFeature, SpatialIndex
+
+
+def make_feature(name: str, latitude: float, longitude: float, size: float = 0.0) -> LunarFeature:
+    return LunarFeature(name, 1.0, latitude, longitude, size, size, "Crater", "q", "c", "Lunar", None)
+
+
+class TestSpatialIndex:
+    def setup_class(self) -> None:
+        self.index = SpatialIndex.from_catalog()
+
+    def test_catalog(self) -> None:
+        assert len(self.index) == 175
+        assert SpatialIndex.from_catalog() is self.index
+        nearest = self.index.nearest(9.6, -20.1, k=3)
+        assert [feature.name for _, feature in nearest] == ["Copernicus", "Eratosthenes", "Milichius"]
+        assert nearest[0][0] == pytest.approx(0.03, abs=0.01)
+
+    def test_within(self) -> None:
+        matches = self.index.within(9.6, -20.1, 10.0, use_extent=False)
+        assert [feature.name for _, feature in matches][:3] == ["Copernicus", "Eratosthenes", "Milichius"]
+        assert all(distance <= 10.0 for distance, _ in matches)
+        assert len(self.index.within(9.6, -20.1, 10.0)) >= len(matches)
+
+    def test_extents_and_wrapping(self) -> None:
+        features = [
+            make_feature("Big", 0.0, 10.0, 8.0),
+            make_feature("Small", 0.0, 5.0),
+            make_feature("East", 0.0, 179.5),
+            make_feature("Pole", 89.5, -100.0),
+        ]
+        index = SpatialIndex(features)
+        assert [feature.name for _, feature in index.nearest(0.0, 4.0)] == ["Small"]
+        distance, feature = index.nearest(0.0, 7.0, use_extent=True)[0]
+        assert feature.name == "Big"
+        assert distance == 0.0
+        assert [feature.name for _, feature in index.nearest(0.0, -179.5)] == ["East"]
+        assert [feature.name for _, feature in index.within(89.5, 80.0, 1.5)] == ["Pole"]
+        assert len(index.nearest(0.0, 0.0, k=10)) == 4
+        assert index.nearest(0.0, 0.0, k=0) == []
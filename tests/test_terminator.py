@@ -0,0 +1,55 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the terminator geometry."""
+
+import pytest
+
+from pylunar import LunarFeature, MoonInfo, TerminatorGenerator
+from pylunar.terminator import terminator_lines
+
+
+class TestTerminator:
+    def setup_class(self) -> None:
+        location = ((35, 58, 10), (-84, 19, 0))
+        self.mi = MoonInfo(location[0], location[1])
+
+    def test_terminator_lines(self) -> None:
+        sunrise, sunset = terminator_lines(10.0, 0.0, resolution=10.0)
+        assert len(sunrise) == 19
+        assert sunrise[0][0] == -90.0
+        assert sunrise[-1][0] == 90.0
+        assert all(lon == pytest.approx(-10.0) for _, lon in sunrise)
+        assert all(lon == pytest.approx(170.0) for _, lon in sunset)
+
+    def test_solar_altitude_on_terminator(self) -> None:
+        self.mi.update((2013, 10, 8, 6, 0, 0))
+        terminator = TerminatorGenerator.from_moon_info(self.mi, resolution=5.0)
+        assert terminator.date == self.mi.observer.date
+        for lat, lon in terminator.sunrise[1:-1] + terminator.sunset[1:-1]:
+            feature = LunarFeature("T", 1.0, lat, lon, 0.1, 0.1, "Crater", "", "", "Lunar", None)
+            assert self.mi.solar_altitude(feature) == pytest.approx(0.0, abs=1e-9)
+        equator = terminator.sunrise[len(terminator.sunrise) // 2]
+        assert equator[1] == pytest.approx(self.mi.colong_to_long(), abs=0.5)
+
+    def test_generator_cache(self) -> None:
+        generator = TerminatorGenerator(self.mi, resolution=2.0, quantum=60.0, cache_size=2)
+        first = generator.at((2013, 10, 8, 6, 0, 0))
+        assert len(first.sunrise) == 91
+        assert generator.at((2013, 10, 8, 6, 0, 20)) is first
+        frames = generator.batch([(2013, 10, 8, 6, 1, 0), (2013, 10, 8, 6, 2, 0), (2013, 10, 8, 6, 0, 0)])
+        assert frames[2] is not first
+        assert frames[2] == first
+        assert generator.cache_info() == (2, 2)
+
+        self.mi.update((2013, 10, 8, 6, 0, 0))
+        current = TerminatorGenerator.from_moon_info(self.mi, resolution=2.0)
+        for point, truth in zip(current.sunrise, first.sunrise, strict=True):
+            assert point == pytest.approx(truth)
@@ -0,0 +1,72 @@
+# This file is part of pylunar.
+#
+# Developed by Michael Reuter.
+#
+# See the LICENSE file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# Use of this source code is governed by a 3-clause BSD-style
+# license that can be found in the LICENSE file.
+
+"""Tests for the concurrency contract of the shared classes."""
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import ephem
+
+from pylunar import LunarEventFinder, LunarFeatureContainer, MoonInfo, TerminatorGenerator
+
+LOCATION = ((35, 58, 10), (-84, 19, 0))
+START = float(ephem.Date((2013, 10, 1, 0, 0, 0)))
+
+
+def run_threads(func: Callable[[int], object], count: int = 16) -> list[object]:
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        return list(executor.map(func, range(count)))
+
+
+def test_rise_set_times_does_not_modify() -> None:
+    mi = MoonInfo(*LOCATION)
+    mi.update((2013, 10, 18, 22, 0, 0))
+    state = (mi.observer.pressure, mi.observer.horizon, mi.altitude(), mi.azimuth())
+    mi.rise_set_times("America/New_York")
+    assert (mi.observer.pressure, mi.observer.horizon, mi.altitude(), mi.azimuth()) == state
+
+
+def test_container_load_in_threads() -> None:
+    lfc = LunarFeatureContainer("Lunar")
+
+    def load(_: int) -> int:
+        lfc.load()
+        return len(lfc.query().where(feature_type="Crater"))
+
+    counts = run_threads(load, 8)
+    assert len(set(counts)) == 1
+    assert len(lfc) == 90
+
+
+def test_moon_info_per_thread() -> None:
+    lfc = LunarFeatureContainer("Lunar")
+    lfc.load()
+
+    def visible(offset: int) -> tuple[str, int]:
+        mi = MoonInfo(*LOCATION)
+        mi.update(ephem.Date(START + offset))
+        return (mi.phase_name(), len(lfc.visible_set(mi)))
+
+    expected = [visible(offset) for offset in range(16)]
+    assert run_threads(visible) == expected
+
+
+def test_shared_caches() -> None:
+    mi = MoonInfo(*LOCATION)
+    generator = TerminatorGenerator(mi, cache_size=4)
+    finder = LunarEventFinder()
+
+    def compute(offset: int) -> tuple[object, object]:
+        date = START + (offset % 8) * 3.0
+        return (generator.at(date).sunrise[:3], finder.next_perigee(date))
+
+    expected = [compute(offset) for offset in range(16)]
+    assert run_threads(compute) == expected